@@ -1,22 +1,29 @@
-from datetime import datetime,timezone
-from flask import request, jsonify
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import current_app, request, jsonify
 from flask_jwt_extended import (
     create_access_token,
     create_refresh_token,
+    decode_token,
+    get_jwt,
     unset_jwt_cookies,
     set_access_cookies,
     set_refresh_cookies
 )
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
 from extension import db
+from versioning import bump_version
 from models import Member
+import activity
+import revocation
+from hashing import hash_password, verify_password, needs_rehash
 def register():
     data = request.get_json() or {}
 
     member_name = data.get("member_name")
     email = data.get("email")
     password = data.get("password")
-    role = data.get("role", "Member")
+    # roles are granted by a manager (PUT /api/members/<id>), not self-assigned
+    role = "Member"
     major = data.get("major", None)
 
     if not member_name or not email or not password:
@@ -26,7 +33,7 @@ def register():
     if existing:
         return jsonify({"error": "Email already registered"}), 400
 
-    password_hash = generate_password_hash(password)
+    password_hash = hash_password(password)
 
     new_member = Member(
         member_name=member_name,
@@ -39,6 +46,7 @@ def register():
     )
 
     db.session.add(new_member)
+    bump_version("member")
     db.session.commit()
 
     return jsonify({"message": "Member registered successfully"}), 201
@@ -53,16 +61,30 @@ def login():
     if not email or not password:
         return jsonify({"error": "email and password are required"}), 400
 
-    member = Member.query.filter_by(email=email).first()
-    if not member or not check_password_hash(member.password_hash, password):
+    member = Member.query.filter_by(email=email, deleted_at=None).first()
+    if not member or not verify_password(member.password_hash, password):
         return jsonify({"error": "Invalid email or password"}), 401
 
-    member.status = "active"
-    member.last_active = datetime.now(timezone.utc)
-    db.session.commit()
+    changed = False
+    if needs_rehash(member.password_hash):
+        member.password_hash = hash_password(password)
+        changed = True
+
+    if member.status != "active":
+        member.status = "active"
+        changed = True
+
+    if changed:
+        bump_version("member")
+        db.session.commit()
 
-    access_token = create_access_token(identity=str(member.id))
-    refresh_token = create_refresh_token(identity=str(member.id))
+    # last_active goes through the write-behind buffer
+    activity.touch(member.id)
+
+    # role and status ride in the token so routes authorize without a lookup
+    claims = revocation.claims(member)
+    access_token = create_access_token(identity=str(member.id), additional_claims=claims)
+    refresh_token = create_refresh_token(identity=str(member.id), additional_claims=claims)
 
     resp = jsonify({
         "message": "Login successful",
@@ -82,6 +104,16 @@ def login():
 
     return resp, 200
 def logout():
+    # revoke the tokens themselves, not just the cookies holding them
+    tokens = [get_jwt()]
+    refresh_token = request.cookies.get(current_app.config["JWT_REFRESH_COOKIE_NAME"])
+    if refresh_token:
+        try:
+            tokens.append(decode_token(refresh_token))
+        except (JWTExtendedException, PyJWTError):
+            pass  # expired, revoked or not ours: nothing to revoke
+    revocation.revoke(*tokens)
+
     response = jsonify({"message": "Logged out"})
     unset_jwt_cookies(response)
     return response, 200
\ No newline at end of file
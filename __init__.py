@@ -1,7 +1,13 @@
 # __init__.py
 from flask import Flask
 from config import Config
-from extension import db, jwt, cors
+from extension import db, jwt, cors, mail
+import activity
+import compression
+import dbpool
+import jsonprovider
+import metrics
+import revocation
 
 def create_app(config_class=Config):
     app = Flask(__name__)
@@ -9,8 +15,16 @@ def create_app(config_class=Config):
     print("SQLALCHEMY_DATABASE_URI =", app.config["SQLALCHEMY_DATABASE_URI"])
 
 
+    jsonprovider.init_app(app)
+    dbpool.init_app(app)
     db.init_app(app)
+    dbpool.register_fork_safety(app)
+    metrics.init_app(app)
     jwt.init_app(app)
+    mail.init_app(app)
+    revocation.init_app(app)
+    activity.init_app(app)
+    compression.init_app(app)
 
     cors.init_app(
         app,
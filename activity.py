@@ -0,0 +1,114 @@
+# activity.py
+import atexit
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import bindparam
+
+from extension import db
+from models import Member
+from versioning import bump_version
+
+log = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_wake = threading.Event()
+_pending = {}  # member id -> latest activity timestamp
+_app = None
+_flusher_pid = None
+
+stats = {"flushes": 0, "flushed_rows": 0, "failed_flushes": 0, "last_flush": None}
+
+
+def init_app(app):
+    global _app
+    _app = app
+    atexit.register(flush)
+
+
+def touch(member_id):
+    """Records activity in memory; the row is written by the next flush."""
+    now = datetime.now(timezone.utc)
+    with _lock:
+        _pending[int(member_id)] = now
+        pending = len(_pending)
+    _ensure_flusher()
+    if pending >= _app.config["ACTIVITY_MAX_PENDING"]:
+        _wake.set()
+
+
+def record_request_activity(response):
+    """after_request hook: touches the caller of any authenticated request."""
+    if response.status_code < 400:
+        try:
+            identity = get_jwt_identity()
+        except RuntimeError:  # route without @jwt_required
+            identity = None
+        if identity is not None:
+            touch(identity)
+    return response
+
+
+def pending_count():
+    with _lock:
+        return len(_pending)
+
+
+def flush():
+    """Writes all pending timestamps with one executemany UPDATE."""
+    global _pending
+    with _lock:
+        batch, _pending = _pending, {}
+    if not batch or _app is None:
+        return 0
+
+    stmt = (
+        Member.__table__.update()
+        .where(Member.__table__.c.id == bindparam("member_id"))
+        .values(last_active=bindparam("ts"))
+    )
+    try:
+        with _app.app_context():
+            db.session.execute(
+                stmt,
+                [{"member_id": k, "ts": v} for k, v in batch.items()],
+            )
+            # only the member endpoints show last_active; "member" would
+            # invalidate every listing that joins a member name
+            bump_version("member_activity")
+            db.session.commit()
+    except Exception:
+        log.exception("last_active flush failed, keeping %d updates", len(batch))
+        stats["failed_flushes"] += 1
+        with _lock:
+            for member_id, ts in batch.items():
+                if member_id not in _pending or _pending[member_id] < ts:
+                    _pending[member_id] = ts
+        return 0
+
+    stats["flushes"] += 1
+    stats["flushed_rows"] += len(batch)
+    stats["last_flush"] = datetime.now(timezone.utc).isoformat()
+    return len(batch)
+
+
+def _run():
+    interval = _app.config["ACTIVITY_FLUSH_INTERVAL"]
+    while True:
+        _wake.wait(interval)
+        _wake.clear()
+        flush()
+
+
+def _ensure_flusher():
+    # one flusher thread per process, started lazily so it survives gunicorn's fork
+    global _flusher_pid
+    if _flusher_pid == os.getpid():
+        return
+    with _lock:
+        if _flusher_pid != os.getpid():
+            threading.Thread(target=_run, name="activity-flush", daemon=True).start()
+            _flusher_pid = os.getpid()
@@ -0,0 +1,591 @@
+"""
+Benchmark every API route against a seeded local database.
+
+Builds the app with __init__.create_app, recreates the schema through
+the migrations in the database given by BENCH_DATABASE_URL, seeds configurable volumes of
+members, teams, events, contents and reports, then drives each route in
+routes.py through an authenticated client. Per route it reports p50/p95/
+p99 latency, throughput and SQL statements per request (taken from the
+Server-Timing header), and writes everything as JSON so runs can be
+compared across commits.
+
+    BENCH_DATABASE_URL=postgresql://postgres:pw@localhost:5432/itc_bench \\
+        python bench/api.py --requests 200 --output bench-$(git rev-parse --short HEAD).json
+
+    python bench/api.py --compare bench-old.json bench-new.json
+
+The bench database is dropped and recreated on every run; never point it
+at a database you care about.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BENCH_PASSWORD = "bench-password"
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    k = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return round(values[k], 3)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_app(database_url):
+    os.environ["DATABASE_URL"] = database_url
+    from config import Config
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        SECRET_KEY = Config.SECRET_KEY or "bench"
+        JWT_SECRET_KEY = Config.JWT_SECRET_KEY or "bench-jwt-secret-key-of-sufficient-length"
+        UPLOAD_DIR = os.path.join(tempfile.gettempdir(), "bench-uploads")
+
+    import importlib
+    create_app = importlib.import_module("__init__").create_app
+    return create_app(BenchConfig)
+
+
+def reset_schema(app):
+    """Empty schema, then the real migrations (create_all off Postgres)."""
+    from extension import db
+    import migrate
+
+    with app.app_context():
+        if db.engine.dialect.name == "postgresql":
+            with db.engine.begin() as conn:
+                conn.exec_driver_sql("DROP SCHEMA public CASCADE")
+                conn.exec_driver_sql("CREATE SCHEMA public")
+            migrate.upgrade(db.engine, log=lambda msg: None)
+        else:
+            db.drop_all()
+            db.create_all()
+
+
+def analyze(app):
+    from extension import db
+
+    with app.app_context():
+        if db.engine.dialect.name == "postgresql":
+            with db.engine.connect() as conn:
+                conn.execution_options(isolation_level="AUTOCOMMIT").exec_driver_sql("ANALYZE")
+
+
+def _insert(model, rows, chunk=5000):
+    from extension import db
+
+    ids = []
+    for start in range(0, len(rows), chunk):
+        ids += db.session.scalars(
+            db.insert(model).returning(model.id, sort_by_parameter_order=True),
+            rows[start:start + chunk],
+        ).all()
+    return ids
+
+
+def seed(app, volumes, spare, rng):
+    """Inserts the dataset; `spare` extra rows per table are kept for delete routes."""
+    from werkzeug.security import generate_password_hash
+    from extension import db
+    from models import Content, Event, Member, MemberEvent, MemberTeam, Report, Team
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    with app.app_context():
+        password_hash = generate_password_hash(
+            BENCH_PASSWORD, app.config["PASSWORD_HASH_METHOD"], app.config["PASSWORD_SALT_LENGTH"]
+        )
+        member_ids = _insert(Member, [
+            {
+                "member_name": f"Member {i}",
+                "email": f"member{i}@bench.local",
+                "password_hash": password_hash,
+                "role": "Leader" if i == 0 else "Member",
+                "level": i % 5,
+                "major": rng.choice(["CS", "Math", "EE", None]),
+                "status": "active",
+            }
+            for i in range(volumes["members"] + spare)
+        ])
+        member_ids, spare_members = member_ids[:volumes["members"]], member_ids[volumes["members"]:]
+
+        team_ids = _insert(Team, [
+            {"team_name": f"Team {i}", "description": "bench team", "created_at": now, "is_active": True}
+            for i in range(volumes["teams"] + spare)
+        ])
+        event_ids = _insert(Event, [
+            {
+                "event_name": f"Event {i}",
+                "event_type": rng.choice(["workshop", "meeting", "hackathon"]),
+                "event_date": now + timedelta(hours=i),
+                "location": "Room A",
+                "description": "bench event",
+            }
+            for i in range(volumes["events"] + spare)
+        ])
+        content_ids = _insert(Content, [
+            {
+                "title": f"Content {i}",
+                "content_type": rng.choice(["task", "quiz", "playlist"]),
+                "description": "bench content",
+                "created_at": now + timedelta(minutes=i),
+            }
+            for i in range(volumes["contents"] + spare)
+        ])
+
+        db.session.execute(db.insert(MemberTeam), [
+            {"member_id": m, "team_id": t}
+            for t in team_ids
+            for m in rng.sample(member_ids, min(volumes["members_per_team"], len(member_ids)))
+        ])
+        db.session.execute(db.insert(MemberEvent), [
+            {"member_id": m, "event_id": e}
+            for e in event_ids
+            for m in rng.sample(member_ids, min(volumes["attendees_per_event"], len(member_ids)))
+        ])
+
+        statuses = ["pending", "submitted", "late", "approved", "revision_requested"]
+
+        def report(c, k):
+            status = rng.choice(statuses)
+            return {
+                "content_id": c,
+                "submitted_by": rng.choice(member_ids),
+                "title": f"Report {c}-{k}",
+                "status": status,
+                # pending reports have not been handed in yet
+                "submission_date": None if status == "pending" else now - timedelta(minutes=rng.randrange(43200)),
+                "file_path": f"/uploads/{c}-{k}.pdf",
+                "action": "none",
+            }
+
+        report_ids = _insert(Report, [
+            report(c, k)
+            for c in content_ids[:volumes["contents"]]
+            for k in range(volumes["reports_per_content"])
+        ])
+        spare_reports = _insert(Report, [
+            {
+                "content_id": content_ids[0],
+                "submitted_by": member_ids[0],
+                "title": f"Spare report {k}",
+                "status": "pending",
+                "action": "none",
+            }
+            for k in range(spare)
+        ])
+        db.session.commit()
+
+    return {
+        "members": member_ids,
+        "teams": team_ids[:volumes["teams"]],
+        "events": event_ids[:volumes["events"]],
+        "contents": content_ids[:volumes["contents"]],
+        "reports": report_ids,
+        "spare": {
+            "members": spare_members,
+            "teams": team_ids[volumes["teams"]:],
+            "events": event_ids[volumes["events"]:],
+            "contents": content_ids[volumes["contents"]:],
+            "reports": spare_reports,
+        },
+        "bench_email": "member0@bench.local",
+    }
+
+
+class Scenario:
+    def __init__(self, name, method, url, body=None, headers=None, iterations=None, before=None):
+        self.name = name
+        self.method = method
+        self.url = url              # str or callable(i)
+        self.body = body            # None, value or callable(i)
+        self.headers = headers      # None, dict or callable(i)
+        self.iterations = iterations
+        self.before = before        # untimed callable(client, i)
+
+    def resolve(self, attr, i):
+        value = getattr(self, attr)
+        return value(i) if callable(value) else value
+
+
+def scenarios(app, client, ids, args, rng):
+    pick = rng.choice
+    slow = args.slow_requests
+    events, members, teams = ids["events"], ids["members"], ids["teams"]
+    contents, reports, spare = ids["contents"], ids["reports"], ids["spare"]
+
+    def cursor_at_middle(url, total):
+        # walk pages of at most MAX_LIMIT rows to the middle of the listing
+        from pagination import MAX_LIMIT
+        cursor, remaining = None, max(1, total // 2)
+        while remaining > 0:
+            limit = min(remaining, MAX_LIMIT)
+            after = f"&after={cursor}" if cursor else ""
+            body = client.get(f"{url}?limit={limit}{after}").get_json()
+            cursor = body.get("next_cursor") if isinstance(body, dict) else None
+            if cursor is None:
+                return None
+            remaining -= limit
+        return cursor
+
+    etag = {}
+
+    def current_reports_etag(c, i):
+        etag["value"] = c.get("/api/reports").headers.get("ETag")
+
+    reports_cursor = cursor_at_middle("/api/reports", len(reports))
+    members_cursor = cursor_at_middle("/api/members", len(members))
+    # a one-day window inside the seeded event dates (one event per hour from seeding time)
+    events_from = (datetime.now(timezone.utc) + timedelta(days=1)).date().isoformat()
+    events_to = (datetime.now(timezone.utc) + timedelta(days=2)).date().isoformat()
+
+    def clear_compression_cache(c, i):
+        import compression
+        compression.cache.clear()
+
+    def fresh_token(c, i):
+        from flask_jwt_extended import create_access_token
+        with app.app_context():
+            c.set_cookie("access_token", create_access_token(identity=str(members[0])))
+
+    def revoked_token(c, i):
+        # a token revoked by logout, then replayed: rejected without a query
+        from flask_jwt_extended import create_access_token
+        with app.app_context():
+            token = create_access_token(identity=str(members[0]))
+        c.set_cookie("access_token", token)
+        c.post("/api/auth/logout")
+        c.set_cookie("access_token", token)
+
+    def member_token(c, i):
+        from flask_jwt_extended import create_access_token
+        with app.app_context():
+            c.set_cookie("access_token", create_access_token(
+                identity=str(members[1]), additional_claims={"role": "Member", "status": "active", "cv": 0},
+            ))
+
+    return [
+        Scenario("status", "GET", "/api/status"),
+        Scenario("metrics", "GET", "/metrics"),
+        Scenario("register", "POST", "/api/auth/register", iterations=slow, body=lambda i: {
+            "member_name": f"New {i}", "email": f"new{i}-{args.seed}@bench.local", "password": "pw-123456",
+        }),
+        Scenario("login", "POST", "/api/auth/login", iterations=slow,
+                 body={"email": ids["bench_email"], "password": BENCH_PASSWORD}),
+        Scenario("logout", "POST", "/api/auth/logout", before=fresh_token),
+        Scenario("revoked_token", "GET", "/api/events", before=revoked_token),
+        Scenario("forbidden_write", "DELETE", lambda i: f"/api/teams/{pick(teams)}", before=member_token),
+
+        Scenario("list_events", "GET", "/api/events"),
+        Scenario("list_events_page", "GET", "/api/events?limit=50"),
+        Scenario("list_events_filtered", "GET", lambda i: (
+            f"/api/events?limit=50&event_type=workshop&date_from={events_from}&date_to={events_to}"
+        )),
+        Scenario("get_event", "GET", lambda i: f"/api/events/{pick(events)}"),
+        Scenario("create_event", "POST", "/api/events/create", body=lambda i: {
+            "event_name": f"Bench event {i}", "event_type": "meeting", "event_date": "2030-01-01 10:00",
+        }),
+        Scenario("update_event", "PUT", lambda i: f"/api/events/update/{events[0]}",
+                 body=lambda i: {"location": f"Room {i}"}),
+        # 100 member ids per request, one INSERT ... ON CONFLICT / one DELETE ... IN
+        Scenario("add_event_attendees", "POST", lambda i: f"/api/events/{events[i % len(events)]}/attendees",
+                 body=lambda i: {"member_ids": rng.sample(members, min(100, len(members)))}),
+        Scenario("remove_event_attendees", "DELETE", lambda i: f"/api/events/{events[i % len(events)]}/attendees",
+                 body=lambda i: {"member_ids": rng.sample(members, min(100, len(members)))}),
+        Scenario("delete_event", "DELETE", lambda i: f"/api/events/delete/{spare['events'][i]}"),
+
+        Scenario("list_members", "GET", "/api/members"),
+        Scenario("list_members_page", "GET", "/api/members?limit=50"),
+        Scenario("list_members_fields", "GET", "/api/members?limit=500&fields=id,name"),
+        Scenario("list_members_deep_page", "GET", f"/api/members?limit=50&after={members_cursor}"),
+        Scenario("get_member", "GET", lambda i: f"/api/members/{pick(members)}"),
+        Scenario("view_profile", "GET", lambda i: f"/api/members/{pick(members)}/profile"),
+        Scenario("create_member", "POST", "/api/members", iterations=slow, body=lambda i: {
+            "member_name": f"Created {i}", "email": f"created{i}-{args.seed}@bench.local", "password": "pw-123456",
+        }),
+        Scenario("create_members_bulk", "POST", "/api/members/bulk", iterations=max(1, slow // 10),
+                 body=lambda i: [
+                     {"member_name": f"Bulk {i}-{k}", "email": f"bulk{i}-{k}-{args.seed}@bench.local",
+                      "password": "pw-123456"}
+                     for k in range(10)
+                 ]),
+        Scenario("update_member", "PUT", lambda i: f"/api/members/{members[-1]}",
+                 body=lambda i: {"major": f"Major {i}"}),
+        Scenario("delete_member", "DELETE", lambda i: f"/api/members/{spare['members'][i]}"),
+        # marks the member deleted and queues the cascade job; worker.py removes the rows
+        Scenario("delete_member_background", "DELETE",
+                 lambda i: f"/api/members/{spare['members'][-1 - i]}?mode=background"),
+        Scenario("member_deletion", "GET", lambda i: f"/api/members/{spare['members'][-1]}/deletion"),
+
+        Scenario("list_contents", "GET", "/api/list_contents"),
+        Scenario("list_contents_page", "GET", "/api/list_contents?limit=100"),
+        Scenario("list_contents_stream", "GET", "/api/list_contents?stream=1"),
+        Scenario("get_content", "GET", lambda i: f"/api/contents_by_id/{pick(contents)}"),
+        Scenario("create_content", "POST", "/api/contents/create",
+                 body=lambda i: {"title": f"Bench content {i}", "content_type": "task"}),
+        Scenario("update_content", "PUT", lambda i: f"/api/contents/update/{contents[0]}",
+                 body=lambda i: {"description": f"v{i}"}),
+        Scenario("delete_content", "DELETE", lambda i: f"/api/contents/delete/{spare['contents'][i]}"),
+        Scenario("delete_content_background", "DELETE",
+                 lambda i: f"/api/contents/delete/{spare['contents'][-1 - i]}?mode=background"),
+        Scenario("content_deletion", "GET", lambda i: f"/api/contents/{spare['contents'][-1]}/deletion"),
+
+        Scenario("list_reports", "GET", "/api/reports"),
+        Scenario("list_reports_page", "GET", "/api/reports?limit=100"),
+        Scenario("list_reports_deep_page", "GET", f"/api/reports?limit=100&after={reports_cursor}"),
+        Scenario("list_reports_stream", "GET", "/api/reports?stream=1"),
+        Scenario("list_reports_gzip", "GET", "/api/reports", headers={"Accept-Encoding": "gzip"}),
+        Scenario("list_reports_gzip_uncached", "GET", "/api/reports", headers={"Accept-Encoding": "gzip"},
+                 before=clear_compression_cache),
+        Scenario("list_reports_stream_gzip", "GET", "/api/reports?stream=1", headers={"Accept-Encoding": "gzip"}),
+        Scenario("list_reports_fields", "GET", "/api/reports?limit=500&fields=id,status"),
+        Scenario("list_reports_filtered", "GET",
+                 lambda i: f"/api/reports?limit=50&content_id={pick(contents)}&status=pending"),
+        Scenario("list_reports_by_member", "GET",
+                 lambda i: f"/api/reports?limit=50&submitted_by={pick(members)}&status=late,submitted"),
+        Scenario("list_reports_by_date", "GET", "/api/reports?limit=50&sort=-submission_date"),
+        Scenario("list_reports_not_modified", "GET", "/api/reports", before=current_reports_etag,
+                 headers=lambda i: {"If-None-Match": etag["value"]} if etag.get("value") else None),
+        Scenario("get_report", "GET", lambda i: f"/api/reports/byid/{pick(reports)}"),
+        Scenario("create_report", "POST", "/api/reports/create", body=lambda i: {
+            "content_id": pick(contents), "submitted_by": pick(members), "title": f"Bench report {i}",
+        }),
+        Scenario("create_reports_bulk", "POST", "/api/reports/bulk/create", body=lambda i: [
+            {"content_id": pick(contents), "submitted_by": pick(members), "title": f"Bulk {i}-{k}"}
+            for k in range(50)
+        ]),
+        Scenario("update_reports_bulk", "PUT", "/api/reports/bulk/update", body=lambda i: [
+            {"id": r, "status": "late"} for r in rng.sample(reports, min(50, len(reports)))
+        ]),
+        Scenario("update_report", "PUT", lambda i: f"/api/reports/update/{reports[0]}",
+                 body=lambda i: {"status": "approved" if i % 2 else "late"}),
+        # queues the mail (one INSERT into jobs); worker.py sends it
+        Scenario("update_report_reminder", "PUT", lambda i: f"/api/reports/update/{reports[2]}",
+                 body={"action": "send_reminder"}),
+        Scenario("update_reports_bulk_reminder", "PUT", "/api/reports/bulk/update", body=lambda i: [
+            {"id": r, "action": "send_reminder"} for r in rng.sample(reports, min(50, len(reports)))
+        ]),
+        Scenario("submit_report", "POST", lambda i: f"/api/reports/{reports[1]}/submit",
+                 body=lambda i: {"file_path": f"/uploads/bench-{i}.pdf"}),
+        # 1 MiB raw body streamed to disk and hashed; distinct bytes, so no dedup
+        Scenario("upload_report_file", "POST", lambda i: f"/api/reports/{reports[3]}/upload?filename=bench.pdf",
+                 body=lambda i: i.to_bytes(8, "big") * (128 * 1024)),
+        Scenario("delete_report", "DELETE", lambda i: f"/api/reports/delete/{spare['reports'][i]}"),
+
+        Scenario("list_teams", "GET", "/api/teams"),
+        Scenario("list_teams_page", "GET", "/api/teams?limit=50"),
+        Scenario("get_team", "GET", lambda i: f"/api/teams/{pick(teams)}"),
+        Scenario("create_team", "POST", "/api/teams", body=lambda i: {"team_name": f"Bench team {i}"}),
+        Scenario("update_team", "PUT", lambda i: f"/api/teams/{teams[0]}",
+                 body=lambda i: {"description": f"v{i}"}),
+        Scenario("add_team_members", "POST", lambda i: f"/api/teams/{teams[i % len(teams)]}/members",
+                 body=lambda i: {"member_ids": rng.sample(members, min(100, len(members)))}),
+        Scenario("remove_team_members", "DELETE", lambda i: f"/api/teams/{teams[i % len(teams)]}/members",
+                 body=lambda i: {"member_ids": rng.sample(members, min(100, len(members)))}),
+        Scenario("delete_team", "DELETE", lambda i: f"/api/teams/{spare['teams'][i]}"),
+
+        Scenario("dashboard_summary", "GET", "/api/dashboard/summary"),
+        Scenario("dashboard_summary_page", "GET", "/api/dashboard/summary?limit=50"),
+
+        Scenario("search", "GET", "/api/search?q=bench"),
+        Scenario("search_members", "GET", lambda i: f"/api/search?q=member+{i}&types=member&limit=50"),
+    ]
+
+
+def run_scenario(app, client, scenario, requests, warmup):
+    iterations = scenario.iterations or requests
+    latencies = []
+    statements = []
+    statuses = {}
+
+    for i in range(warmup + iterations):
+        if scenario.before:
+            scenario.before(client, i)
+        kwargs = {}
+        body = scenario.resolve("body", i)
+        if isinstance(body, bytes):
+            kwargs["data"] = body
+        elif body is not None:
+            kwargs["json"] = body
+        headers = scenario.resolve("headers", i)
+        if headers:
+            kwargs["headers"] = headers
+
+        start = time.perf_counter()
+        response = client.open(scenario.resolve("url", i), method=scenario.method, **kwargs)
+        response.get_data()  # drain streamed bodies
+        elapsed = (time.perf_counter() - start) * 1000
+        response.close()
+
+        if i < warmup:
+            continue
+        latencies.append(elapsed)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        match = SERVER_TIMING_QUERIES.search(response.headers.get("Server-Timing", ""))
+        if match:
+            statements.append(int(match.group(1)))
+
+    # sequential single client: throughput over the timed requests only,
+    # so untimed `before` setup does not count against the route
+    busy = sum(latencies) / 1000
+    return {
+        "method": scenario.method,
+        "url": scenario.resolve("url", 0),
+        "requests": iterations,
+        "status_codes": {str(k): v for k, v in sorted(statuses.items())},
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else None,
+        "throughput_rps": round(iterations / busy, 2) if busy else None,
+        "sql_statements_per_request": round(sum(statements) / len(statements), 2) if statements else None,
+    }
+
+
+def endpoint_of(app, scenario):
+    adapter = app.url_map.bind("localhost")
+    path = scenario.resolve("url", 0).split("?", 1)[0]
+    try:
+        endpoint, _ = adapter.match(path, method=scenario.method)
+    except Exception:
+        return None
+    return endpoint
+
+
+def compare(old_path, new_path):
+    with open(old_path) as f:
+        old = json.load(f)["routes"]
+    with open(new_path) as f:
+        new = json.load(f)["routes"]
+
+    print(f"{'route':32} {'p95 old':>10} {'p95 new':>10} {'change':>8} {'sql old':>8} {'sql new':>8}")
+    for name in sorted(set(old) | set(new)):
+        a, b = old.get(name, {}), new.get(name, {})
+        pa, pb = a.get("p95_ms"), b.get("p95_ms")
+        change = f"{(pb - pa) / pa * 100:+.0f}%" if pa and pb else "-"
+        print(f"{name:32} {pa if pa is not None else '-':>10} {pb if pb is not None else '-':>10} "
+              f"{change:>8} {a.get('sql_statements_per_request', '-')!s:>8} "
+              f"{b.get('sql_statements_per_request', '-')!s:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every API route against a seeded database.")
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"))
+    parser.add_argument("--members", type=int, default=1000)
+    parser.add_argument("--teams", type=int, default=50)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--contents", type=int, default=300)
+    parser.add_argument("--reports-per-content", type=int, default=40)
+    parser.add_argument("--members-per-team", type=int, default=20)
+    parser.add_argument("--attendees-per-event", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=100, help="timed requests per route")
+    parser.add_argument("--slow-requests", type=int, default=20,
+                        help="timed requests for routes that hash passwords")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--only", help="comma-separated scenario names to run")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the JSON results to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="diff two result files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    if not args.database_url:
+        parser.error("set BENCH_DATABASE_URL or --database-url (the database is wiped)")
+    if args.database_url == os.getenv("DATABASE_URL"):
+        parser.error("refusing to wipe DATABASE_URL; use a dedicated bench database")
+
+    rng = random.Random(args.seed)
+    volumes = {
+        "members": args.members,
+        "teams": args.teams,
+        "events": args.events,
+        "contents": args.contents,
+        "reports_per_content": args.reports_per_content,
+        "members_per_team": args.members_per_team,
+        "attendees_per_event": args.attendees_per_event,
+    }
+    # each spare row is deleted once: the immediate deletes take them from
+    # the front, the background ones from the back
+    spare = 2 * (args.warmup + max(args.requests, args.slow_requests))
+
+    app = build_app(args.database_url)
+    reset_schema(app)
+    seed_start = time.perf_counter()
+    ids = seed(app, volumes, spare, rng)
+    analyze(app)
+    seed_seconds = time.perf_counter() - seed_start
+
+    client = app.test_client()
+    login = client.post("/api/auth/login", json={"email": ids["bench_email"], "password": BENCH_PASSWORD})
+    if login.status_code != 200:
+        raise SystemExit(f"bench login failed: {login.status_code} {login.get_data(as_text=True)}")
+
+    plan = scenarios(app, client, ids, args, rng)
+    if args.only:
+        wanted = set(args.only.split(","))
+        plan = [s for s in plan if s.name in wanted]
+
+    covered = {endpoint_of(app, s) for s in plan}
+    blueprint_endpoints = {
+        rule.endpoint for rule in app.url_map.iter_rules() if rule.endpoint.startswith("routes.")
+    }
+
+    results = {}
+    for scenario in plan:
+        # token-swapping scenarios get their own client so the shared session stays logged in
+        scenario_client = app.test_client() if scenario.name in ("logout", "revoked_token", "forbidden_write") else client
+        results[scenario.name] = run_scenario(app, scenario_client, scenario, args.requests, args.warmup)
+        r = results[scenario.name]
+        print(f"{scenario.name:32} p50 {r['p50_ms']:>9} ms  p95 {r['p95_ms']:>9} ms  "
+              f"p99 {r['p99_ms']:>9} ms  {r['throughput_rps']:>8} req/s  "
+              f"sql/req {r['sql_statements_per_request']}  {r['status_codes']}", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "database": args.database_url.split("@")[-1],
+            "volumes": volumes,
+            "requests_per_route": args.requests,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "seed_seconds": round(seed_seconds, 2),
+            "unbenchmarked_endpoints": sorted(blueprint_endpoints - covered) if not args.only else [],
+        },
+        "routes": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Throughput and latency of a running server under many concurrent
+clients, for comparing the sync and async serving modes (README,
+"Async serving mode"). Each client logs in once, then sends GETs on a
+keep-alive connection for the given duration.
+
+    gunicorn -w 1 run:app                      # sync
+    gunicorn -c gunicorn_async.py -w 1 run:app  # async
+    python bench/concurrency.py --base-url http://127.0.0.1:8000 \\
+        --email member0@bench.local --password bench-password --clients 200 --path /api/events?limit=50
+"""
+import argparse
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(pct / 100 * len(values)))], 3)
+
+
+def login(base, email, password):
+    conn = http.client.HTTPConnection(base.hostname, base.port, timeout=60)
+    conn.request("POST", "/api/auth/login", json.dumps({"email": email, "password": password}),
+                  {"Content-Type": "application/json"})
+    response = conn.getresponse()
+    response.read()
+    if response.status != 200:
+        raise SystemExit(f"login failed: {response.status}")
+    cookies = [c.split(";", 1)[0] for c in response.headers.get_all("Set-Cookie")]
+    conn.close()
+    return "; ".join(cookies)
+
+
+def client(base, paths, cookie, deadline, results, start_barrier):
+    latencies, statuses, errors = [], {}, 0
+    conn = http.client.HTTPConnection(base.hostname, base.port, timeout=60)
+    start_barrier.wait()
+    i = 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path, headers={"Cookie": cookie})
+            response = conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection(base.hostname, base.port, timeout=60)
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+        statuses[response.status] = statuses.get(response.status, 0) + 1
+    conn.close()
+    results.append((latencies, statuses, errors))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-client load against a running server.")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--path", action="append", help="GET path, repeatable (default /api/events?limit=50)")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args()
+
+    base = urlsplit(args.base_url)
+    paths = args.path or ["/api/events?limit=50"]
+    cookie = login(base, args.email, args.password)
+
+    results = []
+    barrier = threading.Barrier(args.clients + 1)
+    deadline = time.perf_counter() + args.duration
+    threads = [
+        threading.Thread(target=client, args=(base, paths, cookie, deadline, results, barrier), daemon=True)
+        for _ in range(args.clients)
+    ]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = [ms for r in results for ms in r[0]]
+    statuses = {}
+    for _, s, _ in results:
+        for code, n in s.items():
+            statuses[str(code)] = statuses.get(str(code), 0) + n
+    report = {
+        "clients": args.clients,
+        "paths": paths,
+        "requests": len(latencies),
+        "errors": sum(r[2] for r in results),
+        "status_codes": statuses,
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
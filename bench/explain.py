@@ -0,0 +1,71 @@
+"""
+Checks that the main listing queries are served by their indexes.
+
+Seeds a bench database (see bench/api.py; it is wiped) and runs the
+checks in query_plans.py, the ones tests/test_explain.py runs on a small
+database. A check fails when an expected index does not appear in any of
+the plans. Exits non-zero on failure so it can gate CI.
+
+    BENCH_DATABASE_URL=postgresql://postgres:pw@localhost:5432/itc_bench \\
+        python bench/explain.py
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from api import BENCH_PASSWORD, analyze, build_app, reset_schema, seed  # noqa: E402
+from query_plans import checks, indexes_used  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN the listing queries on a seeded database.")
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"))
+    parser.add_argument("--members", type=int, default=2000)
+    parser.add_argument("--contents", type=int, default=300)
+    parser.add_argument("--reports-per-content", type=int, default=40)
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--teams", type=int, default=100)
+    args = parser.parse_args()
+
+    if not args.database_url:
+        parser.error("set BENCH_DATABASE_URL or --database-url (the database is wiped)")
+    if args.database_url == os.getenv("DATABASE_URL"):
+        parser.error("refusing to wipe DATABASE_URL; use a dedicated bench database")
+
+    from extension import db
+
+    app = build_app(args.database_url)
+    reset_schema(app)
+    ids = seed(app, {
+        "members": args.members,
+        "teams": args.teams,
+        "events": args.events,
+        "contents": args.contents,
+        "reports_per_content": args.reports_per_content,
+        "members_per_team": 20,
+        "attendees_per_event": 50,
+    }, 0, random.Random(1))
+    analyze(app)
+
+    client = app.test_client()
+    client.post("/api/auth/login", json={"email": ids["bench_email"], "password": BENCH_PASSWORD})
+
+    with app.app_context():
+        engine = db.engine
+
+    failures = 0
+    for url, expected in checks(client, ids):
+        status, used = indexes_used(client, engine, url)
+        missing = sorted(expected - used)
+        failures += bool(missing) or status != 200
+        print(f"{'FAIL' if missing or status != 200 else 'ok  '} {url}  uses {sorted(used)}"
+              + (f"  missing {missing}" if missing else ""))
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
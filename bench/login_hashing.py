@@ -0,0 +1,105 @@
+"""
+Logins per second with password hashing inline vs. in the hashing pool.
+
+Each client thread stands in for a request worker doing logins back to
+back; one extra thread keeps issuing a cheap request (serializing a small
+listing) and records its latency, which is what the rest of the API feels
+while a login burst is in progress.
+
+    python bench/login_hashing.py --clients 8 --seconds 10 --pool-workers 2
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+from werkzeug.security import generate_password_hash  # noqa: E402
+
+from config import Config  # noqa: E402
+import hashing  # noqa: E402
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    k = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[k]
+
+
+def run(app, clients, seconds):
+    stored = generate_password_hash(
+        "correct horse", app.config["PASSWORD_HASH_METHOD"], app.config["PASSWORD_SALT_LENGTH"]
+    )
+    rows = [{"id": i, "name": f"member {i}", "level": i % 5} for i in range(200)]
+    deadline = time.perf_counter() + seconds
+    logins = [0] * clients
+    cheap_latencies = []
+
+    def login_client(n):
+        with app.app_context():
+            while time.perf_counter() < deadline:
+                hashing.verify_password(stored, "correct horse")
+                logins[n] += 1
+
+    def cheap_client():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            json.dumps(rows)
+            cheap_latencies.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.005)
+
+    with app.app_context():
+        hashing.verify_password(stored, "correct horse")  # warm the pool
+
+    threads = [threading.Thread(target=login_client, args=(n,)) for n in range(clients)]
+    threads.append(threading.Thread(target=cheap_client))
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "logins": sum(logins),
+        "logins_per_second": round(sum(logins) / elapsed, 2),
+        "cheap_request_ms": {
+            "p50": percentile(cheap_latencies, 50),
+            "p95": percentile(cheap_latencies, 95),
+            "mean": statistics.fmean(cheap_latencies) if cheap_latencies else None,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--pool-workers", type=int, default=Config.PASSWORD_HASH_WORKERS)
+    parser.add_argument("--output", help="write the JSON result to this file")
+    args = parser.parse_args()
+
+    results = {"cpu_count": os.cpu_count(), "clients": args.clients, "method": Config.PASSWORD_HASH_METHOD}
+    for label, workers in (("inline", 0), ("pool", args.pool_workers)):
+        app = Flask(__name__)
+        app.config.from_object(Config)
+        app.config["PASSWORD_HASH_WORKERS"] = workers
+        app.config["PASSWORD_HASH_MAX_PENDING"] = max(args.clients, 1)
+        results[label] = {"pool_workers": workers, **run(app, args.clients, args.seconds)}
+
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
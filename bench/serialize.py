@@ -0,0 +1,126 @@
+"""
+Rows per second for turning a 10k-row listing into a JSON body.
+
+Compares the hand-built dicts the modules used to make (isoformat per
+date, Flask's stdlib provider) with the shared serializers.py field sets
+encoded by the stdlib and the orjson providers. The rows are synthetic
+tuples shaped like the /api/reports SELECT, so no database is needed and
+only serialization and encoding are measured.
+
+    python bench/serialize.py --rows 10000 --repeat 5
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+import jsonprovider  # noqa: E402
+from serializers import REPORT_FIELDS  # noqa: E402
+
+NAMES = list(REPORT_FIELDS.fields)
+ReportRow = namedtuple("ReportRow", NAMES + ["key0"])  # + the cursor key column
+
+
+def make_rows(n, rng):
+    now = datetime(2025, 1, 1)
+    statuses = ["pending", "submitted", "late", "approved", "revision_requested"]
+    return [
+        ReportRow(
+            i, f"Report {i}", rng.choice(statuses),
+            now + timedelta(minutes=rng.randrange(100000)) if i % 5 else None,
+            f"/uploads/{i}.pdf", "none", i // 40, f"Content {i // 40}",
+            rng.randrange(2000), f"Member {rng.randrange(2000)}", i,
+        )
+        for i in range(n)
+    ]
+
+
+def handbuilt_row(r):
+    """The per-module dict building this replaced."""
+    return {
+        "id": r.id,
+        "report_title": r.report_title,
+        "status": r.status,
+        "submission_date": r.submission_date.isoformat() if r.submission_date else None,
+        "file_path": r.file_path,
+        "action": r.action,
+        "content_id": r.content_id,
+        "content_title": r.content_title,
+        "submitted_by": r.submitted_by,
+        "submitted_by_name": r.submitted_by_name,
+    }
+
+
+def measure(rows, serialize, encode, repeat):
+    best_serialize = best_total = float("inf")
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = serialize(rows)
+        mid = time.perf_counter()
+        body = encode(items)
+        end = time.perf_counter()
+        best_serialize = min(best_serialize, mid - start)
+        best_total = min(best_total, end - start)
+        size = len(body)
+    return {
+        "rows_per_s": round(len(rows) / best_total),
+        "serialize_ms": round(best_serialize * 1000, 2),
+        "encode_ms": round((best_total - best_serialize) * 1000, 2),
+        "bytes": size,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serializer and JSON encoder throughput.")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows, random.Random(args.seed))
+    app = Flask(__name__)
+
+    variants = {
+        "handbuilt+flask_default": (
+            lambda rs: [handbuilt_row(r) for r in rs],
+            DefaultJSONProvider(app).dumps,
+        ),
+        "serializers+stdlib": (
+            lambda rs: REPORT_FIELDS.rows(rs, NAMES),
+            jsonprovider.IsoJSONProvider(app).dumps,
+        ),
+    }
+    if jsonprovider.orjson is not None:
+        provider = jsonprovider.OrjsonProvider(app)
+        variants["serializers+orjson"] = (
+            lambda rs: REPORT_FIELDS.rows(rs, NAMES),
+            lambda items: jsonprovider.orjson.dumps(items, default=jsonprovider._default, option=provider._option()),
+        )
+    else:
+        print("orjson is not installed; skipping the orjson variant")
+
+    results = {}
+    for name, (serialize, encode) in variants.items():
+        results[name] = measure(rows, serialize, encode, args.repeat)
+        r = results[name]
+        print(f"{name:26} {r['rows_per_s']:>10} rows/s  serialize {r['serialize_ms']:>8} ms  "
+              f"encode {r['encode_ms']:>8} ms  {r['bytes']} bytes")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"rows": args.rows, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
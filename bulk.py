@@ -0,0 +1,133 @@
+# bulk.py
+from flask import request
+from sqlalchemy import literal, select
+from sqlalchemy.dialects.postgresql import insert
+
+from extension import db
+from models import Member
+
+MAX_BULK_ITEMS = 1000
+
+
+def bulk_items():
+    """
+    Reads the JSON array body of a bulk endpoint.
+    Raises ValueError with a message suitable for a 400 body.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, list) or not data:
+        raise ValueError("body must be a non-empty JSON array")
+    if len(data) > MAX_BULK_ITEMS:
+        raise ValueError(f"at most {MAX_BULK_ITEMS} items per request")
+    return data
+
+
+def item_ok(index, status, **fields):
+    return {"index": index, "status": status, **fields}
+
+
+def item_error(index, status, error):
+    return {"index": index, "status": status, "error": error}
+
+
+def to_id(value):
+    """Coerces a JSON id (int or numeric string) to int, None if it is not one."""
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def string_error(item, columns):
+    """
+    The first of `columns` ({name: String column}) whose value in `item` is
+    not a string that fits the column, as a 400 message; None when all fit.
+    Missing (None) values are left to the caller's required-field check.
+    """
+    for name, column in columns.items():
+        value = item.get(name)
+        if value is None:
+            continue
+        if not isinstance(value, str):
+            return f"{name} must be a string"
+        length = getattr(column.type, "length", None)
+        if length and len(value) > length:
+            return f"{name} must be at most {length} characters"
+    return None
+
+
+def bulk_response(results):
+    """
+    Per-item results in request order. 200 when every item succeeded,
+    207 when some failed; failures never roll back the successful items.
+    """
+    failed = sum(1 for r in results if r["status"] >= 400)
+    body = {
+        "results": results,
+        "succeeded": len(results) - failed,
+        "failed": failed,
+    }
+    return body, 207 if failed else 200
+
+
+def member_ids_body():
+    """
+    The {"member_ids": [...]} body of the attendance / roster endpoints,
+    deduplicated in request order. Raises ValueError for a 400 body.
+    """
+    data = request.get_json(silent=True)
+    ids = data.get("member_ids") if isinstance(data, dict) else None
+    if not isinstance(ids, list) or not ids:
+        raise ValueError("member_ids must be a non-empty JSON array")
+    if len(ids) > MAX_BULK_ITEMS:
+        raise ValueError(f"at most {MAX_BULK_ITEMS} member_ids per request")
+    member_ids = [to_id(v) for v in ids]
+    if any(m is None or not 0 < m < 2 ** 63 for m in member_ids):
+        raise ValueError("member_ids must be positive integers")
+    return list(dict.fromkeys(member_ids))
+
+
+def add_links(link, owner_column, owner_id, member_ids):
+    """
+    Links members to one event / team with a single
+    INSERT ... SELECT ... ON CONFLICT DO NOTHING RETURNING, never loading
+    the existing collection. Returns (added, unchanged, not_found) id
+    lists: new links, links that already existed, and unknown members.
+    """
+    stmt = (
+        insert(link)
+        .from_select(
+            [link.member_id, owner_column],
+            select(Member.id, literal(owner_id, owner_column.type))
+            .where(Member.id.in_(member_ids), Member.deleted_at.is_(None)),
+        )
+        .on_conflict_do_nothing()
+        .returning(link.member_id)
+    )
+    added = {m for (m,) in db.session.execute(stmt)}
+
+    rest = [m for m in member_ids if m not in added]
+    linked = {
+        m for (m,) in db.session.query(link.member_id).filter(owner_column == owner_id, link.member_id.in_(rest))
+    } if rest else set()
+    return (
+        [m for m in member_ids if m in added],
+        [m for m in rest if m in linked],
+        [m for m in rest if m not in linked],
+    )
+
+
+def remove_links(link, owner_column, owner_id, member_ids):
+    """
+    Unlinks members from one event / team with a single
+    DELETE ... WHERE member_id IN (...) RETURNING. Returns (removed, unchanged).
+    """
+    stmt = (
+        link.__table__.delete()
+        .where(owner_column == owner_id, link.member_id.in_(member_ids))
+        .returning(link.member_id)
+    )
+    removed = {m for (m,) in db.session.execute(stmt)}
+    return [m for m in member_ids if m in removed], [m for m in member_ids if m not in removed]
@@ -0,0 +1,156 @@
+# cascade.py
+"""
+Background deletes of content and members. The request sets deleted_at
+(the row drops out of every listing) and queues a "cascade_delete" job;
+the worker then deletes the dependent rows DELETE_BATCH_SIZE at a time,
+one short transaction and one job run per batch, and finally the row
+itself. Nothing is
+loaded through the ORM relationships. Until then live() keeps the
+dependent rows out of every query that reads them.
+"""
+from datetime import datetime, timezone
+
+from flask import current_app
+from sqlalchemy import exists, func, select, tuple_
+from sqlalchemy.orm import aliased
+
+from extension import db
+from models import Content, Job, Member, MemberEvent, MemberTeam, Report
+from versioning import bump_version
+
+# jobs.AGAIN (jobs.py imports this module, so it cannot be imported here)
+AGAIN = "again"
+
+# kind -> (parent model, [(dependent model, its column pointing at the parent)], versioned tables)
+CASCADES = {
+    "content": (Content, [(Report, Report.content_id)], ("content", "report")),
+    "member": (
+        Member,
+        [(MemberTeam, MemberTeam.member_id), (MemberEvent, MemberEvent.member_id), (Report, Report.submitted_by)],
+        ("member", "report", "team", "event"),
+    ),
+}
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def dedupe_key(kind, parent_id):
+    return f"{kind}:{parent_id}"
+
+
+def _remaining(kind, parent_id):
+    _, dependents, _ = CASCADES[kind]
+    return {
+        model.__tablename__: db.session.query(func.count()).select_from(model).filter(column == parent_id).scalar()
+        for model, column in dependents
+    }
+
+
+def live(parent, column):
+    """
+    Condition on rows whose `column` points at a `parent` row (Content or
+    Member): false while that row is being deleted. One probe of the
+    partial index on deleted rows; rows without a parent pass.
+    """
+    owner = aliased(parent)
+    return ~exists().where(owner.id == column, owner.deleted_at.isnot(None))
+
+
+def live_reports():
+    """live() conditions for Report: neither its content nor its member is being deleted."""
+    return (live(Content, Report.content_id), live(Member, Report.submitted_by))
+
+
+def mark_deleted(kind, parent):
+    """
+    Hides `parent` (call before the commit that enqueues the job) and
+    returns the job payload, with the dependent row counts at this point.
+    """
+    if parent.deleted_at is None:
+        parent.deleted_at = _now()
+    return {"kind": kind, "id": parent.id, "total": _remaining(kind, parent.id)}
+
+
+def _delete_batch(model, column, parent_id, size):
+    table = model.__table__
+    key = list(table.primary_key.columns)
+    batch = select(*key).where(column == parent_id).limit(size)
+    if len(key) == 1:
+        stmt = table.delete().where(key[0].in_(batch.scalar_subquery()))
+    else:
+        stmt = table.delete().where(tuple_(*key).in_(batch))
+    return db.session.execute(stmt).rowcount
+
+
+def cascade_delete(payload):
+    """
+    Job handler for "cascade_delete" (jobs.py). Each run deletes at most
+    one full batch and returns AGAIN while rows may be left, so no run
+    comes near JOB_LOCK_TIMEOUT however many rows there are. Safe to rerun
+    after a failure: every batch that committed stays deleted.
+    """
+    kind, parent_id = payload["kind"], payload["id"]
+    parent, dependents, versioned = CASCADES[kind]
+    size = current_app.config["DELETE_BATCH_SIZE"]
+
+    for model, column in dependents:
+        deleted = _delete_batch(model, column, parent_id, size)
+        if deleted:
+            bump_version(*versioned)
+        db.session.commit()
+        if deleted == size:
+            return AGAIN
+
+    # ON DELETE CASCADE takes any dependent row added after its batch
+    deleted = (
+        db.session.query(parent)
+        .filter(parent.id == parent_id, parent.deleted_at.isnot(None))
+        .delete(synchronize_session=False)
+    )
+    bump_version(*versioned)
+    db.session.commit()
+    return "deleted" if deleted else "skipped"
+
+
+def progress(kind, parent_id):
+    """Body and status of the progress endpoints: rows left per dependent table and the job's state."""
+    parent, _, _ = CASCADES[kind]
+    label = kind.capitalize()
+    deleted_at = db.session.query(parent.deleted_at).filter(parent.id == parent_id).first()
+    job = (
+        db.session.query(Job)
+        .filter(Job.kind == "cascade_delete", Job.dedupe_key == dedupe_key(kind, parent_id))
+        .order_by(Job.id.desc())
+        .first()
+    )
+    if deleted_at is None and job is None:
+        return {"error": f"{label} not found"}, 404
+    if deleted_at is not None and deleted_at[0] is None:
+        return {"error": f"{label} is not being deleted"}, 404
+
+    total = dict(job.payload.get("total", {})) if job else {}
+    if deleted_at is None:
+        remaining = {table: 0 for table in total}
+        status = "deleted"
+    else:
+        remaining = _remaining(kind, parent_id)
+        status = "failed" if job is not None and job.status == "failed" else "deleting"
+    body = {
+        "kind": kind,
+        "id": parent_id,
+        "status": status,
+        "deleted_at": deleted_at[0] if deleted_at else None,
+        "total": total,
+        "remaining": remaining,
+        "deleted": {table: max(n - remaining.get(table, 0), 0) for table, n in total.items()},
+    }
+    if job is not None:
+        body["job"] = {
+            "id": job.id,
+            "status": job.status,
+            "attempts": job.attempts,
+            "last_error": job.last_error,
+        }
+    return body, 200
@@ -0,0 +1,173 @@
+# compression.py
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+COMPRESSIBLE = ("application/json", "application/x-ndjson")
+
+
+class BodyCache:
+    """
+    Compressed bodies of ETagged responses, keyed by (ETag, encoding). The
+    ETag changes whenever the underlying tables do, so an entry never goes
+    stale; least recently used entries go once max_bytes is reached.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.size = 0
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, body, mimetype):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old[0])
+            self._entries[key] = (body, mimetype)
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+cache = BodyCache()
+
+
+def init_app(app):
+    cache.max_bytes = app.config["COMPRESS_CACHE_MAX_BYTES"]
+
+
+def negotiate():
+    """The encoding this request accepts: "br" (when brotli is installed), "gzip" or None."""
+    offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return request.accept_encodings.best_match(offered)
+
+
+def variant_etag(etag, encoding):
+    """Each encoding is its own representation, so it gets its own strong ETag."""
+    return f"{etag}-{encoding}" if encoding else etag
+
+
+def etag_variants(etag):
+    return [etag, variant_etag(etag, "gzip"), variant_etag(etag, "br")]
+
+
+def _compress(data, encoding):
+    config = current_app.config
+    if encoding == "br":
+        return brotli.compress(data, quality=config["COMPRESS_BROTLI_QUALITY"])
+    return gzip.compress(data, compresslevel=config["COMPRESS_GZIP_LEVEL"], mtime=0)
+
+
+def _compress_stream(chunks, encoding, level):
+    """Compresses a streamed body chunk by chunk; memory stays flat like the stream itself."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=level)
+        feed, finish = compressor.process, compressor.finish
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+        feed, finish = compressor.compress, compressor.flush
+    try:
+        for chunk in chunks:
+            out = feed(chunk.encode() if isinstance(chunk, str) else chunk)
+            if out:
+                yield out
+        yield finish()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def cached_response(etag):
+    """A ready response from the body cache for this ETag and the negotiated encoding, or None."""
+    encoding = negotiate()
+    if encoding is None:
+        return None
+    entry = cache.get((etag, encoding))
+    if entry is None:
+        return None
+    body, mimetype = entry
+    response = current_app.response_class(body, mimetype=mimetype)
+    response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    response.set_etag(variant_etag(etag, encoding))
+    return response
+
+
+def compress_response(response):
+    """
+    after_request: gzip/brotli for JSON and NDJSON 200 responses. Buffered
+    bodies are compressed from COMPRESS_MIN_SIZE bytes up and, when ETagged,
+    kept in the body cache; streamed bodies are compressed as they stream.
+    """
+    if (
+        response.status_code != 200
+        or request.method == "HEAD"
+        or response.mimetype not in COMPRESSIBLE
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = negotiate()
+    if encoding is None:
+        return response
+
+    config = current_app.config
+    etag, _ = response.get_etag()
+    if response.is_streamed:
+        level = config["COMPRESS_BROTLI_QUALITY"] if encoding == "br" else config["COMPRESS_GZIP_LEVEL"]
+        response.response = _compress_stream(response.response, encoding, level)
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < config["COMPRESS_MIN_SIZE"]:
+            return response
+        body = _compress(data, encoding)
+        response.set_data(body)
+        if etag:
+            cache.put((etag, encoding), body, response.mimetype)
+
+    response.headers["Content-Encoding"] = encoding
+    if etag:
+        response.set_etag(variant_etag(etag, encoding))
+    return response
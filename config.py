@@ -15,6 +15,41 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # connection pool, per gunicorn worker: keep
+    # workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) below Postgres max_connections
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+    # recycle before server/proxy idle timeouts; pre-ping drops connections
+    # that died in a failover before handing them out
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+    # checkouts slower than this are logged with the pool status
+    DB_POOL_SLOW_CHECKOUT_MS = float(os.getenv("DB_POOL_SLOW_CHECKOUT_MS", "100"))
+
+    # response encoder: "auto" uses orjson when it is installed, else the stdlib
+    JSON_BACKEND = os.getenv("JSON_BACKEND", "auto")
+
+    # gzip (or brotli, when installed) for JSON bodies of at least
+    # COMPRESS_MIN_SIZE bytes; compressed bodies of ETagged responses are
+    # cached per worker up to COMPRESS_CACHE_MAX_BYTES
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+    COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "5"))
+    COMPRESS_CACHE_MAX_BYTES = int(os.getenv("COMPRESS_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+    # revoked tokens (logout) are checked in memory; each worker picks up
+    # revocations made by the others every REVOCATION_SYNC_INTERVAL seconds
+    REVOCATION_SYNC_INTERVAL = float(os.getenv("REVOCATION_SYNC_INTERVAL", "5"))
+    REVOCATION_PRUNE_INTERVAL = float(os.getenv("REVOCATION_PRUNE_INTERVAL", "3600"))
+
+    # roles (Member.role, any case) granted each permission checked by
+    # routes.permission_required; the role comes from the token's claims
+    ROLE_PERMISSIONS = {
+        "manage": {r.strip().lower() for r in os.getenv("MANAGER_ROLES", "leader,admin").split(",") if r.strip()},
+    }
+
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(days=3)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=15)
 
@@ -25,3 +60,56 @@ class Config:
     JWT_COOKIE_SECURE = False
     JWT_COOKIE_SAMESITE = "None"
     JWT_COOKIE_CSRF_PROTECT = False
+
+    # password hashing (werkzeug method string, e.g. "scrypt:32768:8:1" or
+    # "pbkdf2:sha256:600000"); stored hashes with other parameters are
+    # re-hashed on the next successful login
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_SALT_LENGTH = int(os.getenv("PASSWORD_SALT_LENGTH", "16"))
+    # processes in the hashing pool (0 hashes inline in the request worker)
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    # hashes queued or running at once per worker before callers get a 503
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+    PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", "10"))
+
+    # Member.last_active is buffered in memory and written in batches:
+    # at most every ACTIVITY_FLUSH_INTERVAL seconds, or sooner once
+    # ACTIVITY_MAX_PENDING members are waiting
+    ACTIVITY_FLUSH_INTERVAL = float(os.getenv("ACTIVITY_FLUSH_INTERVAL", "15"))
+    ACTIVITY_MAX_PENDING = int(os.getenv("ACTIVITY_MAX_PENDING", "5000"))
+
+    # outgoing mail (Flask-Mail), sent only by the job worker (worker.py);
+    # MAIL_PORT=1025 with a local SMTP stand-in for development
+    MAIL_SERVER = os.getenv("MAIL_SERVER", "localhost")
+    MAIL_PORT = int(os.getenv("MAIL_PORT", "25"))
+    MAIL_USE_TLS = os.getenv("MAIL_USE_TLS", "false").lower() in ("1", "true", "yes")
+    MAIL_USE_SSL = os.getenv("MAIL_USE_SSL", "false").lower() in ("1", "true", "yes")
+    MAIL_USERNAME = os.getenv("MAIL_USERNAME")
+    MAIL_PASSWORD = os.getenv("MAIL_PASSWORD")
+    MAIL_DEFAULT_SENDER = os.getenv("MAIL_DEFAULT_SENDER", "noreply@localhost")
+    # Flask-Mail has no timeout of its own; the worker sets it as the
+    # default socket timeout so a stuck SMTP server cannot hold a job forever
+    MAIL_TIMEOUT = float(os.getenv("MAIL_TIMEOUT", "30"))
+
+    # background jobs (jobs.py): a worker claims JOB_BATCH_SIZE due jobs at a
+    # time and runs JOB_CONCURRENCY of them at once; a failed job is retried
+    # after JOB_RETRY_BASE * 2^(attempt - 1) seconds, JOB_MAX_ATTEMPTS times in all
+    JOB_BATCH_SIZE = int(os.getenv("JOB_BATCH_SIZE", "50"))
+    JOB_CONCURRENCY = int(os.getenv("JOB_CONCURRENCY", "4"))
+    JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1"))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+    JOB_RETRY_BASE = float(os.getenv("JOB_RETRY_BASE", "30"))
+    # running jobs not finished after this many seconds are requeued (worker lost)
+    JOB_LOCK_TIMEOUT = float(os.getenv("JOB_LOCK_TIMEOUT", "600"))
+    JOB_RETENTION_DAYS = float(os.getenv("JOB_RETENTION_DAYS", "7"))
+    JOB_MAINTENANCE_INTERVAL = float(os.getenv("JOB_MAINTENANCE_INTERVAL", "300"))
+    # background deletes (cascade.py) remove dependent rows this many per transaction
+    DELETE_BATCH_SIZE = int(os.getenv("DELETE_BATCH_SIZE", "1000"))
+
+    # report file uploads (content/uploads.py): files are stored under
+    # UPLOAD_DIR and served from UPLOAD_URL_PREFIX (Report.file_path); resumable
+    # uploads without a chunk for UPLOAD_EXPIRY_HOURS are purged by the worker
+    UPLOAD_DIR = os.getenv("UPLOAD_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "uploads"))
+    UPLOAD_URL_PREFIX = os.getenv("UPLOAD_URL_PREFIX", "/uploads/")
+    UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(2 * 1024 ** 3)))
+    UPLOAD_EXPIRY_HOURS = float(os.getenv("UPLOAD_EXPIRY_HOURS", "24"))
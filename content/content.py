@@ -1,64 +1,93 @@
 # content/content.py
 from datetime import datetime,timezone
 from extension import db
+from versioning import bump_version
 from models import Content, Report, Member
-from flask import request,jsonify
+from pagination import order_by_keys, paginate, page_body
+from filtering import date_range_arg, int_arg, list_arg, sort_arg
+from fields import key_of, requested_fields
+from serializers import CONTENT_FIELDS, CONTENT_LIST_FIELDS, CONTENT_REPORT_FIELDS, REPORT_FIELDS
+from streaming import ndjson_response
+from bulk import bulk_items, bulk_response, item_error, item_ok, string_error, to_id
+import cascade
+import jobs
+from flask import current_app,request,jsonify
+from flask_jwt_extended import get_jwt, get_jwt_identity
+
+CONTENT_KEYS = [Content.created_at, Content.id, Report.id]
+
+
+def _contents_query(names):
+    # One SELECT of just the requested columns instead of lazy-loading
+    # c.reports and r.member per row (N+1 round trips).
+    query = CONTENT_LIST_FIELDS.query(names, CONTENT_KEYS).filter(
+        Content.deleted_at.is_(None), cascade.live(Member, Report.submitted_by)
+    )
+    return order_by_keys(query, CONTENT_KEYS)
+
 
 def list_contents():
-    contents = Content.query.order_by(Content.created_at).all()
+    try:
+        names = CONTENT_LIST_FIELDS.requested()
+        rows, next_cursor, paged = paginate(_contents_query(names), CONTENT_KEYS, key_of(CONTENT_KEYS))
+    except ValueError as e:
+        return {"error": str(e)}, 400
 
-    rows = []
-    for c in contents:
-        for r in c.reports:  # r is Report
-            rows.append({
-                "report_id": r.id,
-                "content_id": c.id,
-                "content_title": c.title,
-                "content_type": c.content_type,
-
-                "submitted_by": r.submitted_by,
-                "submitted_by_name": r.member.member_name if r.member else None,
-
-                "status": r.status,
-                "submission_date": r.submission_date.isoformat() if r.submission_date else None,
-                "file_path": r.file_path,
-                "action": r.action,
-            })
+    items = CONTENT_LIST_FIELDS.rows(rows, names)
+    if paged:
+        return page_body(items, next_cursor), 200
+    return items, 200
 
-    return rows
+
+def stream_contents():
+    try:
+        names = CONTENT_LIST_FIELDS.requested()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return ndjson_response(_contents_query(names), CONTENT_LIST_FIELDS.serializer(names))
 
 
 
 def get_content_by_id(content_id):
     """
     Returns one content item + all its submissions (reports).
+    The reports are only queried when `reports` or `reports_count` is asked for.
     """
-    c = Content.query.get(content_id)
+    try:
+        names = requested_fields(list(CONTENT_FIELDS.fields) + ["reports", "reports_count"])
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    columns = [n for n in names if n in CONTENT_FIELDS.fields]
+    c = (
+        CONTENT_FIELDS.query(columns, [Content.id])
+        .filter(Content.id == content_id, Content.deleted_at.is_(None))
+        .first()
+    )
     if not c:
         return {"error": "Content not found"}, 404
 
-    reports = []
-    for r in c.reports:
-        reports.append({
-            "report_id": r.id,
-            "report_title": r.title,
-            "submitted_by": r.submitted_by,
-            "submitted_by_name": r.member.member_name if r.member else None,
-            "status": r.status,
-            "submission_date": r.submission_date.isoformat() if r.submission_date else None,
-            "file_path": r.file_path,
-            "action": r.action,
-        })
-
-    body = {
-        "content_id": c.id,
-        "content_title": c.title,
-        "content_type": c.content_type,
-        "description": c.description,
-        "created_at": c.created_at.isoformat() if c.created_at else None,
-        "reports": reports,
-        "reports_count": len(reports),
-    }
+    body = CONTENT_FIELDS.row(c, columns)
+
+    if "reports" in names:
+        report_names = list(CONTENT_REPORT_FIELDS.fields)
+        report_rows = (
+            CONTENT_REPORT_FIELDS.query(report_names)
+            .filter(Report.content_id == content_id, cascade.live(Member, Report.submitted_by))
+            .order_by(Report.id)
+            .all()
+        )
+        reports = CONTENT_REPORT_FIELDS.rows(report_rows, report_names)
+        body["reports"] = reports
+        if "reports_count" in names:
+            body["reports_count"] = len(reports)
+    elif "reports_count" in names:
+        body["reports_count"] = (
+            db.session.query(db.func.count(Report.id))
+            .filter(Report.content_id == content_id, cascade.live(Member, Report.submitted_by))
+            .scalar()
+        )
+
     return body, 200
 
 
@@ -81,6 +110,7 @@ def create_content():
         created_at=datetime.now(timezone.utc),
     )
     db.session.add(new_content)
+    bump_version("content")
     db.session.commit()
 
     return {"message": "Content created successfully", "id": new_content.id}, 201
@@ -89,7 +119,7 @@ def create_content():
 def update_content(content_id):
     data = request.get_json() or {}
     c = Content.query.get(content_id)
-    if not c:
+    if not c or c.deleted_at:
         return {"error": "Content not found"}, 404
 
     if "title" in data:
@@ -103,76 +133,133 @@ def update_content(content_id):
     if "description" in data:
         c.description = data["description"]
 
+    bump_version("content")
     db.session.commit()
     return {"message": "Content updated successfully", "id": c.id}, 200
 
 
 def delete_content(content_id):
+    """
+    ?mode=background hides the content at once and leaves its reports to
+    the worker (cascade.py): 202 with the progress body.
+    """
     c = Content.query.get(content_id)
     if not c:
         return {"error": "Content not found"}, 404
 
+    if request.args.get("mode") == "background":
+        payload = cascade.mark_deleted("content", c)
+        jobs.enqueue("cascade_delete", [payload], [cascade.dedupe_key("content", content_id)])
+        bump_version("content")
+        db.session.commit()
+        body, _ = cascade.progress("content", content_id)
+        return body, 202
+
     db.session.delete(c)
+    bump_version("content", "report")
     db.session.commit()
     return {"message": "Content deleted successfully", "id": content_id}, 200
 
 
+def content_deletion(content_id):
+    return cascade.progress("content", content_id)
+
+
+
+REPORT_SORTS = {
+    "id": [Report.id],
+    "submission_date": [Report.submission_date, Report.id],
+}
+
+
+def _filtered_reports():
+    """
+    Report rows narrowed by the ?status, action, content_id, submitted_by,
+    submitted_from/submitted_to, sort and fields parameters, joining content
+    and member only for the fields that need them. Reports of content or
+    members being deleted are left out.
+    Returns (query, names, keys, descending); raises ValueError for a 400 body.
+    """
+    names = REPORT_FIELDS.requested()
+    keys, descending = sort_arg(REPORT_SORTS, "id")
+    query = REPORT_FIELDS.query(names, keys).filter(*cascade.live_reports())
+
+    statuses = list_arg("status", REPORT_STATUSES)
+    if statuses:
+        query = query.filter(Report.status.in_(statuses))
+    actions = list_arg("action", REPORT_ACTIONS)
+    if actions:
+        query = query.filter(Report.action.in_(actions))
+    content_id = int_arg("content_id")
+    if content_id is not None:
+        query = query.filter(Report.content_id == content_id)
+    submitted_by = int_arg("submitted_by")
+    if submitted_by is not None:
+        query = query.filter(Report.submitted_by == submitted_by)
+    query = query.filter(*date_range_arg(Report.submission_date, "submitted_from", "submitted_to"))
+
+    return order_by_keys(query, keys, descending), names, keys, descending
+
 
 def list_reports():
-    reports = Report.query.order_by(Report.id).all()
-    result = []
-    for r in reports:
-        result.append({
-            "id": r.id,
-            "report_title": r.title,
-            "status": r.status,
-            "submission_date": r.submission_date.isoformat() if r.submission_date else None,
-            "file_path": r.file_path,
-            "action": r.action,
-            "content_id": r.content_id,
-            "content_title": r.content.title if r.content else None,
-            "submitted_by": r.submitted_by,
-            "submitted_by_name": r.member.member_name if r.member else None,
-        })
-    return result
+    try:
+        query, names, keys, descending = _filtered_reports()
+        reports, next_cursor, paged = paginate(query, keys, key_of(keys), descending)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    items = REPORT_FIELDS.rows(reports, names)
+    if paged:
+        return page_body(items, next_cursor), 200
+    return items, 200
+
+
+def stream_reports():
+    try:
+        query, names, _, _ = _filtered_reports()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return ndjson_response(query, REPORT_FIELDS.serializer(names))
 
 
 def get_report_by_id(report_id):
-    r = Report.query.get(report_id)
+    try:
+        names = REPORT_FIELDS.requested()
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    r = REPORT_FIELDS.query(names).filter(Report.id == report_id, *cascade.live_reports()).first()
     if not r:
         return {"error": "Report not found"}, 404
 
-    body = {
-        "id": r.id,
-        "report_title": r.title,
-        "status": r.status,
-        "submission_date": r.submission_date.isoformat() if r.submission_date else None,
-        "file_path": r.file_path,
-        "action": r.action,
-
-        "content_id": r.content_id,
-        "content_title": r.content.title if r.content else None,
-        "submitted_by": r.submitted_by,
-        "submitted_by_name": r.member.member_name if r.member else None,
-    }
-    return body, 200
+    return REPORT_FIELDS.row(r, names), 200
+
+
+def acts_for(member_id):
+    """True for `member_id`'s own token and for managers' (ROLE_PERMISSIONS["manage"])."""
+    managers = current_app.config["ROLE_PERMISSIONS"]["manage"]
+    return str(member_id) == get_jwt_identity() or str(get_jwt().get("role", "")).lower() in managers
 
 
 def create_report():
+    """submitted_by defaults to the caller; only a manager may file a report for someone else."""
     data = request.get_json() or {}
     content_id = data.get("content_id")
-    submitted_by = data.get("submitted_by")
+    submitted_by = data.get("submitted_by") or to_id(get_jwt_identity())
     title = data.get("title")
 
     if not content_id or not submitted_by or not title:
         return {"error": "content_id, submitted_by, title are required"}, 400
 
+    if not acts_for(submitted_by):
+        return {"error": "Forbidden"}, 403
+
     content = Content.query.get(content_id)
-    if not content:
+    if not content or content.deleted_at:
         return {"error": "Content not found"}, 404
 
     member = Member.query.get(submitted_by)
-    if not member:
+    if not member or member.deleted_at:
         return {"error": "Member not found"}, 404
 
     new_report = Report(
@@ -185,62 +272,105 @@ def create_report():
         action="none",
     )
     db.session.add(new_report)
+    bump_version("report")
     db.session.commit()
 
     return {"message": "Report created successfully", "id": new_report.id}, 201
 
 
-def update_report(report_id):
-    data = request.get_json() or {}
-    r = Report.query.get(report_id)
-    if not r:
-        return {"error": "Report not found"}, 404
+REPORT_STATUSES = ("pending", "submitted", "late", "approved", "revision_requested")
+REPORT_ACTIONS = ("none", "send_reminder", "approve", "request_revision")
+
+
+def _report_changes(data):
+    """
+    Validated column changes from an update body.
+    Returns (changes, None) or (None, error message).
+    """
+    changes = {}
 
     if "title" in data:
-        r.title = data["title"]
+        changes["title"] = data["title"]
 
     if "status" in data:
-        if data["status"] not in ("pending", "submitted", "late", "approved", "revision_requested"):
-            return {"error": "Invalid status"}, 400
-        r.status = data["status"]
+        if data["status"] not in REPORT_STATUSES:
+            return None, "Invalid status"
+        changes["status"] = data["status"]
 
     if "action" in data:
-        if data["action"] not in ("none", "send_reminder", "approve", "request_revision"):
-            return {"error": "Invalid action"}, 400
-        r.action = data["action"]
+        if data["action"] not in REPORT_ACTIONS:
+            return None, "Invalid action"
+        changes["action"] = data["action"]
 
     if "file_path" in data:
-        r.file_path = data["file_path"]
+        changes["file_path"] = data["file_path"]
 
     if "submission_date" in data:
         # accept either None or ISO string
         if data["submission_date"] is None:
-            r.submission_date = None
+            changes["submission_date"] = None
         else:
             try:
-                r.submission_date = datetime.fromisoformat(data["submission_date"])
-            except ValueError:
-                return {"error": "submission_date must be ISO format"}, 400
+                changes["submission_date"] = datetime.fromisoformat(data["submission_date"])
+            except (TypeError, ValueError):
+                return None, "submission_date must be ISO format"
+
+    return changes, None
+
+
+def _enqueue_reminders(report_ids):
+    """Queues the mail for reports set to send_reminder; worker.py sends it after the commit."""
+    jobs.enqueue(
+        "report_reminder",
+        [{"report_id": report_id} for report_id in report_ids],
+        [str(report_id) for report_id in report_ids],
+    )
+
+
+def _live_report(report_id):
+    """The report, or None if it does not exist or its content or member is being deleted."""
+    return Report.query.filter(Report.id == report_id, *cascade.live_reports()).first()
+
+
+def update_report(report_id):
+    data = request.get_json() or {}
+    r = _live_report(report_id)
+    if not r:
+        return {"error": "Report not found"}, 404
+
+    changes, error = _report_changes(data)
+    if error:
+        return {"error": error}, 400
+
+    for column, value in changes.items():
+        setattr(r, column, value)
 
+    if changes.get("action") == "send_reminder":
+        _enqueue_reminders([r.id])
+
+    bump_version("report")
     db.session.commit()
     return {"message": "Report updated successfully", "id": r.id}, 200
 
 
 def delete_report(report_id):
-    r = Report.query.get(report_id)
+    r = _live_report(report_id)
     if not r:
         return {"error": "Report not found"}, 404
 
     db.session.delete(r)
+    bump_version("report")
     db.session.commit()
     return {"message": "Report deleted successfully", "id": report_id}, 200
 
 
 def submit_report(report_id):
     data = request.get_json() or {}
-    r = Report.query.get(report_id)
+    r = _live_report(report_id)
     if not r:
         return {"error": "Report not found"}, 404
+    if not acts_for(r.submitted_by):
+        return {"error": "Forbidden"}, 403
 
     file_path = data.get("file_path")
     if not file_path:
@@ -251,5 +381,138 @@ def submit_report(report_id):
     r.submission_date = datetime.now(timezone.utc)
     r.action = "none"
 
+    bump_version("report")
     db.session.commit()
     return {"message": "Report submitted successfully", "id": r.id}, 200
+
+
+def create_reports_bulk():
+    """
+    Creates many reports from a JSON array in one multi-row INSERT.
+    Content and member ids are checked with one IN lookup each; invalid
+    items are reported per index and do not abort the rest of the batch.
+    """
+    try:
+        items = bulk_items()
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    results = [None] * len(items)
+    candidates = []
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[i] = item_error(i, 400, "item must be an object")
+            continue
+        content_id = to_id(item.get("content_id"))
+        submitted_by = to_id(item.get("submitted_by"))
+        title = item.get("title")
+        if not content_id or not submitted_by or not title:
+            results[i] = item_error(i, 400, "content_id, submitted_by, title are required")
+            continue
+        error = string_error(item, {"title": Report.title})
+        if error:
+            results[i] = item_error(i, 400, error)
+            continue
+        candidates.append((i, content_id, submitted_by, title))
+
+    # FOR KEY SHARE: the rows found cannot be deleted before the INSERT commits
+    content_ids = {c[1] for c in candidates}
+    member_ids = {c[2] for c in candidates}
+    known_contents = {
+        cid for (cid,) in db.session.query(Content.id)
+        .filter(Content.id.in_(content_ids), Content.deleted_at.is_(None))
+        .with_for_update(key_share=True)
+    } if content_ids else set()
+    known_members = {
+        mid for (mid,) in db.session.query(Member.id)
+        .filter(Member.id.in_(member_ids), Member.deleted_at.is_(None))
+        .with_for_update(key_share=True)
+    } if member_ids else set()
+
+    indexes = []
+    rows = []
+    for i, content_id, submitted_by, title in candidates:
+        if content_id not in known_contents:
+            results[i] = item_error(i, 404, "Content not found")
+        elif submitted_by not in known_members:
+            results[i] = item_error(i, 404, "Member not found")
+        else:
+            indexes.append(i)
+            rows.append({
+                "content_id": content_id,
+                "submitted_by": submitted_by,
+                "title": title,
+                "status": "pending",
+                "submission_date": None,
+                "file_path": None,
+                "action": "none",
+            })
+
+    if rows:
+        new_ids = db.session.scalars(
+            db.insert(Report).returning(Report.id, sort_by_parameter_order=True),
+            rows,
+        ).all()
+        bump_version("report")
+        db.session.commit()
+        for i, new_id in zip(indexes, new_ids):
+            results[i] = item_ok(i, 201, id=new_id)
+
+    return bulk_response(results)
+
+
+def update_reports_bulk():
+    """
+    Applies many report updates ({"id": ..., <update_report fields>}) as one
+    executemany UPDATE keyed by primary key, after a single IN lookup.
+    """
+    try:
+        items = bulk_items()
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    results = [None] * len(items)
+    candidates = []
+    seen = set()
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[i] = item_error(i, 400, "item must be an object")
+            continue
+        report_id = to_id(item.get("id"))
+        if not report_id:
+            results[i] = item_error(i, 400, "id is required")
+            continue
+        if report_id in seen:
+            results[i] = item_error(i, 400, "duplicate id in batch")
+            continue
+        changes, error = _report_changes(item)
+        if error:
+            results[i] = item_error(i, 400, error)
+            continue
+        seen.add(report_id)
+        candidates.append((i, report_id, changes))
+
+    known = {
+        rid for (rid,) in db.session.query(Report.id).filter(Report.id.in_(seen), *cascade.live_reports())
+    } if seen else set()
+
+    indexes = []
+    rows = []
+    for i, report_id, changes in candidates:
+        if report_id not in known:
+            results[i] = item_error(i, 404, "Report not found")
+        elif not changes:
+            results[i] = item_ok(i, 200, id=report_id)
+        else:
+            indexes.append((i, report_id))
+            rows.append({"id": report_id, **changes})
+
+    if rows:
+        db.session.execute(db.update(Report), rows)
+        _enqueue_reminders([row["id"] for row in rows if row.get("action") == "send_reminder"])
+        bump_version("report")
+        db.session.commit()
+        for i, report_id in indexes:
+            results[i] = item_ok(i, 200, id=report_id)
+
+    return bulk_response(results)
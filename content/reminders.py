@@ -0,0 +1,62 @@
+# content/reminders.py
+from flask import current_app
+from flask_mail import Message
+
+from extension import db, mail
+from versioning import bump_version
+from models import Content, Member, Report
+
+# reports in these states have nothing left to remind about
+DONE_STATUSES = ("submitted", "approved")
+
+
+def send_report_reminder(payload):
+    """
+    Job handler for "report_reminder" (jobs.py): mails the member who owes
+    the report, then clears the report's send_reminder action.
+    """
+    row = (
+        db.session.query(
+            Report.id,
+            Report.title,
+            Report.status,
+            Report.action,
+            Member.member_name,
+            Member.email,
+            Content.title.label("content_title"),
+        )
+        .join(Member, Member.id == Report.submitted_by)
+        .outerjoin(Content, Content.id == Report.content_id)
+        .filter(Report.id == payload["report_id"], Member.deleted_at.is_(None), Content.deleted_at.is_(None))
+        .first()
+    )
+    if row is None or row.action != "send_reminder":
+        return "skipped"
+    if row.status in DONE_STATUSES:
+        _clear_action(row.id)
+        return "skipped"
+
+    subject = f"Reminder: {row.content_title or row.title}"
+    mail.send(Message(
+        subject=subject,
+        recipients=[row.email],
+        sender=current_app.config["MAIL_DEFAULT_SENDER"],
+        body=(
+            f"Hi {row.member_name},\n\n"
+            f"This is a reminder that your report \"{row.title}\""
+            + (f" for \"{row.content_title}\"" if row.content_title else "")
+            + f" is still {row.status.replace('_', ' ')}.\n"
+        ),
+    ))
+
+    _clear_action(row.id)
+    return "sent"
+
+
+def _clear_action(report_id):
+    # only if nobody changed the action meanwhile
+    db.session.query(Report).filter(
+        Report.id == report_id, Report.action == "send_reminder"
+    ).update({"action": "none"}, synchronize_session=False)
+    bump_version("report")
+    db.session.commit()
@@ -0,0 +1,414 @@
+# content/uploads.py
+"""
+Report file uploads, streamed to UPLOAD_DIR block by block (never the
+whole file in memory), hashed with sha256 on the way in and stored once
+per hash under UPLOAD_DIR/objects.
+
+One request:  POST  /api/reports/<id>/upload, a multipart "file" part or a raw body
+Resumable:    POST  /api/reports/<id>/uploads  {"filename", "size"} -> upload_id
+              PATCH /api/reports/<id>/uploads/<upload_id>, raw chunk at Upload-Offset
+              GET   /api/reports/<id>/uploads/<upload_id>, the offset to resume from
+
+The request that completes the file sets the report's file_path, status
+and submission_date, and marks the upload complete, in one transaction.
+"""
+import fcntl
+import hashlib
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app, request
+from flask_jwt_extended import get_jwt_identity
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.sansio.multipart import Data, Epilogue, Field, File, MultipartDecoder, NeedData
+from werkzeug.utils import secure_filename
+
+from extension import db
+from models import Report, ReportUpload
+from versioning import bump_version
+import cascade
+from content.content import acts_for
+
+BLOCK_SIZE = 1024 * 1024
+
+# upload id -> (offset, sha256 of the first `offset` bytes), so the next
+# chunk continues the hash instead of re-reading the partial file
+MAX_HASHERS = 256
+_lock = threading.Lock()
+_hashers = OrderedDict()
+
+
+class UploadError(Exception):
+    def __init__(self, message, status=400, **extra):
+        super().__init__(message)
+        self.body = {"error": message, **extra}
+        self.status = status
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _partial_path(upload_id):
+    directory = os.path.join(current_app.config["UPLOAD_DIR"], "partial")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, upload_id)
+
+
+def _object_path(sha256):
+    return os.path.join(current_app.config["UPLOAD_DIR"], "objects", sha256[:2], sha256)
+
+
+def _file_path(sha256):
+    """Report.file_path of a stored object."""
+    return f"{current_app.config['UPLOAD_URL_PREFIX']}{sha256[:2]}/{sha256}"
+
+
+def _authorize(report_id):
+    """The report's own member or a manager may upload its file."""
+    submitted_by = (
+        db.session.query(Report.submitted_by)
+        .filter(Report.id == report_id, *cascade.live_reports())
+        .scalar()
+    )
+    if submitted_by is None:
+        raise UploadError("Report not found", 404)
+    if not acts_for(submitted_by):
+        raise UploadError("Forbidden", 403)
+
+
+def _member_id():
+    identity = get_jwt_identity()
+    return int(identity) if str(identity).isdigit() else None
+
+
+def _copy(stream, out, hasher, limit):
+    """Copies `stream` into `out` block by block, hashing it. At most `limit` bytes."""
+    written = 0
+    while True:
+        block = stream.read(BLOCK_SIZE)
+        if not block:
+            return written
+        if written + len(block) > limit:
+            raise UploadError("Upload is larger than its declared size", 413)
+        out.write(block)
+        hasher.update(block)
+        written += len(block)
+
+
+def _receive_multipart(path, hasher, limit):
+    """Streams the "file" part of a multipart body into `path`. Returns (filename, size)."""
+    boundary = request.mimetype_params.get("boundary", "").encode("ascii", "ignore")
+    if not boundary:
+        raise UploadError("multipart body without a boundary")
+
+    # the decoder buffers at most one block plus a part's headers
+    decoder = MultipartDecoder(boundary, max_form_memory_size=BLOCK_SIZE + 64 * 1024, max_parts=16)
+    filename, size, out, receiving = None, 0, None, False
+    try:
+        while True:
+            block = request.stream.read(BLOCK_SIZE)
+            decoder.receive_data(block or None)
+            event = decoder.next_event()
+            while not isinstance(event, (NeedData, Epilogue)):
+                if isinstance(event, File):
+                    receiving = event.name == "file" and out is None
+                    if receiving:
+                        filename = event.filename
+                        out = open(path, "wb")
+                elif isinstance(event, Field):
+                    receiving = False
+                elif isinstance(event, Data) and receiving:
+                    size += len(event.data)
+                    if size > limit:
+                        raise UploadError("File is too large", 413)
+                    out.write(event.data)
+                    hasher.update(event.data)
+                event = decoder.next_event()
+            if isinstance(event, Epilogue) or not block:
+                break
+    except RequestEntityTooLarge:
+        raise UploadError("Multipart part headers are too large", 413)
+    except ValueError:
+        raise UploadError("Malformed multipart body")
+    finally:
+        if out is not None:
+            out.close()
+
+    if out is None:
+        raise UploadError('multipart body has no "file" part')
+    return filename, size
+
+
+def _store(path, sha256):
+    """Moves a finished file to its object path, or drops it if that content is stored already."""
+    target = _object_path(sha256)
+    if os.path.exists(target):
+        os.remove(path)
+        return True
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    os.replace(path, target)
+    return False
+
+
+def _submit(report_id, upload_id, sha256, size, deduplicated):
+    """Points the report at the stored file; call with the upload row already in the session."""
+    now = _now()
+    file_path = _file_path(sha256)
+    updated = (
+        db.session.query(Report)
+        .filter(Report.id == report_id, *cascade.live_reports())
+        .update(
+            {"file_path": file_path, "status": "submitted", "submission_date": now, "action": "none"},
+            synchronize_session=False,
+        )
+    )
+    if not updated:
+        db.session.rollback()
+        raise UploadError("Report not found", 404)
+    bump_version("report")
+    db.session.commit()
+    return {
+        "message": "Report submitted successfully",
+        "id": report_id,
+        "upload_id": upload_id,
+        "file_path": file_path,
+        "sha256": sha256,
+        "size": size,
+        "deduplicated": deduplicated,
+    }, 200
+
+
+def upload_report_file(report_id):
+    """One-request upload: a multipart "file" part, or the raw body (?filename= names it)."""
+    upload_id = uuid.uuid4().hex
+    path = None
+    try:
+        _authorize(report_id)
+        db.session.rollback()  # no connection held while the body streams in
+
+        limit = current_app.config["UPLOAD_MAX_BYTES"]
+        path = _partial_path(upload_id)
+        hasher = hashlib.sha256()
+        if request.mimetype == "multipart/form-data":
+            filename, size = _receive_multipart(path, hasher, limit)
+        else:
+            filename = request.args.get("filename")
+            with open(path, "wb") as out:
+                size = _copy(request.stream, out, hasher, limit)
+        if size == 0:
+            raise UploadError("Empty upload")
+
+        sha256 = hasher.hexdigest()
+        deduplicated = _store(path, sha256)
+        db.session.add(ReportUpload(
+            id=upload_id,
+            report_id=report_id,
+            member_id=_member_id(),
+            filename=_clean_filename(filename),
+            size=size,
+            sha256=sha256,
+            status="complete",
+            completed_at=_now(),
+            updated_at=_now(),
+        ))
+        return _submit(report_id, upload_id, sha256, size, deduplicated)
+    except UploadError as e:
+        return e.body, e.status
+    finally:
+        if path is not None and os.path.exists(path):
+            os.remove(path)
+
+
+def _clean_filename(filename):
+    return (secure_filename(filename or "") or "upload")[:255]
+
+
+def create_upload(report_id):
+    """Starts a resumable upload of `size` bytes."""
+    data = request.get_json() or {}
+    size = data.get("size")
+    if not isinstance(size, int) or isinstance(size, bool) or size < 1:
+        return {"error": "size must be a positive integer (bytes)"}, 400
+    if size > current_app.config["UPLOAD_MAX_BYTES"]:
+        return {"error": "File is too large"}, 413
+
+    try:
+        _authorize(report_id)
+    except UploadError as e:
+        return e.body, e.status
+
+    upload = ReportUpload(
+        id=uuid.uuid4().hex,
+        report_id=report_id,
+        member_id=_member_id(),
+        filename=_clean_filename(data.get("filename")),
+        size=size,
+        status="uploading",
+    )
+    db.session.add(upload)
+    db.session.commit()
+    open(_partial_path(upload.id), "wb").close()
+    return {"upload_id": upload.id, "offset": 0, "size": size, "status": "uploading"}, 201
+
+
+def _load_upload(report_id, upload_id):
+    upload = db.session.get(ReportUpload, upload_id)
+    if upload is None or upload.report_id != report_id:
+        raise UploadError("Upload not found", 404)
+    _authorize(report_id)
+    return upload
+
+
+def _upload_body(upload, offset):
+    body = {
+        "upload_id": upload.id,
+        "filename": upload.filename,
+        "size": upload.size,
+        "offset": offset,
+        "status": upload.status,
+    }
+    if upload.status == "complete":
+        body.update(sha256=upload.sha256, file_path=_file_path(upload.sha256))
+    return body
+
+
+def get_upload(report_id, upload_id):
+    """Where a resumable upload stands: send the next chunk at `offset`."""
+    try:
+        upload = _load_upload(report_id, upload_id)
+    except UploadError as e:
+        return e.body, e.status
+
+    if upload.status == "complete":
+        return _upload_body(upload, upload.size), 200
+    try:
+        offset = os.path.getsize(_partial_path(upload.id))
+    except FileNotFoundError:
+        return {"error": "Upload expired"}, 410
+    return _upload_body(upload, offset), 200
+
+
+def _hasher_at(upload_id, path, offset):
+    with _lock:
+        cached = _hashers.pop(upload_id, None)
+    if cached is not None and cached[0] == offset:
+        return cached[1]
+
+    # earlier chunks went to another worker (or before a restart): hash them from disk
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        remaining = offset
+        while remaining:
+            block = f.read(min(BLOCK_SIZE, remaining))
+            if not block:
+                break
+            hasher.update(block)
+            remaining -= len(block)
+    return hasher
+
+
+def _keep_hasher(upload_id, offset, hasher):
+    with _lock:
+        _hashers[upload_id] = (offset, hasher)
+        while len(_hashers) > MAX_HASHERS:
+            _hashers.popitem(last=False)
+
+
+def upload_chunk(report_id, upload_id):
+    """
+    Appends the raw body at the Upload-Offset header, which must equal the
+    bytes received so far. The chunk that reaches `size` completes the
+    upload and submits the report.
+    """
+    try:
+        upload = _load_upload(report_id, upload_id)
+        if upload.status == "complete":
+            # a retried final chunk whose response was lost
+            return _upload_body(upload, upload.size), 200
+        try:
+            offset = int(request.headers.get("Upload-Offset", ""))
+        except ValueError:
+            raise UploadError("Upload-Offset header (bytes received so far) is required")
+        size = upload.size
+        db.session.rollback()  # no connection held while the chunk streams in
+
+        path = _partial_path(upload_id)
+        try:
+            out = open(path, "r+b")
+        except FileNotFoundError:
+            raise UploadError("Upload expired", 410)
+        with out:
+            try:
+                fcntl.flock(out, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise UploadError("Another chunk of this upload is in progress", 409)
+
+            received = os.fstat(out.fileno()).st_size
+            if offset != received:
+                raise UploadError("Upload-Offset does not match the bytes received", 409, offset=received)
+
+            hasher = _hasher_at(upload_id, path, received)
+            out.seek(received)
+            try:
+                received += _copy(request.stream, out, hasher, size - received)
+            except UploadError:
+                out.truncate(offset)
+                raise
+            out.flush()
+
+            if received < size:
+                _keep_hasher(upload_id, received, hasher)
+                return {"upload_id": upload_id, "offset": received, "size": size, "status": "uploading"}, 200
+
+            # complete; still under the lock, so only one request finishes it
+            sha256 = hasher.hexdigest()
+            deduplicated = _store(path, sha256)
+            completed = (
+                db.session.query(ReportUpload)
+                .filter(ReportUpload.id == upload_id, ReportUpload.status == "uploading")
+                .update(
+                    {"status": "complete", "sha256": sha256, "completed_at": _now(), "updated_at": _now()},
+                    synchronize_session=False,
+                )
+            )
+            if not completed:
+                db.session.rollback()
+                raise UploadError("Upload not found", 404)
+            return _submit(report_id, upload_id, sha256, size, deduplicated)
+    except UploadError as e:
+        return e.body, e.status
+
+
+def purge_stale_uploads(max_age_hours):
+    """
+    Deletes resumable uploads that have not received a chunk for
+    `max_age_hours`, with their partial files. Run by the job worker.
+    """
+    cutoff = _now() - timedelta(hours=max_age_hours)
+    stale = (
+        db.session.query(ReportUpload.id)
+        .filter(ReportUpload.status == "uploading", ReportUpload.updated_at < cutoff)
+        .all()
+    )
+    purged = []
+    for (upload_id,) in stale:
+        path = _partial_path(upload_id)
+        try:
+            if os.path.getmtime(path) >= cutoff.timestamp():
+                continue  # still receiving chunks
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        purged.append(upload_id)
+    if purged:
+        db.session.query(ReportUpload).filter(ReportUpload.id.in_(purged)).delete(synchronize_session=False)
+        db.session.commit()
+    with _lock:
+        for upload_id in purged:
+            _hashers.pop(upload_id, None)
+    return len(purged)
@@ -0,0 +1,69 @@
+from extension import db
+from models import Content, Member, Report, ReportStatusCount
+from content.content import REPORT_STATUSES
+from pagination import paginate, page_body
+from fields import requested_fields
+
+
+SUMMARY_FIELDS = ("content_id", "content_title", "content_type", "counts", "total")
+
+
+def report_summary():
+    """
+    Report counts per content and status, read from report_status_counts
+    (kept current by triggers on report): one row per content, no matter
+    how many reports it has. Reports of members being deleted are still in
+    those counts until the worker removes them; they are subtracted, as
+    every report listing already hides them.
+    """
+    try:
+        names = requested_fields(SUMMARY_FIELDS)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    with_counts = "counts" in names or "total" in names
+
+    query = (
+        db.session.query(Content.id, Content.title, Content.content_type)
+        .filter(Content.deleted_at.is_(None))
+    )
+    if with_counts:
+        # few rows: read from the deleted members (ix_member_deleted_id) to their reports
+        hidden = (
+            db.session.query(Report.content_id, Report.status, db.func.count().label("reports"))
+            .join(Member, Member.id == Report.submitted_by)
+            .filter(Member.deleted_at.isnot(None))
+            .group_by(Report.content_id, Report.status)
+            .subquery()
+        )
+        reports = ReportStatusCount.reports - db.func.coalesce(hidden.c.reports, 0)
+        query = (
+            query.add_columns(*[
+                db.func.coalesce(
+                    db.func.sum(reports).filter(ReportStatusCount.status == status), 0
+                ).label(status)
+                for status in REPORT_STATUSES
+            ])
+            .outerjoin(ReportStatusCount, ReportStatusCount.content_id == Content.id)
+            .outerjoin(
+                hidden,
+                db.and_(hidden.c.content_id == ReportStatusCount.content_id, hidden.c.status == ReportStatusCount.status),
+            )
+            .group_by(Content.id)
+        )
+    try:
+        rows, next_cursor, paged = paginate(query.order_by(Content.id), [Content.id], lambda r: (r.id,))
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    items = []
+    for r in rows:
+        item = {"content_id": r.id, "content_title": r.title, "content_type": r.content_type}
+        if with_counts:
+            by_status = {status: int(getattr(r, status)) for status in REPORT_STATUSES}
+            item["counts"] = by_status
+            item["total"] = sum(by_status.values())
+        items.append({n: item[n] for n in names})
+
+    if paged:
+        return page_body(items, next_cursor), 200
+    return items, 200
@@ -0,0 +1,125 @@
+# dbpool.py
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+from extension import db
+
+log = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """Checkout latency and saturation of this process' connection pool."""
+
+    def __init__(self, window=1000):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=window)  # recent checkout latencies, seconds
+        self.checkouts = 0
+        self.timeouts = 0
+        self.slow_threshold = 0.1
+        self.pool = None
+
+    def record(self, seconds):
+        with self._lock:
+            self._waits.append(seconds)
+            self.checkouts += 1
+        if seconds >= self.slow_threshold:
+            log.warning(
+                "slow db checkout: %.1f ms (%s)",
+                seconds * 1000,
+                self.pool.status() if self.pool else "no pool",
+            )
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self):
+        with self._lock:
+            waits = sorted(self._waits)
+            checkouts, timeouts = self.checkouts, self.timeouts
+
+        def pct(p):
+            if not waits:
+                return None
+            return round(waits[min(len(waits) - 1, int(p / 100 * len(waits)))] * 1000, 3)
+
+        body = {
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "checkout_ms": {"p50": pct(50), "p95": pct(95), "p99": pct(99), "max": pct(100)},
+        }
+        pool = self.pool
+        if pool is not None:
+            capacity = pool.size() + max(pool._max_overflow, 0)
+            body.update({
+                "size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "saturation": round(pool.checkedout() / capacity, 3) if capacity else None,
+            })
+        return body
+
+
+stats = PoolStats()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout takes (wait + pre-ping)."""
+
+    def connect(self):
+        stats.pool = self
+        start = time.perf_counter()
+        try:
+            conn = super().connect()
+        except exc.TimeoutError:
+            stats.record_timeout()
+            raise
+        stats.record(time.perf_counter() - start)
+        return conn
+
+
+def init_app(app):
+    """
+    Builds SQLALCHEMY_ENGINE_OPTIONS from the DB_* settings; call before
+    db.init_app. Options set explicitly in the config take precedence.
+    """
+    config = app.config
+    options = {
+        "poolclass": TimedQueuePool,
+        "pool_size": config["DB_POOL_SIZE"],
+        "max_overflow": config["DB_MAX_OVERFLOW"],
+        "pool_timeout": config["DB_POOL_TIMEOUT"],
+        "pool_recycle": config["DB_POOL_RECYCLE"],
+        "pool_pre_ping": config["DB_POOL_PRE_PING"],
+    }
+    uri = config.get("SQLALCHEMY_DATABASE_URI") or ""
+    if uri.startswith("postgres") and config["DB_STATEMENT_TIMEOUT_MS"]:
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT_MS']}",
+        }
+    options.update(config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+    stats.slow_threshold = config["DB_POOL_SLOW_CHECKOUT_MS"] / 1000
+
+
+def register_fork_safety(app):
+    """
+    Drops connections inherited from a parent process (gunicorn --preload)
+    without closing them, so parent and child never share a socket.
+    Call after db.init_app.
+    """
+    with app.app_context():
+        engines = list(db.engines.values())
+
+    def _after_fork():
+        for engine in engines:
+            engine.dispose(close=False)
+
+    os.register_at_fork(after_in_child=_after_fork)
@@ -1,39 +1,64 @@
 from datetime import datetime
 from extension import db
-from models import Event, Member
+from versioning import bump_version
+from models import Event, Member, MemberEvent
+from bulk import add_links, member_ids_body, remove_links
+from pagination import order_by_keys, paginate, page_body
+from filtering import date_range_arg, list_arg, sort_arg
+from fields import key_of
+from serializers import EVENT_FIELDS
+import cascade
 from flask import jsonify,request
 
 
-def list_events():
-    events = Event.query.order_by(Event.event_date).all()
-
-    result = []
-    for event in events:
-        result.append({
-            "id": event.id,
-            "name": event.event_name,
-            "type": event.event_type,
-            "date": event.event_date.isoformat() if event.event_date else None,
-            "location": event.location,
-            "description": event.description,
-            "attendes": len(event.members),  
-        })
+EVENT_SORTS = {"date": [Event.event_date, Event.id]}
+
 
+def list_events():
+    try:
+        names = EVENT_FIELDS.requested()
+        keys, descending = sort_arg(EVENT_SORTS, "date")
+        query = EVENT_FIELDS.query(names, keys)
+
+        event_types = list_arg("event_type")
+        if event_types:
+            query = query.filter(Event.event_type.in_(event_types))
+        query = query.filter(*date_range_arg(Event.event_date, "date_from", "date_to"))
+
+        rows, next_cursor, paged = paginate(
+            order_by_keys(query, keys, descending),
+            keys,
+            key_of(keys),
+            descending,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    result = EVENT_FIELDS.rows(rows, names)
+
+    if paged:
+        return jsonify(page_body(result, next_cursor)), 200
     return jsonify(result) , 200
 def get_event_details(event_id):
-    event = Event.query.get(event_id)
+    """The attendee ids are only queried when `attendes` is asked for."""
+    try:
+        names = EVENT_FIELDS.requested()
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    columns = [n for n in names if n != "attendes"]
+    event = EVENT_FIELDS.query(columns, [Event.id]).filter(Event.id == event_id).first()
     if not event:
         return {"error": "Event not found"}, 404
 
-
-    body = {
-        "id": event.id,
-        "name": event.event_name,
-        "type": event.event_type,
-        "date": event.event_date.isoformat() if event.event_date else None,
-        "location": event.location,
-        "description": event.description,
-        "attendes" : [m.id for m in event.members]}
+    body = EVENT_FIELDS.row(event, columns)
+    if "attendes" in names:
+        body["attendes"] = [
+            member_id
+            for (member_id,) in db.session.query(MemberEvent.member_id)
+            .filter(MemberEvent.event_id == event_id, cascade.live(Member, MemberEvent.member_id))
+            .order_by(MemberEvent.member_id)
+        ]
 
     return jsonify(body), 200
 
@@ -62,18 +87,14 @@ def create_event():
     )
 
     db.session.add(new_event)
+    bump_version("event")
     db.session.commit()
 
     return {
         "message": "Event created successfully",
-        "event": {
-            "id": new_event.id,
-            "name": new_event.event_name,
-            "type": new_event.event_type,
-            "date": new_event.event_date,
-            "location": new_event.location,
-            "description": new_event.description,
-        },
+        "event": EVENT_FIELDS.instance(
+            new_event, ["id", "name", "type", "date", "location", "description"]
+        ),
     }, 201
 
 def update_event(event_id):
@@ -100,6 +121,7 @@ def update_event(event_id):
     if "description" in data:
         event.description = data["description"]
 
+    bump_version("event")
     db.session.commit()
 
     return {"message": "Event updated successfully", "id": event.id}, 200
@@ -111,8 +133,53 @@ def delete_event(event_id):
         return {"error": "Event not found"}, 404
 
     db.session.delete(event)
+    bump_version("event")
     db.session.commit()
 
     return {"message": "Event deleted successfully", "id": event_id}, 200
 
 
+def _lock_event(event_id):
+    # FOR KEY SHARE: the event cannot be deleted before the links commit
+    return (
+        db.session.query(Event.id)
+        .filter(Event.id == event_id)
+        .with_for_update(key_share=True)
+        .scalar()
+    )
+
+
+def add_event_attendees(event_id):
+    """Adds many members to the event with one set-based INSERT."""
+    try:
+        member_ids = member_ids_body()
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    if _lock_event(event_id) is None:
+        db.session.rollback()
+        return {"error": "Event not found"}, 404
+
+    added, unchanged, not_found = add_links(MemberEvent, MemberEvent.event_id, event_id, member_ids)
+    if added:
+        bump_version("event")
+    db.session.commit()
+
+    return {"event_id": event_id, "added": added, "unchanged": unchanged, "not_found": not_found}, 200
+
+
+def remove_event_attendees(event_id):
+    """Removes many members from the event with one DELETE ... WHERE IN."""
+    try:
+        member_ids = member_ids_body()
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    if _lock_event(event_id) is None:
+        db.session.rollback()
+        return {"error": "Event not found"}, 404
+
+    removed, unchanged = remove_links(MemberEvent, MemberEvent.event_id, event_id, member_ids)
+    if removed:
+        bump_version("event")
+    db.session.commit()
+
+    return {"event_id": event_id, "removed": removed, "unchanged": unchanged}, 200
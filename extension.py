@@ -3,7 +3,9 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from flask_bcrypt import Bcrypt
+from flask_mail import Mail
 db = SQLAlchemy()
 jwt = JWTManager()
 cors = CORS()
 bcrypt = Bcrypt()
+mail = Mail()
@@ -0,0 +1,106 @@
+# fields.py
+from flask import request
+from extension import db
+
+
+def requested_fields(allowed, default=None):
+    """
+    Names from ?fields=a,b,c in the order of `allowed`; `default` (or all of
+    `allowed`) without the parameter. Raises ValueError for a 400 body.
+    """
+    raw = request.args.get("fields")
+    if raw is None or raw == "":
+        return list(default or allowed)
+
+    names = {n.strip() for n in raw.split(",") if n.strip()}
+    if not names or not names <= set(allowed):
+        raise ValueError(f"fields must be a subset of {', '.join(allowed)}")
+    return [n for n in allowed if n in names]
+
+
+class Field:
+    """One response field: the column it reads, the joins that column needs, how to render it."""
+    __slots__ = ("column", "joins", "render")
+
+    def __init__(self, column, joins=(), render=None):
+        self.column = column
+        self.joins = joins
+        self.render = render
+
+
+class FieldSet:
+    """
+    The fields an endpoint can return, for ?fields= sparse fieldsets.
+    query() selects only the requested columns and adds a join only when a
+    requested field needs it.
+    """
+
+    def __init__(self, base, fields, joins=None):
+        self.base = base  # entity or join the SELECT starts from
+        self.fields = fields
+        self.joins = joins or {}  # name -> (target, onclause), outer-joined on demand
+        self._serializers = {}
+
+    def requested(self, default=None):
+        return requested_fields(list(self.fields), default)
+
+    def query(self, names, keys=()):
+        """SELECT of the requested fields plus the cursor keys (as _key0, _key1, ...)."""
+        query = db.session.query(
+            *[self.fields[n].column.label(n) for n in names],
+            *[key.label(f"_key{i}") for i, key in enumerate(keys)],
+        ).select_from(self.base)
+
+        needed = []
+        for n in names:
+            for join in self.fields[n].joins:
+                if join not in needed:
+                    needed.append(join)
+        for join in needed:
+            target, onclause = self.joins[join]
+            query = query.outerjoin(target, onclause)
+        return query
+
+    def serializer(self, names):
+        """
+        row -> dict for query(names) rows, built once per field list and
+        cached: a zip of names and values, plus the render calls if any.
+        """
+        key = tuple(names)
+        serialize = self._serializers.get(key)
+        if serialize is None:
+            renders = [(i, n, self.fields[n].render) for i, n in enumerate(key) if self.fields[n].render]
+
+            if not renders:
+                def serialize(r):
+                    # zip stops at the requested names; the cursor keys after them are dropped
+                    return dict(zip(key, r))
+            else:
+                def serialize(r):
+                    out = dict(zip(key, r))
+                    for i, n, render in renders:
+                        out[n] = render(r[i])
+                    return out
+
+            self._serializers[key] = serialize
+        return serialize
+
+    def row(self, r, names):
+        return self.serializer(names)(r)
+
+    def rows(self, rows, names):
+        return list(map(self.serializer(names), rows))
+
+    def instance(self, obj, names):
+        """The same fields read from a loaded model instance (plain column fields only)."""
+        out = {}
+        for n in names:
+            field = self.fields[n]
+            value = getattr(obj, field.column.key)
+            out[n] = field.render(value) if field.render else value
+        return out
+
+
+def key_of(keys):
+    """Cursor values of a FieldSet.query() row."""
+    return lambda r: tuple(getattr(r, f"_key{i}") for i in range(len(keys)))
@@ -0,0 +1,71 @@
+# filtering.py
+from datetime import datetime
+
+from flask import request
+
+MAX_FILTER_VALUES = 50
+
+
+def int_arg(name):
+    """?name=<int>, or None when absent. Raises ValueError for a 400 body."""
+    value = request.args.get(name)
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer")
+
+
+def datetime_arg(name):
+    """?name=<ISO 8601 date or datetime>, or None when absent."""
+    value = request.args.get(name)
+    if value is None or value == "":
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO 8601 date or datetime")
+
+
+def list_arg(name, choices=None):
+    """?name=a,b,c as a list (None when absent), checked against choices."""
+    value = request.args.get(name)
+    if value is None or value == "":
+        return None
+    values = [v for v in value.split(",") if v]
+    if not values or len(values) > MAX_FILTER_VALUES:
+        raise ValueError(f"{name} must list between 1 and {MAX_FILTER_VALUES} values")
+    if choices is not None and any(v not in choices for v in values):
+        raise ValueError(f"{name} must be one of {', '.join(choices)}")
+    return values
+
+
+def sort_arg(sorts, default):
+    """
+    ?sort=<name> or ?sort=-<name> (descending), looked up in `sorts`
+    ({name: [cursor key columns]}). Returns (keys, descending).
+    """
+    value = request.args.get("sort") or default
+    descending = value.startswith("-")
+    name = value[1:] if descending else value
+    if name not in sorts:
+        allowed = ", ".join(f"{n}, -{n}" for n in sorts)
+        raise ValueError(f"sort must be one of {allowed}")
+    return sorts[name], descending
+
+
+def date_range_arg(column, start_name, end_name):
+    """
+    Filter clauses for ?start_name=...&end_name=... as start <= column < end;
+    either bound may be omitted.
+    """
+    start, end = datetime_arg(start_name), datetime_arg(end_name)
+    if start is not None and end is not None and start >= end:
+        raise ValueError(f"{start_name} must be before {end_name}")
+    clauses = []
+    if start is not None:
+        clauses.append(column >= start)
+    if end is not None:
+        clauses.append(column < end)
+    return clauses
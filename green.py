@@ -0,0 +1,33 @@
+# green.py
+"""
+Async serving mode. gunicorn's gevent worker runs each request in a
+greenlet, and psycopg2 is put on its asynchronous protocol with a wait
+callback that parks the greenlet on the connection's socket. A request
+waiting on Postgres no longer holds the worker, so one worker serves
+hundreds of concurrent clients; routes, handlers and responses are the
+same code as in the sync mode.
+
+    gunicorn -c gunicorn_async.py run:app
+"""
+import psycopg2
+from gevent.socket import wait_read, wait_write
+from psycopg2 import extensions
+
+
+def gevent_wait_callback(conn, timeout=None):
+    """Drives a psycopg2 connection until the pending operation is done, yielding while it waits."""
+    while True:
+        state = conn.poll()
+        if state == extensions.POLL_OK:
+            return
+        if state == extensions.POLL_READ:
+            wait_read(conn.fileno(), timeout=timeout)
+        elif state == extensions.POLL_WRITE:
+            wait_write(conn.fileno(), timeout=timeout)
+        else:
+            raise psycopg2.OperationalError(f"Bad result from poll: {state!r}")
+
+
+def patch_psycopg():
+    """Makes every psycopg2 connection opened from now on cooperative."""
+    extensions.set_wait_callback(gevent_wait_callback)
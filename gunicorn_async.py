@@ -0,0 +1,21 @@
+# gunicorn_async.py
+"""
+gunicorn settings for the async serving mode (see green.py):
+
+    gunicorn -c gunicorn_async.py run:app
+"""
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "gevent"
+# open client connections per worker; queries still wait for one of the
+# DB_POOL_SIZE + DB_MAX_OVERFLOW pooled connections of that worker
+worker_connections = int(os.getenv("ASYNC_WORKER_CONNECTIONS", "1000"))
+
+
+def post_worker_init(worker):
+    # after the gevent worker's monkey-patching, before the first request
+    import green
+
+    green.patch_psycopg()
@@ -0,0 +1,130 @@
+# hashing.py
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from functools import lru_cache
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing pool is saturated past PASSWORD_HASH_TIMEOUT."""
+
+
+_lock = threading.Lock()
+_executor = None
+_executor_pid = None
+_slots = None
+
+
+def _pool():
+    """
+    The per-process hashing pool, created lazily so that every gunicorn
+    worker gets its own after fork. Children come from a forkserver, not
+    from the (threaded) request worker itself.
+    """
+    global _executor, _executor_pid, _slots
+
+    if _executor is not None and _executor_pid == os.getpid():
+        return _executor, _slots
+
+    with _lock:
+        if _executor is None or _executor_pid != os.getpid():
+            config = current_app.config
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("forkserver")
+                context.set_forkserver_preload(["werkzeug.security"])
+            else:
+                context = multiprocessing.get_context("spawn")
+            _executor = ProcessPoolExecutor(
+                max_workers=config["PASSWORD_HASH_WORKERS"],
+                mp_context=context,
+            )
+            _slots = threading.BoundedSemaphore(config["PASSWORD_HASH_MAX_PENDING"])
+            _executor_pid = os.getpid()
+    return _executor, _slots
+
+
+def _submit(fn, *args):
+    """Queues fn on the pool, waiting for a free slot up to the timeout."""
+    executor, slots = _pool()
+    if not slots.acquire(timeout=current_app.config["PASSWORD_HASH_TIMEOUT"]):
+        raise HashingBusy("password hashing queue is full")
+    future = executor.submit(fn, *args)
+    future.add_done_callback(lambda _: slots.release())
+    return future
+
+
+def _wait(futures):
+    """Results in order; a pool too slow for PASSWORD_HASH_TIMEOUT is HashingBusy (503), not a 500."""
+    timeout = current_app.config["PASSWORD_HASH_TIMEOUT"]
+    try:
+        return [f.result(timeout=timeout) for f in futures]
+    except FutureTimeout:
+        for f in futures:
+            f.cancel()
+        raise HashingBusy("password hashing timed out")
+
+
+def _run(fn, *args):
+    config = current_app.config
+    if config["PASSWORD_HASH_WORKERS"] <= 0:
+        return fn(*args)
+    return _wait([_submit(fn, *args)])[0]
+
+
+def hash_password(password):
+    config = current_app.config
+    return _run(
+        generate_password_hash,
+        password,
+        config["PASSWORD_HASH_METHOD"],
+        config["PASSWORD_SALT_LENGTH"],
+    )
+
+
+def hash_passwords(passwords):
+    """
+    Hashes a batch in parallel across the pool; results keep input order.
+    At most half of PASSWORD_HASH_MAX_PENDING are queued at a time, so the
+    rest stay free for logins.
+    """
+    config = current_app.config
+    args = (config["PASSWORD_HASH_METHOD"], config["PASSWORD_SALT_LENGTH"])
+    if config["PASSWORD_HASH_WORKERS"] <= 0:
+        return [generate_password_hash(p, *args) for p in passwords]
+
+    window = max(1, config["PASSWORD_HASH_MAX_PENDING"] // 2)
+    hashes = []
+    for start in range(0, len(passwords), window):
+        hashes += _wait([_submit(generate_password_hash, p, *args) for p in passwords[start:start + window]])
+    return hashes
+
+
+def verify_password(password_hash, password):
+    return _run(check_password_hash, password_hash, password)
+
+
+@lru_cache(maxsize=None)
+def _stored_method(method):
+    """
+    The method as werkzeug writes it into a hash: "scrypt" is stored as
+    "scrypt:32768:8:1", "pbkdf2" as "pbkdf2:sha256:1000000".
+    """
+    return generate_password_hash("", method, 1).split("$", 1)[0]
+
+
+def needs_rehash(password_hash):
+    """True when a stored hash was made with other method/cost/salt settings."""
+    config = current_app.config
+    try:
+        method, salt, _ = password_hash.split("$", 2)
+    except ValueError:
+        return True
+    return (
+        method != _stored_method(config["PASSWORD_HASH_METHOD"])
+        or len(salt) != config["PASSWORD_SALT_LENGTH"]
+    )
+
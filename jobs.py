@@ -0,0 +1,261 @@
+# jobs.py
+"""
+Durable background jobs in the jobs table, for work that must not run
+inside a request (sending mail). Requests enqueue rows in their own
+transaction; worker.py claims them in batches with FOR UPDATE SKIP
+LOCKED, runs up to JOB_CONCURRENCY at a time, retries failures with
+exponential backoff and records the outcome on the row.
+"""
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import and_, bindparam, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from cascade import cascade_delete
+from content.reminders import send_report_reminder
+from content.uploads import purge_stale_uploads
+from extension import db
+from models import Job
+
+log = logging.getLogger(__name__)
+
+# job kind -> handler(payload), run in an app context; the return value
+# (a short string, e.g. "sent" / "skipped") is stored as the job's result,
+# except AGAIN: the handler has more to do and the job is queued again at
+# once without using up an attempt, so long work runs in short steps that
+# each finish well inside JOB_LOCK_TIMEOUT
+AGAIN = "again"
+
+HANDLERS = {
+    "report_reminder": send_report_reminder,
+    "cascade_delete": cascade_delete,
+}
+
+stats = {"claimed": 0, "done": 0, "again": 0, "retried": 0, "failed": 0, "reclaimed": 0, "pruned": 0}
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def enqueue(kind, payloads, dedupe_keys=None):
+    """
+    Adds jobs in the caller's transaction (they run once it commits), one
+    multi-row INSERT. A job whose (kind, dedupe key) is already queued or
+    running is not added again.
+    """
+    if kind not in HANDLERS:
+        raise ValueError(f"unknown job kind {kind!r}")
+    if not payloads:
+        return
+    keys = dedupe_keys or [None] * len(payloads)
+    stmt = insert(Job).values([
+        {
+            "kind": kind,
+            "payload": payload,
+            "dedupe_key": key,
+            "status": "queued",
+            "attempts": 0,
+            "max_attempts": current_app.config["JOB_MAX_ATTEMPTS"],
+        }
+        for payload, key in zip(payloads, keys)
+    ]).on_conflict_do_nothing(
+        index_elements=[Job.kind, Job.dedupe_key],
+        index_where=Job.status.in_(("queued", "running")),
+    )
+    db.session.execute(stmt)
+
+
+def claim(worker_id, limit):
+    """Marks up to `limit` due jobs as running for this worker and returns them."""
+    table = Job.__table__
+    due = (
+        select(Job.id)
+        .where(Job.status == "queued", Job.run_at <= func.now())
+        .order_by(Job.run_at, Job.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = (
+        table.update()
+        .where(table.c.id.in_(due.scalar_subquery()))
+        .values(
+            status="running",
+            attempts=table.c.attempts + 1,
+            locked_at=func.now(),
+            locked_by=worker_id,
+        )
+        .returning(table.c.id, table.c.kind, table.c.payload, table.c.attempts, table.c.max_attempts)
+    )
+    jobs = db.session.execute(stmt).all()
+    db.session.commit()
+    stats["claimed"] += len(jobs)
+    return jobs
+
+
+def backoff(attempts, base):
+    """Seconds before retry number `attempts`: base, 2*base, 4*base, ... capped at one day."""
+    return min(base * 2 ** (attempts - 1), 86400)
+
+
+def _run_one(app, job):
+    with app.app_context():
+        try:
+            handler = HANDLERS[job.kind]
+            return job.id, handler(job.payload), None
+        except Exception as e:  # recorded on the job, retried
+            log.warning("job %s (%s) attempt %d failed: %s", job.id, job.kind, job.attempts, e)
+            db.session.rollback()
+            return job.id, None, f"{type(e).__name__}: {e}"[:2000]
+
+
+def _record(jobs, outcomes, retry_base, worker_id):
+    table = Job.__table__
+    now = _now()
+    by_id = {job.id: job for job in jobs}
+    done, again, retry, failed = [], [], [], []
+    for job_id, result, error in outcomes:
+        job = by_id[job_id]
+        if error is None and result == AGAIN:
+            again.append({"job_id": job_id})
+        elif error is None:
+            done.append({"job_id": job_id, "result": (result or "done")[:50]})
+        elif job.attempts < job.max_attempts:
+            retry.append({
+                "job_id": job_id,
+                "error": error,
+                "run_at": now + timedelta(seconds=backoff(job.attempts, retry_base)),
+            })
+        else:
+            failed.append({"job_id": job_id, "error": error})
+
+    # a job reclaimed (reclaim_stale) while this worker still ran it belongs
+    # to its new claim now; this worker's outcome is dropped
+    where = and_(
+        table.c.id == bindparam("job_id"), table.c.status == "running", table.c.locked_by == worker_id,
+    )
+    if done:
+        db.session.execute(
+            table.update().where(where).values(
+                status="done", result=bindparam("result"), finished_at=now, locked_at=None, locked_by=None,
+            ),
+            done,
+        )
+    if again:
+        db.session.execute(
+            table.update().where(where).values(
+                status="queued", attempts=table.c.attempts - 1, run_at=now, locked_at=None, locked_by=None,
+            ),
+            again,
+        )
+    if retry:
+        db.session.execute(
+            table.update().where(where).values(
+                status="queued", last_error=bindparam("error"), run_at=bindparam("run_at"),
+                locked_at=None, locked_by=None,
+            ),
+            retry,
+        )
+    if failed:
+        db.session.execute(
+            table.update().where(where).values(
+                status="failed", result="failed", last_error=bindparam("error"), finished_at=now,
+                locked_at=None, locked_by=None,
+            ),
+            failed,
+        )
+    db.session.commit()
+    stats["done"] += len(done)
+    stats["again"] += len(again)
+    stats["retried"] += len(retry)
+    stats["failed"] += len(failed)
+
+
+def run_batch(app, executor, worker_id):
+    """Claims one batch, runs it on the executor and records every outcome. Returns the batch size."""
+    config = app.config
+    with app.app_context():
+        jobs = claim(worker_id, config["JOB_BATCH_SIZE"])
+    if not jobs:
+        return 0
+    outcomes = list(executor.map(lambda job: _run_one(app, job), jobs))
+    with app.app_context():
+        _record(jobs, outcomes, config["JOB_RETRY_BASE"], worker_id)
+    return len(jobs)
+
+
+def reclaim_stale(lock_timeout):
+    """Requeues jobs left running by a worker that died mid-batch."""
+    table = Job.__table__
+    result = db.session.execute(
+        table.update()
+        .where(table.c.status == "running", table.c.locked_at < _now() - timedelta(seconds=lock_timeout))
+        .values(status="queued", locked_at=None, locked_by=None, last_error="worker lost")
+    )
+    db.session.commit()
+    stats["reclaimed"] += result.rowcount
+    return result.rowcount
+
+
+def prune(retention_days):
+    """Deletes done jobs older than the retention; failed ones stay for inspection."""
+    table = Job.__table__
+    result = db.session.execute(
+        table.delete().where(
+            table.c.status == "done", table.c.finished_at < _now() - timedelta(days=retention_days)
+        )
+    )
+    db.session.commit()
+    stats["pruned"] += result.rowcount
+    return result.rowcount
+
+
+def counts():
+    """Jobs per status, for /api/status."""
+    rows = db.session.query(Job.status, func.count()).group_by(Job.status).all()
+    return {status: n for status, n in rows}
+
+
+def work(app, once=False):
+    """
+    The worker loop (worker.py): batches until SIGTERM/SIGINT, sleeping
+    JOB_POLL_INTERVAL when the queue is empty. `once` drains the due jobs
+    and returns.
+    """
+    config = app.config
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    socket.setdefaulttimeout(config["MAIL_TIMEOUT"])  # SMTP; psycopg2 does not use Python sockets
+    stopping = threading.Event()
+    if not once:
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, lambda *_: stopping.set())
+
+    log.info("job worker %s started", worker_id)
+    last_maintenance = 0.0
+    with ThreadPoolExecutor(max_workers=config["JOB_CONCURRENCY"], thread_name_prefix="job") as executor:
+        while not stopping.is_set():
+            if time.monotonic() - last_maintenance >= config["JOB_MAINTENANCE_INTERVAL"]:
+                last_maintenance = time.monotonic()
+                with app.app_context():
+                    reclaim_stale(config["JOB_LOCK_TIMEOUT"])
+                    prune(config["JOB_RETENTION_DAYS"])
+                    purge_stale_uploads(config["UPLOAD_EXPIRY_HOURS"])
+            try:
+                ran = run_batch(app, executor, worker_id)
+            except Exception:
+                log.exception("job batch failed")
+                ran = 0
+            if once and not ran:
+                break
+            if not ran:
+                stopping.wait(config["JOB_POLL_INTERVAL"])
+    log.info("job worker %s stopped: %s", worker_id, stats)
+    return stats
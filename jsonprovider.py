@@ -0,0 +1,80 @@
+# jsonprovider.py
+import dataclasses
+import decimal
+import uuid
+from datetime import date, datetime, time
+
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+
+def _default(o):
+    """Types neither encoder handles natively, as Flask's provider encodes them."""
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class IsoJSONProvider(DefaultJSONProvider):
+    """
+    Flask's stdlib provider, but dates and datetimes come out as ISO 8601
+    (what orjson does) instead of HTTP dates.
+    """
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, (date, datetime, time)):
+            return o.isoformat()
+        return _default(o)
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    orjson-backed provider: encodes dicts of str/int/float/bool/None and
+    date/datetime values in C and writes the response body as bytes.
+    """
+
+    mimetype = "application/json"
+    sort_keys = True  # same key order as the stdlib provider
+
+    def _option(self, extra=0):
+        option = orjson.OPT_NON_STR_KEYS | extra
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if self._app.debug:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_default, option=self._option()).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=self._option(orjson.OPT_APPEND_NEWLINE))
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+PROVIDERS = {"stdlib": IsoJSONProvider, "orjson": OrjsonProvider}
+
+
+def init_app(app):
+    """Installs the JSON_BACKEND provider: "orjson", "stdlib" or "auto" (orjson when installed)."""
+    backend = app.config["JSON_BACKEND"]
+    if backend == "auto":
+        backend = "orjson" if orjson is not None else "stdlib"
+    if backend not in PROVIDERS:
+        raise ValueError(f"JSON_BACKEND must be auto, orjson or stdlib, not {backend!r}")
+    if backend == "orjson" and orjson is None:
+        raise RuntimeError("JSON_BACKEND=orjson but orjson is not installed")
+    app.json = PROVIDERS[backend](app)
@@ -1,43 +1,44 @@
 from datetime import datetime
-from werkzeug.security import generate_password_hash
+from sqlalchemy.dialects.postgresql import insert
 from extension import db
+from versioning import bump_version
 from models import Member
+from hashing import hash_password, hash_passwords
+from pagination import paginate, page_body
+from fields import key_of
+from serializers import MEMBER_FIELDS, MEMBER_LIST_FIELDS
+from bulk import bulk_items, bulk_response, item_error, item_ok, string_error
+import cascade
+import jobs
+import revocation
 from flask import jsonify,request
 
 def list_members():
-    members = Member.query.order_by(Member.id).all()
-    member = [
-        {
-            "id": m.id,
-            "name": m.member_name,
-            "email": m.email,
-            "role": m.role,
-            "level": m.level,
-            "status": m.status,
-            "last_active": m.last_active.isoformat() if m.last_active else None,
-            "major": m.major,
-            "profile_picture": m.profile_picture
-        }
-        for m in members
-    ]
+    try:
+        names = MEMBER_FIELDS.requested(MEMBER_LIST_FIELDS)
+        members, next_cursor, paged = paginate(
+            MEMBER_FIELDS.query(names, [Member.id]).filter(Member.deleted_at.is_(None)).order_by(Member.id),
+            [Member.id],
+            key_of([Member.id]),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    member = MEMBER_FIELDS.rows(members, names)
+    if paged:
+        return jsonify(page_body(member, next_cursor)), 200
     return jsonify(member),200
 def get_member_by_id(member_id):
-    m = Member.query.get(member_id)
+    try:
+        names = MEMBER_FIELDS.requested()
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    m = MEMBER_FIELDS.query(names).filter(Member.id == member_id, Member.deleted_at.is_(None)).first()
     if not m:
         return {"error": "Member not found"}, 404
 
-    memberById =  {
-        "id": m.id,
-        "name": m.member_name,
-        "email": m.email,
-        "role": m.role,
-        "level": m.level,
-        "status": m.status,
-        "major": m.major,
-        "birthday": m.birthday.isoformat() if m.birthday else None,
-        "profile_picture": m.profile_picture,
-        "last_active": m.last_active.isoformat() if m.last_active else None,
-    }
+    memberById = MEMBER_FIELDS.row(m, names)
     return memberById,200
 def create_member():
     data = request.get_json() or {}
@@ -63,7 +64,7 @@ def create_member():
     new_member = Member(
         member_name=member_name,
         email=email,
-        password_hash=generate_password_hash(password),
+        password_hash=hash_password(password),
         role=role,
         major=major,
         level=int(level),
@@ -73,17 +74,108 @@ def create_member():
     )
 
     db.session.add(new_member)
+    bump_version("member")
     db.session.commit()
 
     return {"message": "Member created successfully", "id": new_member.id}, 201
 
 
+MEMBER_STRINGS = {
+    name: getattr(Member, name) for name in ("member_name", "email", "role", "major")
+}
+
+
+def create_members_bulk():
+    """
+    Creates many members from a JSON array in one multi-row INSERT.
+    Emails are checked against the table with a single IN lookup and
+    against the rest of the batch; invalid items are reported per index.
+    """
+    try:
+        items = bulk_items()
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    results = [None] * len(items)
+    candidates = []
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[i] = item_error(i, 400, "item must be an object")
+            continue
+        if not item.get("member_name") or not item.get("email") or not item.get("password"):
+            results[i] = item_error(i, 400, "member_name, email, password are required")
+            continue
+        error = string_error(item, MEMBER_STRINGS)
+        if error is None and not isinstance(item["password"], str):
+            error = "password must be a string"
+        if error:
+            results[i] = item_error(i, 400, error)
+            continue
+        try:
+            birthday = item.get("birthday")
+            birthday_date = datetime.strptime(birthday, "%Y-%m-%d").date() if birthday else None
+        except (TypeError, ValueError):
+            results[i] = item_error(i, 400, "birthday must be 'YYYY-MM-DD'")
+            continue
+        try:
+            level = int(item.get("level", 0))
+        except (TypeError, ValueError):
+            results[i] = item_error(i, 400, "level must be an integer")
+            continue
+        candidates.append((i, item, level, birthday_date))
+
+    emails = {item["email"] for _, item, _, _ in candidates}
+    taken = {
+        email for (email,) in db.session.query(Member.email).filter(Member.email.in_(emails))
+    } if emails else set()
+
+    indexes = []
+    rows = []
+    for i, item, level, birthday_date in candidates:
+        if item["email"] in taken:
+            results[i] = item_error(i, 400, "Email already exists")
+            continue
+        taken.add(item["email"])
+        indexes.append(i)
+        rows.append({
+            "member_name": item["member_name"],
+            "email": item["email"],
+            "password_hash": item["password"],  # hashed below as one batch
+            "role": item.get("role", "Member"),
+            "major": item.get("major"),
+            "level": level,
+            "birthday": birthday_date,
+            "status": "active",
+            "last_active": None,
+        })
+
+    if rows:
+        hashes = hash_passwords([row["password_hash"] for row in rows])
+        for row, password_hash in zip(rows, hashes):
+            row["password_hash"] = password_hash
+        # an email registered concurrently since the lookup loses here, per item
+        inserted = dict(db.session.execute(
+            insert(Member).values(rows).on_conflict_do_nothing(index_elements=[Member.email])
+            .returning(Member.email, Member.id)
+        ).all())
+        if inserted:
+            bump_version("member")
+        db.session.commit()
+        for i, row in zip(indexes, rows):
+            new_id = inserted.get(row["email"])
+            results[i] = item_ok(i, 201, id=new_id) if new_id else item_error(i, 400, "Email already exists")
+
+    return bulk_response(results)
+
+
 def update_member(member_id):
     data = request.get_json() or {}
     m = Member.query.get(member_id)
-    if not m:
+    if not m or m.deleted_at:
         return {"error": "Member not found"}, 404
 
+    old_claims = (m.role, m.status)
+
     if "member_name" in data:
         m.member_name = data["member_name"]
 
@@ -95,7 +187,7 @@ def update_member(member_id):
         m.email = new_email
 
     if "password" in data and data["password"]:
-        m.password_hash = generate_password_hash(data["password"])
+        m.password_hash = hash_password(data["password"])
 
     if "role" in data:
         m.role = data["role"]
@@ -117,16 +209,52 @@ def update_member(member_id):
         except ValueError:
             return {"error": "birthday must be 'YYYY-MM-DD'"}, 400
 
+    claims_changed = (m.role, m.status) != old_claims
+    if claims_changed:
+        revocation.bump_claims_version(m)
+
+    bump_version("member")
     db.session.commit()
+    if claims_changed:
+        revocation.claims_version_committed(m)
     return {"message": "Member updated successfully", "id": m.id}, 200
 def delete_member(member_id):
+    """
+    Either way the member's tokens are revoked in the same commit.
+    ?mode=background hides the member at once and leaves reports, teams
+    and events to the worker (cascade.py): 202 with the progress body.
+    """
     m = Member.query.get(member_id)
     if not m:
         return {"error": "Member not found"}, 404
 
+    if request.args.get("mode") == "background":
+        first = m.deleted_at is None
+        payload = cascade.mark_deleted("member", m)
+        if first:
+            revocation.revoke_member(m)
+        jobs.enqueue("cascade_delete", [payload], [cascade.dedupe_key("member", member_id)])
+        # hidden at once: team and event counts and report listings change now
+        bump_version("member", "report", "team", "event")
+        db.session.commit()
+        if first:
+            revocation.claims_version_committed(m)
+        body, _ = cascade.progress("member", member_id)
+        return body, 202
+
+    if m.deleted_at is None:
+        revocation.revoke_member(m)
     db.session.delete(m)
+    bump_version("member", "report", "team", "event")
     db.session.commit()
+    revocation.claims_version_committed(m)
     return {"message": "Member deleted successfully", "id": member_id}, 200
+
+
+def member_deletion(member_id):
+    return cascade.progress("member", member_id)
+
+
 def view_profile(member_id):
     return get_member_by_id(member_id)
 
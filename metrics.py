@@ -0,0 +1,162 @@
+# metrics.py
+import threading
+import time
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+from extension import db
+
+# request latency buckets, seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class EndpointStats:
+    __slots__ = ("buckets", "count", "latency_sum", "sql_statements", "sql_seconds", "statuses")
+
+    def __init__(self):
+        self.buckets = [0] * len(BUCKETS)
+        self.count = 0
+        self.latency_sum = 0.0
+        self.sql_statements = 0
+        self.sql_seconds = 0.0
+        self.statuses = {}
+
+
+_lock = threading.Lock()
+_endpoints = {}
+
+
+def init_app(app):
+    """Counts SQL statements and time per request via engine events."""
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+            event.listen(engine, "handle_error", _handle_error)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        starts = conn.info.get("query_start")
+        if starts:
+            g.sql_seconds = g.get("sql_seconds", 0.0) + time.perf_counter() - starts.pop()
+            g.sql_statements = g.get("sql_statements", 0) + 1
+
+
+def _handle_error(context):
+    # a failed statement never reaches after_cursor_execute; without this its
+    # start would stay on the pooled connection and pair with the next one
+    conn = context.connection
+    starts = conn.info.get("query_start") if conn is not None else None
+    if starts:
+        started = starts.pop()
+        if has_request_context():
+            g.sql_seconds = g.get("sql_seconds", 0.0) + time.perf_counter() - started
+            g.sql_statements = g.get("sql_statements", 0) + 1
+
+
+def start_request():
+    g.request_start = time.perf_counter()
+    g.sql_statements = 0
+    g.sql_seconds = 0.0
+
+
+def finish_request(response):
+    """Records the request and adds a Server-Timing header."""
+    start = g.get("request_start")
+    if start is None:
+        return response
+    elapsed = time.perf_counter() - start
+    statements = g.get("sql_statements", 0)
+    sql_seconds = g.get("sql_seconds", 0.0)
+
+    response.headers["Server-Timing"] = (
+        f'app;dur={elapsed * 1000:.1f}, '
+        f'db;dur={sql_seconds * 1000:.1f};desc="{statements} queries"'
+    )
+
+    endpoint = request.endpoint or "unknown"
+    with _lock:
+        stats = _endpoints.get(endpoint)
+        if stats is None:
+            stats = _endpoints[endpoint] = EndpointStats()
+        for i, bound in enumerate(BUCKETS):
+            if elapsed <= bound:
+                stats.buckets[i] += 1
+                break
+        stats.count += 1
+        stats.latency_sum += elapsed
+        stats.sql_statements += statements
+        stats.sql_seconds += sql_seconds
+        stats.statuses[response.status_code] = stats.statuses.get(response.status_code, 0) + 1
+    return response
+
+
+def instrument(blueprint):
+    blueprint.before_request(start_request)
+    blueprint.after_request(finish_request)
+
+
+def _line(name, labels, value):
+    label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+    return f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}"
+
+
+def render(gauges=None):
+    """Prometheus text exposition (format 0.0.4) of this process' metrics."""
+    with _lock:
+        snapshot = {
+            endpoint: (
+                list(s.buckets), s.count, s.latency_sum,
+                s.sql_statements, s.sql_seconds, dict(s.statuses),
+            )
+            for endpoint, s in _endpoints.items()
+        }
+
+    out = [
+        "# HELP http_request_duration_seconds Request latency per endpoint.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for endpoint, (buckets, count, latency_sum, _, _, _) in sorted(snapshot.items()):
+        cumulative = 0
+        for bound, n in zip(BUCKETS, buckets):
+            cumulative += n
+            out.append(_line("http_request_duration_seconds_bucket", {"endpoint": endpoint, "le": bound}, cumulative))
+        out.append(_line("http_request_duration_seconds_bucket", {"endpoint": endpoint, "le": "+Inf"}, count))
+        out.append(_line("http_request_duration_seconds_sum", {"endpoint": endpoint}, f"{latency_sum:.6f}"))
+        out.append(_line("http_request_duration_seconds_count", {"endpoint": endpoint}, count))
+
+    out += [
+        "# HELP http_requests_total Requests per endpoint and status code.",
+        "# TYPE http_requests_total counter",
+    ]
+    for endpoint, (_, _, _, _, _, statuses) in sorted(snapshot.items()):
+        for status, n in sorted(statuses.items()):
+            out.append(_line("http_requests_total", {"endpoint": endpoint, "status": status}, n))
+
+    out += [
+        "# HELP sql_statements_total SQL statements executed per endpoint.",
+        "# TYPE sql_statements_total counter",
+    ]
+    for endpoint, (_, _, _, statements, _, _) in sorted(snapshot.items()):
+        out.append(_line("sql_statements_total", {"endpoint": endpoint}, statements))
+
+    out += [
+        "# HELP sql_duration_seconds_total Time spent in SQL per endpoint.",
+        "# TYPE sql_duration_seconds_total counter",
+    ]
+    for endpoint, (_, _, _, _, sql_seconds, _) in sorted(snapshot.items()):
+        out.append(_line("sql_duration_seconds_total", {"endpoint": endpoint}, f"{sql_seconds:.6f}"))
+
+    for name, (help_text, value) in sorted((gauges or {}).items()):
+        if value is None:
+            continue
+        out += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", _line(name, {}, value)]
+
+    return "\n".join(out) + "\n"
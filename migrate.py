@@ -0,0 +1,135 @@
+# migrate.py
+"""
+Versioned schema migrations.
+
+Each file in migrations/ named NNNN_description.py defines upgrade(conn)
+and is applied once, in order, and recorded in schema_migrations. A
+migration runs in its own transaction unless it sets
+`transactional = False` (needed for CREATE INDEX CONCURRENTLY).
+
+    python migrate.py            apply pending migrations
+    python migrate.py status     list applied / pending migrations
+"""
+import importlib.util
+import os
+import re
+import sys
+
+from sqlalchemy import text
+
+from extension import db
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+MIGRATION_FILE = re.compile(r"^(\d{4})_(\w+)\.py$")
+
+# arbitrary key for pg_advisory_lock so concurrent deploys apply migrations once
+LOCK_KEY = 72_410_001
+
+
+def discover():
+    """[(version, name, module)] for every migration file, oldest first."""
+    found = []
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = MIGRATION_FILE.match(filename)
+        if not match:
+            continue
+        spec = importlib.util.spec_from_file_location(
+            f"migrations.m{match.group(1)}", os.path.join(MIGRATIONS_DIR, filename)
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        found.append((match.group(1), match.group(2), module))
+    return found
+
+
+def _ensure_table(engine):
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            " version VARCHAR(16) PRIMARY KEY,"
+            " name VARCHAR(200) NOT NULL,"
+            " applied_at TIMESTAMP NOT NULL DEFAULT now())"
+        ))
+
+
+def applied_versions(engine):
+    _ensure_table(engine)
+    with engine.connect() as conn:
+        return {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+
+def upgrade(engine, log=print):
+    """Applies every pending migration; returns the versions applied."""
+    _ensure_table(engine)
+    applied = []
+    with engine.connect() as lock_conn:
+        lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": LOCK_KEY})
+        try:
+            done = applied_versions(engine)
+            for version, name, module in discover():
+                if version in done:
+                    continue
+                log(f"applying {version}_{name}")
+                if getattr(module, "transactional", True):
+                    with engine.begin() as conn:
+                        module.upgrade(conn)
+                        _record(conn, version, name)
+                else:
+                    with engine.connect() as conn:
+                        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+                        module.upgrade(conn)
+                        _record(conn, version, name)
+                applied.append(version)
+        finally:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": LOCK_KEY})
+            lock_conn.commit()
+    return applied
+
+
+def create_index_concurrently(conn, index):
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS for `index` ("name ON table
+    (columns)"). A failed or interrupted concurrent build leaves an INVALID
+    index behind that IF NOT EXISTS would then keep forever; that one is
+    dropped and built again.
+    """
+    name = index.split()[0]
+    valid = conn.execute(
+        text(
+            "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid"
+            " WHERE c.relname = :name AND c.relnamespace = current_schema()::regnamespace"
+        ),
+        {"name": name},
+    ).scalar()
+    if valid is False:
+        conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    conn.exec_driver_sql(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index}")
+
+
+def _record(conn, version, name):
+    conn.execute(
+        text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)"),
+        {"version": version, "name": name},
+    )
+
+
+def main(argv):
+    import importlib
+    app = importlib.import_module("__init__").create_app()
+    with app.app_context():
+        engine = db.engine
+        if argv[1:] == ["status"]:
+            done = applied_versions(engine)
+            for version, name, _ in discover():
+                print(f"{'applied' if version in done else 'pending'}  {version}_{name}")
+            return 0
+        if argv[1:]:
+            print(__doc__)
+            return 2
+        applied = upgrade(engine)
+        print(f"{len(applied)} migration(s) applied")
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
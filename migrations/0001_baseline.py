@@ -0,0 +1,111 @@
+"""Baseline schema: the tables the API was built on, plus table_versions."""
+
+STATEMENTS = [
+    """
+    DO $$ BEGIN
+        CREATE TYPE member_status_enum AS ENUM ('active', 'inactive');
+    EXCEPTION WHEN duplicate_object THEN NULL; END $$
+    """,
+    """
+    DO $$ BEGIN
+        CREATE TYPE content_type_enum AS ENUM ('task', 'quiz', 'playlist');
+    EXCEPTION WHEN duplicate_object THEN NULL; END $$
+    """,
+    """
+    DO $$ BEGIN
+        CREATE TYPE content_status_enum AS ENUM
+            ('pending', 'submitted', 'late', 'approved', 'revision_requested');
+    EXCEPTION WHEN duplicate_object THEN NULL; END $$
+    """,
+    """
+    DO $$ BEGIN
+        CREATE TYPE content_action_enum AS ENUM
+            ('none', 'send_reminder', 'approve', 'request_revision');
+    EXCEPTION WHEN duplicate_object THEN NULL; END $$
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS member (
+        id BIGSERIAL PRIMARY KEY,
+        member_name VARCHAR(100) NOT NULL,
+        email VARCHAR(255) NOT NULL UNIQUE,
+        password_hash VARCHAR(255) NOT NULL,
+        role VARCHAR(50) NOT NULL,
+        level INTEGER NOT NULL DEFAULT 0,
+        major VARCHAR(100),
+        birthday DATE,
+        last_active TIMESTAMP,
+        profile_picture VARCHAR(255),
+        status member_status_enum NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS team (
+        id BIGSERIAL PRIMARY KEY,
+        team_name VARCHAR(100) NOT NULL,
+        description TEXT,
+        created_at TIMESTAMP NOT NULL,
+        is_active BOOLEAN NOT NULL DEFAULT TRUE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS member_teams (
+        member_id BIGINT NOT NULL REFERENCES member (id) ON DELETE CASCADE,
+        team_id BIGINT NOT NULL REFERENCES team (id) ON DELETE CASCADE,
+        PRIMARY KEY (member_id, team_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS event (
+        id BIGSERIAL PRIMARY KEY,
+        event_name VARCHAR(150) NOT NULL,
+        event_type VARCHAR(50) NOT NULL,
+        event_date TIMESTAMP NOT NULL,
+        location VARCHAR(150),
+        description TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS members_events (
+        member_id BIGINT NOT NULL REFERENCES member (id) ON DELETE CASCADE,
+        event_id BIGINT NOT NULL REFERENCES event (id) ON DELETE CASCADE,
+        PRIMARY KEY (member_id, event_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS content (
+        id BIGSERIAL PRIMARY KEY,
+        title VARCHAR(200) NOT NULL,
+        content_type content_type_enum NOT NULL,
+        description TEXT,
+        created_at TIMESTAMP NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS report (
+        id BIGSERIAL PRIMARY KEY,
+        content_id BIGINT REFERENCES content (id) ON DELETE CASCADE,
+        submitted_by BIGINT REFERENCES member (id) ON DELETE CASCADE,
+        title VARCHAR(200) NOT NULL,
+        status content_status_enum NOT NULL,
+        submission_date TIMESTAMP,
+        file_path VARCHAR(255),
+        action content_action_enum NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS table_versions (
+        table_name VARCHAR(50) PRIMARY KEY,
+        version BIGINT NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    INSERT INTO table_versions (table_name, version)
+    VALUES ('member', 0), ('team', 0), ('event', 0), ('content', 0), ('report', 0)
+    ON CONFLICT (table_name) DO NOTHING
+    """,
+]
+
+
+def upgrade(conn):
+    for statement in STATEMENTS:
+        conn.exec_driver_sql(statement)
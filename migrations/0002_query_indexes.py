@@ -0,0 +1,26 @@
+"""
+Secondary indexes for the listing, keyset-paging and join paths:
+report by content / member / status, event and content in keyset order,
+and the reverse side of both association tables.
+"""
+
+from migrate import create_index_concurrently
+
+# CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+transactional = False
+
+INDEXES = [
+    "ix_report_content_id ON report (content_id)",
+    "ix_report_submitted_by ON report (submitted_by)",
+    "ix_report_status ON report (status)",
+    "ix_event_event_date_id ON event (event_date, id)",
+    "ix_content_created_at_id ON content (created_at, id)",
+    "ix_members_events_event_id ON members_events (event_id)",
+    "ix_member_teams_team_id ON member_teams (team_id)",
+]
+
+
+def upgrade(conn):
+    for index in INDEXES:
+        create_index_concurrently(conn, index)
+    conn.exec_driver_sql("ANALYZE report, event, content, members_events, member_teams")
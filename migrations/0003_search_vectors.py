@@ -0,0 +1,38 @@
+"""
+Full-text search: a generated tsvector column with a GIN index on member,
+event, team and content. Postgres recomputes the vectors on every write.
+The 'simple' configuration does no stemming, so names and mixed-language
+text match as typed.
+"""
+
+VECTORS = {
+    "member": """
+        setweight(to_tsvector('simple', coalesce(member_name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(major, '')), 'B')
+    """,
+    "event": """
+        setweight(to_tsvector('simple', coalesce(event_name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(location, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+    """,
+    "team": """
+        setweight(to_tsvector('simple', coalesce(team_name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+    """,
+    "content": """
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+    """,
+}
+
+
+def upgrade(conn):
+    for table, expression in VECTORS.items():
+        conn.exec_driver_sql(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({expression}) STORED"
+        )
+        conn.exec_driver_sql(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector "
+            f"ON {table} USING GIN (search_vector)"
+        )
@@ -0,0 +1,33 @@
+"""
+Composite indexes for the report and event list filters: each filter
+combination seeks straight to its rows in cursor order. The report
+indexes replace the single-column ones from 0002, which are now their
+prefixes.
+"""
+
+from migrate import create_index_concurrently
+
+# CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+transactional = False
+
+INDEXES = [
+    "ix_report_content_id_status_id ON report (content_id, status, id)",
+    "ix_report_submitted_by_status_id ON report (submitted_by, status, id)",
+    "ix_report_status_id ON report (status, id)",
+    "ix_report_submission_date_id ON report (submission_date, id)",
+    "ix_event_event_type_date_id ON event (event_type, event_date, id)",
+]
+
+REPLACED = [
+    "ix_report_content_id",
+    "ix_report_submitted_by",
+    "ix_report_status",
+]
+
+
+def upgrade(conn):
+    for index in INDEXES:
+        create_index_concurrently(conn, index)
+    for index in REPLACED:
+        conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {index}")
+    conn.exec_driver_sql("ANALYZE report, event")
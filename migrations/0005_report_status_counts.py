@@ -0,0 +1,86 @@
+"""
+report_status_counts: reports per (content, status) for the dashboard.
+
+Statement-level triggers on report fold each INSERT / UPDATE / DELETE into
+the counts with one grouped upsert, reading the statement's transition
+tables. Bulk writes and ON DELETE CASCADE from content / member are
+covered too. An UPDATE that leaves content_id and status unchanged nets
+to zero and writes nothing.
+"""
+
+FUNCTION = """
+CREATE OR REPLACE FUNCTION report_status_counts_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO report_status_counts AS c (content_id, status, reports)
+        SELECT content_id, status, count(*)
+        FROM new_rows
+        WHERE content_id IS NOT NULL
+        GROUP BY content_id, status
+        ORDER BY content_id, status
+        ON CONFLICT (content_id, status) DO UPDATE SET reports = c.reports + EXCLUDED.reports;
+    ELSIF TG_OP = 'DELETE' THEN
+        -- a plain UPDATE: when the delete cascades from content, the
+        -- counts rows are gone with it and there is nothing to insert
+        UPDATE report_status_counts AS c
+        SET reports = c.reports - d.reports
+        FROM (
+            SELECT content_id, status, count(*) AS reports
+            FROM old_rows
+            GROUP BY content_id, status
+        ) AS d
+        WHERE c.content_id = d.content_id AND c.status = d.status;
+    ELSE
+        INSERT INTO report_status_counts AS c (content_id, status, reports)
+        SELECT content_id, status, sum(delta)
+        FROM (
+            SELECT content_id, status, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT content_id, status, -1 AS delta FROM old_rows
+        ) AS changes
+        WHERE content_id IS NOT NULL
+        GROUP BY content_id, status
+        HAVING sum(delta) <> 0
+        ORDER BY content_id, status
+        ON CONFLICT (content_id, status) DO UPDATE SET reports = c.reports + EXCLUDED.reports;
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+TRIGGERS = {
+    "report_status_counts_insert": "AFTER INSERT ON report REFERENCING NEW TABLE AS new_rows",
+    "report_status_counts_update": "AFTER UPDATE ON report REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "report_status_counts_delete": "AFTER DELETE ON report REFERENCING OLD TABLE AS old_rows",
+}
+
+
+def upgrade(conn):
+    conn.exec_driver_sql("""
+        CREATE TABLE IF NOT EXISTS report_status_counts (
+            content_id BIGINT NOT NULL REFERENCES content (id) ON DELETE CASCADE,
+            status content_status_enum NOT NULL,
+            reports BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (content_id, status)
+        )
+    """)
+    conn.exec_driver_sql(FUNCTION)
+
+    # no report writes between the backfill and the triggers going live
+    conn.exec_driver_sql("LOCK TABLE report IN SHARE ROW EXCLUSIVE MODE")
+    for name, definition in TRIGGERS.items():
+        conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name} ON report")
+        conn.exec_driver_sql(
+            f"CREATE TRIGGER {name} {definition} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION report_status_counts_apply()"
+        )
+    conn.exec_driver_sql("DELETE FROM report_status_counts")
+    conn.exec_driver_sql("""
+        INSERT INTO report_status_counts (content_id, status, reports)
+        SELECT content_id, status, count(*)
+        FROM report
+        WHERE content_id IS NOT NULL
+        GROUP BY content_id, status
+    """)
@@ -0,0 +1,22 @@
+"""
+revoked_tokens: JWTs revoked before they expire, keyed by jti. Workers
+poll it by revoked_at and prune it by expires_at.
+"""
+
+
+def upgrade(conn):
+    conn.exec_driver_sql("""
+        CREATE TABLE IF NOT EXISTS revoked_tokens (
+            jti VARCHAR(36) PRIMARY KEY,
+            token_type VARCHAR(10) NOT NULL,
+            member_id BIGINT,
+            expires_at TIMESTAMPTZ NOT NULL,
+            revoked_at TIMESTAMPTZ NOT NULL
+        )
+    """)
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_revoked_tokens_expires_at ON revoked_tokens (expires_at)"
+    )
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_revoked_tokens_revoked_at ON revoked_tokens (revoked_at)"
+    )
@@ -0,0 +1,17 @@
+"""
+member.claims_version / claims_changed_at: role and status travel in the
+JWT claims; bumping the version on a change revokes the older tokens,
+and workers poll the changes by claims_changed_at.
+"""
+
+
+def upgrade(conn):
+    conn.exec_driver_sql(
+        "ALTER TABLE member ADD COLUMN IF NOT EXISTS claims_version INTEGER NOT NULL DEFAULT 0"
+    )
+    conn.exec_driver_sql(
+        "ALTER TABLE member ADD COLUMN IF NOT EXISTS claims_changed_at TIMESTAMPTZ"
+    )
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_member_claims_changed_at ON member (claims_changed_at)"
+    )
@@ -0,0 +1,42 @@
+"""
+jobs: the durable background job queue (jobs.py, worker.py). Workers
+claim queued rows in run_at order with FOR UPDATE SKIP LOCKED; a partial
+unique index keeps one queued/running job per (kind, dedupe_key).
+"""
+
+STATEMENTS = [
+    """
+    DO $$ BEGIN
+        CREATE TYPE job_status_enum AS ENUM ('queued', 'running', 'done', 'failed');
+    EXCEPTION WHEN duplicate_object THEN NULL; END $$
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id BIGSERIAL PRIMARY KEY,
+        kind VARCHAR(50) NOT NULL,
+        payload JSONB NOT NULL,
+        dedupe_key VARCHAR(100),
+        status job_status_enum NOT NULL DEFAULT 'queued',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        max_attempts INTEGER NOT NULL DEFAULT 5,
+        run_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+        locked_at TIMESTAMPTZ,
+        locked_by VARCHAR(100),
+        result VARCHAR(50),
+        last_error TEXT,
+        created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+        finished_at TIMESTAMPTZ
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_jobs_queued_run_at ON jobs (run_at, id) WHERE status = 'queued'",
+    """
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_jobs_kind_dedupe_key ON jobs (kind, dedupe_key)
+    WHERE status IN ('queued', 'running')
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_jobs_status_finished_at ON jobs (status, finished_at)",
+]
+
+
+def upgrade(conn):
+    for statement in STATEMENTS:
+        conn.exec_driver_sql(statement)
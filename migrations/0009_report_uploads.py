@@ -0,0 +1,34 @@
+"""
+report_uploads: report file uploads, one-shot and resumable. Rows in
+'uploading' track a partial file on disk; 'complete' rows record the
+sha256 the report's file_path points at.
+"""
+
+STATEMENTS = [
+    """
+    DO $$ BEGIN
+        CREATE TYPE upload_status_enum AS ENUM ('uploading', 'complete');
+    EXCEPTION WHEN duplicate_object THEN NULL; END $$
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS report_uploads (
+        id VARCHAR(32) PRIMARY KEY,
+        report_id BIGINT NOT NULL REFERENCES report (id) ON DELETE CASCADE,
+        member_id BIGINT,
+        filename VARCHAR(255) NOT NULL,
+        size BIGINT,
+        sha256 VARCHAR(64),
+        status upload_status_enum NOT NULL DEFAULT 'uploading',
+        created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+        completed_at TIMESTAMPTZ
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_report_uploads_report_id ON report_uploads (report_id)",
+    "CREATE INDEX IF NOT EXISTS ix_report_uploads_status_updated_at ON report_uploads (status, updated_at)",
+]
+
+
+def upgrade(conn):
+    for statement in STATEMENTS:
+        conn.exec_driver_sql(statement)
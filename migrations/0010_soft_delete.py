@@ -0,0 +1,16 @@
+"""
+content.deleted_at / member.deleted_at: a background delete hides the row
+at once and removes its dependent rows in batches (cascade.py). The jobs
+index finds the cascade job of a row for the progress endpoints.
+"""
+
+from migrate import create_index_concurrently
+
+# CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+transactional = False
+
+
+def upgrade(conn):
+    conn.exec_driver_sql("ALTER TABLE content ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ")
+    conn.exec_driver_sql("ALTER TABLE member ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ")
+    create_index_concurrently(conn, "ix_jobs_kind_dedupe_key_id ON jobs (kind, dedupe_key, id)")
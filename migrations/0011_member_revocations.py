@@ -0,0 +1,22 @@
+"""
+member_revocations: the claims version a deleted member's tokens were
+revoked at, which member.claims_version cannot carry once the row is
+gone. Workers poll it by revoked_at and prune it by expires_at.
+"""
+
+
+def upgrade(conn):
+    conn.exec_driver_sql("""
+        CREATE TABLE IF NOT EXISTS member_revocations (
+            member_id BIGINT PRIMARY KEY,
+            claims_version INTEGER NOT NULL,
+            expires_at TIMESTAMPTZ NOT NULL,
+            revoked_at TIMESTAMPTZ NOT NULL
+        )
+    """)
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_member_revocations_expires_at ON member_revocations (expires_at)"
+    )
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_member_revocations_revoked_at ON member_revocations (revoked_at)"
+    )
@@ -0,0 +1,20 @@
+"""
+Partial indexes on the content and member rows being deleted: the
+queries reading reports and team / event links probe them to leave out
+rows whose owner is being deleted (cascade.live), and they stay as small
+as the number of deletes in flight.
+"""
+from migrate import create_index_concurrently
+
+# CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+transactional = False
+
+INDEXES = [
+    "ix_content_deleted_id ON content (id) WHERE deleted_at IS NOT NULL",
+    "ix_member_deleted_id ON member (id) WHERE deleted_at IS NOT NULL",
+]
+
+
+def upgrade(conn):
+    for index in INDEXES:
+        create_index_concurrently(conn, index)
@@ -1,10 +1,22 @@
 # models.py
+# Schema changes ship as migrations in migrations/ (python migrate.py);
+# keep the declarations here in sync with them.
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from extension import db
 
 
+def search_vector(expression):
+    """Generated, GIN-indexed tsvector column (migration 0003); never loaded by default."""
+    return db.deferred(db.Column(TSVECTOR, db.Computed(expression, persisted=True)))
+
+
 
 class Member(db.Model):
     __tablename__ = "member"
+    __table_args__ = (
+        db.Index("ix_member_search_vector", "search_vector", postgresql_using="gin"),
+        db.Index("ix_member_deleted_id", "id", postgresql_where=db.text("deleted_at IS NOT NULL")),
+    )
 
     id = db.Column(db.BigInteger, primary_key=True)
     member_name = db.Column(db.String(100), nullable=False)
@@ -16,6 +28,12 @@ class Member(db.Model):
     birthday = db.Column(db.Date)
     last_active = db.Column(db.DateTime)
     profile_picture = db.Column(db.String(255))
+    # bumped when role or status change; tokens carrying an older "cv"
+    # claim are rejected (revocation.py)
+    claims_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    claims_changed_at = db.Column(db.DateTime(timezone=True), index=True)
+    # set by a background delete (cascade.py); the row is hidden until removed
+    deleted_at = db.Column(db.DateTime(timezone=True))
     status = db.Column(
         db.Enum(
             "active",
@@ -29,19 +47,33 @@ class Member(db.Model):
         "Team",
         secondary="member_teams",
         back_populates="members",
+        passive_deletes=True,
     )
     events = db.relationship(
         "Event",
         secondary="members_events",
         back_populates="members",
+        passive_deletes=True,
+    )
+    # deleting a member leaves its reports and links to ON DELETE CASCADE
+    # instead of loading them first
+    reports = db.relationship(
+        "Report", back_populates="member", cascade="all, delete-orphan", passive_deletes=True,
+    )
+
+    search_vector = search_vector(
+        "setweight(to_tsvector('simple', coalesce(member_name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(major, '')), 'B')"
     )
-    reports = db.relationship("Report", back_populates="member")
 
 
 
 
 class Team(db.Model):
     __tablename__ = "team"
+    __table_args__ = (
+        db.Index("ix_team_search_vector", "search_vector", postgresql_using="gin"),
+    )
     id = db.Column(db.BigInteger, primary_key=True)
     team_name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
@@ -51,11 +83,20 @@ class Team(db.Model):
         "Member",
         secondary="member_teams",
         back_populates="teams",
+        passive_deletes=True,
+    )
+
+    search_vector = search_vector(
+        "setweight(to_tsvector('simple', coalesce(team_name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
     )
 
 
 class MemberTeam(db.Model):
     __tablename__ = "member_teams"
+    __table_args__ = (
+        db.Index("ix_member_teams_team_id", "team_id"),
+    )
 
     member_id = db.Column(
         db.BigInteger,
@@ -70,6 +111,11 @@ class MemberTeam(db.Model):
 
 class Event(db.Model):
     __tablename__ = "event"
+    __table_args__ = (
+        db.Index("ix_event_event_date_id", "event_date", "id"),
+        db.Index("ix_event_event_type_date_id", "event_type", "event_date", "id"),
+        db.Index("ix_event_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id = db.Column(db.BigInteger, primary_key=True)
     event_name = db.Column(db.String(150), nullable=False)
@@ -82,11 +128,21 @@ class Event(db.Model):
         "Member",
         secondary="members_events",
         back_populates="events",
+        passive_deletes=True,
+    )
+
+    search_vector = search_vector(
+        "setweight(to_tsvector('simple', coalesce(event_name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(location, '')), 'B') || "
+        "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
     )
 
 
 class MemberEvent(db.Model):
     __tablename__ = "members_events"
+    __table_args__ = (
+        db.Index("ix_members_events_event_id", "event_id"),
+    )
 
     member_id = db.Column(
         db.BigInteger,
@@ -102,6 +158,11 @@ class MemberEvent(db.Model):
 
 class Content(db.Model):
     __tablename__ = "content"
+    __table_args__ = (
+        db.Index("ix_content_created_at_id", "created_at", "id"),
+        db.Index("ix_content_search_vector", "search_vector", postgresql_using="gin"),
+        db.Index("ix_content_deleted_id", "id", postgresql_where=db.text("deleted_at IS NOT NULL")),
+    )
 
     id = db.Column(db.BigInteger, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -119,12 +180,29 @@ class Content(db.Model):
 
     description = db.Column(db.Text)
     created_at = db.Column(db.DateTime, nullable=False)
+    # set by a background delete (cascade.py); the row is hidden until removed
+    deleted_at = db.Column(db.DateTime(timezone=True))
 
-    reports = db.relationship("Report", back_populates="content")
+    # deleting content leaves its reports to ON DELETE CASCADE (not NULLing
+    # report.content_id)
+    reports = db.relationship(
+        "Report", back_populates="content", cascade="all, delete-orphan", passive_deletes=True,
+    )
+
+    search_vector = search_vector(
+        "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
+    )
 
 
 class Report(db.Model):
     __tablename__ = "report"
+    __table_args__ = (
+        db.Index("ix_report_content_id_status_id", "content_id", "status", "id"),
+        db.Index("ix_report_submitted_by_status_id", "submitted_by", "status", "id"),
+        db.Index("ix_report_status_id", "status", "id"),
+        db.Index("ix_report_submission_date_id", "submission_date", "id"),
+    )
 
     id = db.Column(db.BigInteger, primary_key=True)
 
@@ -169,3 +247,132 @@ class Report(db.Model):
 
     content = db.relationship("Content", back_populates="reports")
     member = db.relationship("Member", back_populates="reports")
+
+
+class ReportStatusCount(db.Model):
+    """
+    Reports per (content, status). Maintained by triggers on report
+    (migration 0005); the application never writes it.
+    """
+    __tablename__ = "report_status_counts"
+
+    content_id = db.Column(
+        db.BigInteger,
+        db.ForeignKey("content.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    status = db.Column(
+        db.Enum(
+            "pending",
+            "submitted",
+            "late",
+            "approved",
+            "revision_requested",
+            name="content_status_enum",
+            create_type=False,
+        ),
+        primary_key=True,
+    )
+    reports = db.Column(db.BigInteger, nullable=False, default=0)
+
+
+class TableVersion(db.Model):
+    """Per-table change counter used to build ETags for the read endpoints."""
+    __tablename__ = "table_versions"
+
+    table_name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+
+class RevokedToken(db.Model):
+    """
+    JWTs revoked before their expiry (logout), by jti. Checked through the
+    per-worker set in revocation.py; rows past expires_at are pruned.
+    """
+    __tablename__ = "revoked_tokens"
+
+    jti = db.Column(db.String(36), primary_key=True)
+    token_type = db.Column(db.String(10), nullable=False)
+    member_id = db.Column(db.BigInteger)
+    expires_at = db.Column(db.DateTime(timezone=True), nullable=False, index=True)
+    revoked_at = db.Column(db.DateTime(timezone=True), nullable=False, index=True)
+
+
+class MemberRevocation(db.Model):
+    """
+    Claims version a member's tokens were revoked at when the member was
+    deleted. Kept apart from member (no foreign key) so it outlives the
+    row; pruned once every token issued before it has expired.
+    """
+    __tablename__ = "member_revocations"
+
+    member_id = db.Column(db.BigInteger, primary_key=True)
+    claims_version = db.Column(db.Integer, nullable=False)
+    expires_at = db.Column(db.DateTime(timezone=True), nullable=False, index=True)
+    revoked_at = db.Column(db.DateTime(timezone=True), nullable=False, index=True)
+
+
+class Job(db.Model):
+    """
+    Durable background job (jobs.py), run by worker.py. Claimed with
+    FOR UPDATE SKIP LOCKED; failed attempts are retried with backoff
+    until max_attempts, and the outcome stays on the row.
+    """
+    __tablename__ = "jobs"
+    __table_args__ = (
+        db.Index("ix_jobs_queued_run_at", "run_at", "id", postgresql_where=db.text("status = 'queued'")),
+        db.Index(
+            "ux_jobs_kind_dedupe_key", "kind", "dedupe_key", unique=True,
+            postgresql_where=db.text("status IN ('queued', 'running')"),
+        ),
+        db.Index("ix_jobs_status_finished_at", "status", "finished_at"),
+        db.Index("ix_jobs_kind_dedupe_key_id", "kind", "dedupe_key", "id"),
+    )
+
+    id = db.Column(db.BigInteger, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    # at most one queued/running job per (kind, dedupe_key)
+    dedupe_key = db.Column(db.String(100))
+    status = db.Column(
+        db.Enum("queued", "running", "done", "failed", name="job_status_enum", create_type=False),
+        nullable=False,
+        default="queued",
+    )
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at = db.Column(db.DateTime(timezone=True), nullable=False, server_default=db.func.now())
+    locked_at = db.Column(db.DateTime(timezone=True))
+    locked_by = db.Column(db.String(100))
+    result = db.Column(db.String(50))
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime(timezone=True), nullable=False, server_default=db.func.now())
+    finished_at = db.Column(db.DateTime(timezone=True))
+
+
+class ReportUpload(db.Model):
+    """
+    A report file upload (content/uploads.py). Resumable uploads keep their
+    bytes in UPLOAD_DIR/partial/<id> until complete; the finished file is
+    stored once per sha256 under UPLOAD_DIR/objects.
+    """
+    __tablename__ = "report_uploads"
+    __table_args__ = (
+        db.Index("ix_report_uploads_report_id", "report_id"),
+        db.Index("ix_report_uploads_status_updated_at", "status", "updated_at"),
+    )
+
+    id = db.Column(db.String(32), primary_key=True)
+    report_id = db.Column(db.BigInteger, db.ForeignKey("report.id", ondelete="CASCADE"), nullable=False)
+    member_id = db.Column(db.BigInteger)
+    filename = db.Column(db.String(255), nullable=False)
+    size = db.Column(db.BigInteger)
+    sha256 = db.Column(db.String(64))
+    status = db.Column(
+        db.Enum("uploading", "complete", name="upload_status_enum", create_type=False),
+        nullable=False,
+        default="uploading",
+    )
+    created_at = db.Column(db.DateTime(timezone=True), nullable=False, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime(timezone=True), nullable=False, server_default=db.func.now())
+    completed_at = db.Column(db.DateTime(timezone=True))
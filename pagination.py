@@ -0,0 +1,147 @@
+# pagination.py
+import base64
+import binascii
+import json
+from datetime import date, datetime
+
+from flask import request
+from extension import db
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+def encode_cursor(values):
+    """Packs the sort-key values of the last row into an opaque token."""
+    raw = json.dumps([
+        v.isoformat() if isinstance(v, (date, datetime)) else v
+        for v in values
+    ])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, keys):
+    """Inverse of encode_cursor, typed after the key columns."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("after is not a valid cursor")
+
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise ValueError("after is not a valid cursor")
+
+    decoded = []
+    for key, value in zip(keys, values):
+        python_type = key.type.python_type
+        try:
+            if value is None:
+                decoded.append(None)
+            elif python_type is datetime:
+                decoded.append(datetime.fromisoformat(value))
+            elif python_type is date:
+                decoded.append(date.fromisoformat(value))
+            else:
+                decoded.append(python_type(value))
+        except (TypeError, ValueError):
+            raise ValueError("after is not a valid cursor")
+    return decoded
+
+
+def page_args():
+    """
+    Reads ?limit= and ?after= from the query string.
+    Returns (limit, after); limit is None when the client did not ask for a page.
+    Raises ValueError with a message suitable for a 400 body.
+    """
+    limit = request.args.get("limit")
+    after = request.args.get("after")
+
+    if limit is None and after is None:
+        return None, None
+
+    if limit is None:
+        return DEFAULT_LIMIT, after
+
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise ValueError("limit must be an integer")
+
+    if limit < 1 or limit > MAX_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+
+    return limit, after
+
+
+def _nullable(key):
+    return bool(getattr(getattr(key, "expression", key), "nullable", False))
+
+
+def order_by_keys(query, keys, descending=False):
+    """
+    Orders by the cursor keys, all ascending or all descending. NULLs go
+    last ascending and first descending (PostgreSQL's default), so a plain
+    b-tree index on the keys serves both directions.
+    """
+    clauses = []
+    for key in keys:
+        if not _nullable(key):
+            clauses.append(key.desc() if descending else key.asc())
+        else:
+            clauses.append(key.desc().nulls_first() if descending else key.asc().nulls_last())
+    return query.order_by(*clauses)
+
+
+def _seek(keys, values, descending):
+    """Rows strictly after `values` in order_by_keys order."""
+    def past(ks, vs):
+        left = ks[0] if len(ks) == 1 else db.tuple_(*ks)
+        right = vs[0] if len(vs) == 1 else db.tuple_(*vs)
+        return left < right if descending else left > right
+
+    first = keys[0]
+    if len(keys) == 1 or not _nullable(first):
+        return past(keys, values)
+
+    # only the leading key may be nullable; the rest break ties
+    if values[0] is None:
+        in_nulls = db.and_(first.is_(None), past(keys[1:], values[1:]))
+        return db.or_(in_nulls, first.isnot(None)) if descending else in_nulls
+    return past(keys, values) if descending else db.or_(past(keys, values), first.is_(None))
+
+
+def keyset_page(query, keys, key_of, limit, after, descending=False):
+    """
+    Seeks past the `after` cursor on `keys` (the columns the query is ordered
+    by, see order_by_keys) and returns (rows, next_cursor). Every page costs
+    one indexed range scan, no matter how deep it is.
+    """
+    if after:
+        query = query.filter(_seek(keys, decode_cursor(after, keys), descending))
+
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(key_of(rows[-1]))
+    return rows, next_cursor
+
+
+def page_body(items, next_cursor):
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def paginate(query, keys, key_of, descending=False):
+    """
+    Applies ?limit= / ?after= to an ordered query.
+    Returns (rows, next_cursor, paged); without paging params the whole
+    result is returned as before and paged is False.
+    """
+    limit, after = page_args()
+    if limit is None:
+        return query.all(), None, False
+
+    rows, next_cursor = keyset_page(query, keys, key_of, limit, after, descending)
+    return rows, next_cursor, True
@@ -0,0 +1,90 @@
+# query_plans.py
+"""
+Which indexes the main listing queries are served by: each route in
+checks() is called, the SELECTs it runs are captured and EXPLAINed, and
+the index names in the plans are compared with the expected ones. Used
+by tests/test_explain.py and bench/explain.py.
+"""
+import json
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+
+
+def checks(client, ids):
+    """[(url, expected index names)] for the seeded ids ({"contents": [...], "events", "teams", "members"})."""
+    content_id = ids["contents"][len(ids["contents"]) // 2]
+    event_id = ids["events"][len(ids["events"]) // 2]
+    team_id = ids["teams"][len(ids["teams"]) // 2]
+    member_id = ids["members"][len(ids["members"]) // 2]
+    tomorrow = (datetime.now(timezone.utc) + timedelta(days=1)).date()
+    cursor = client.get("/api/reports?limit=100").get_json()["next_cursor"]
+    return [
+        ("/api/reports?limit=50", {"report_pkey"}),
+        (f"/api/reports?limit=50&after={cursor}", {"report_pkey"}),
+        (f"/api/contents_by_id/{content_id}", {"ix_report_content_id_status_id"}),
+        ("/api/list_contents?limit=50", {"ix_content_created_at_id", "ix_report_content_id_status_id"}),
+        (f"/api/reports?limit=50&content_id={content_id}&status=pending", {"ix_report_content_id_status_id"}),
+        (f"/api/reports?limit=50&submitted_by={member_id}&status=late", {"ix_report_submitted_by_status_id"}),
+        ("/api/reports?limit=50&status=late&sort=-id", {"ix_report_status_id"}),
+        ("/api/reports?limit=50&sort=-submission_date", {"ix_report_submission_date_id"}),
+        ("/api/events?limit=50", {"ix_event_event_date_id"}),
+        (f"/api/events?limit=50&date_from={tomorrow}&date_to={tomorrow + timedelta(days=1)}", {"ix_event_event_date_id"}),
+        ("/api/events?limit=50&event_type=workshop&sort=-date", {"ix_event_event_type_date_id"}),
+        (f"/api/events/{event_id}", {"ix_members_events_event_id"}),
+        (f"/api/teams/{team_id}", {"ix_member_teams_team_id"}),
+        ("/api/search?q=member+17&types=member", {"ix_member_search_vector"}),
+    ]
+
+
+def plan_indexes(node, found):
+    if "Index Name" in node:
+        found.add(node["Index Name"])
+    for child in node.get("Plans", []):
+        plan_indexes(child, found)
+    return found
+
+
+@contextmanager
+def captured_selects(engine):
+    """Collects the (statement, parameters) of the SELECTs this thread runs."""
+    thread = threading.get_ident()
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if (
+            threading.get_ident() == thread
+            and statement.lstrip().upper().startswith("SELECT")
+            and "table_versions" not in statement
+        ):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def indexes_used(client, engine, url, seqscan=True):
+    """
+    (status code, index names in the plans of the SELECTs `url` runs).
+    seqscan=False plans with enable_seqscan off, for tables too small for
+    the planner to prefer an index on its own.
+    """
+    with captured_selects(engine) as captured:
+        status = client.get(url).status_code
+
+    used = set()
+    with engine.connect() as conn:
+        if not seqscan:
+            conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        for statement, parameters in captured:
+            plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            plan_indexes(plan[0]["Plan"], used)
+        conn.rollback()
+    return status, used
@@ -0,0 +1,227 @@
+# revocation.py
+"""
+Revoked JWTs, persisted in revoked_tokens and checked against an
+in-process dict, so the jwt_required path never queries the database.
+Tokens are also revoked wholesale per member when the member's role or
+status changes: they carry the member's claims_version as "cv", and an
+older cv than the current one is rejected. Deleting a member records
+that version in member_revocations, which outlives the member row.
+
+Each worker loads the unexpired revocations once, then re-reads the
+recent ones every REVOCATION_SYNC_INTERVAL seconds: the worker that
+revokes a token rejects it at once, the others within one interval.
+Entries are dropped when the token itself expires.
+"""
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.dialects.postgresql import insert
+
+from extension import db, jwt
+from models import Member, MemberRevocation, RevokedToken
+
+log = logging.getLogger(__name__)
+
+# re-read window before the last sync: covers revocations committed
+# after their revoked_at was taken and clock skew between hosts
+SYNC_OVERLAP = timedelta(seconds=60)
+
+_lock = threading.Lock()
+_revoked = {}  # jti -> expiry (epoch seconds)
+_claims_versions = {}  # member id (the "sub" claim) -> current claims_version, if ever bumped
+_app = None
+_synced_at = None
+_loaded_pid = None
+_last_prune = 0.0
+
+stats = {"syncs": 0, "failed_syncs": 0, "last_sync": None, "pruned_rows": 0}
+
+
+def init_app(app):
+    global _app
+    _app = app
+    jwt.token_in_blocklist_loader(_in_blocklist)
+
+
+def _in_blocklist(jwt_header, jwt_payload):
+    return is_revoked(jwt_payload["jti"]) or has_stale_claims(jwt_payload)
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def is_revoked(jti):
+    _ensure_loaded()
+    return jti in _revoked  # a dict lookup, no lock needed
+
+
+def has_stale_claims(payload):
+    """True for tokens issued before the member's last role/status change."""
+    return payload.get("cv", 0) < _claims_versions.get(payload["sub"], 0)
+
+
+def claims(member):
+    """Additional JWT claims for `member`, authorized from in routes.py."""
+    return {"role": member.role, "status": member.status, "cv": member.claims_version or 0}
+
+
+def bump_claims_version(member):
+    """Call before the commit that changes `member`'s role or status."""
+    member.claims_version = (member.claims_version or 0) + 1
+    member.claims_changed_at = _now()
+
+
+def claims_version_committed(member):
+    """Call after that commit: this worker rejects the older tokens at once."""
+    with _lock:
+        key = str(member.id)
+        _claims_versions[key] = max(_claims_versions.get(key, 0), member.claims_version)
+
+
+def revoke_member(member):
+    """
+    Call before the commit that deletes or hides `member`: bumps the
+    claims version and records it in member_revocations, where the other
+    workers still find it after the member row is gone.
+    """
+    bump_claims_version(member)
+    lifetime = max(_app.config["JWT_ACCESS_TOKEN_EXPIRES"], _app.config["JWT_REFRESH_TOKEN_EXPIRES"])
+    row = {
+        "member_id": member.id,
+        "claims_version": member.claims_version,
+        "expires_at": member.claims_changed_at + lifetime,
+        "revoked_at": member.claims_changed_at,
+    }
+    stmt = insert(MemberRevocation).values(row)
+    db.session.execute(stmt.on_conflict_do_update(
+        index_elements=[MemberRevocation.member_id],
+        set_={name: stmt.excluded[name] for name in ("claims_version", "expires_at", "revoked_at")},
+    ))
+
+
+def revoke(*payloads):
+    """Revokes decoded tokens (get_jwt() / decode_token() payloads) and commits."""
+    now = _now()
+    rows = [
+        {
+            "jti": p["jti"],
+            "token_type": p.get("type", "access"),
+            "member_id": int(p["sub"]) if str(p.get("sub", "")).isdigit() else None,
+            "expires_at": datetime.fromtimestamp(p["exp"], timezone.utc),
+            "revoked_at": now,
+        }
+        for p in payloads
+    ]
+    if not rows:
+        return
+    stmt = insert(RevokedToken).values(rows).on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+    db.session.execute(stmt)
+    db.session.commit()
+    with _lock:
+        for p in payloads:
+            _revoked[p["jti"]] = p["exp"]
+
+
+def sync():
+    """
+    Merges revocations made by any worker since the last sync (all
+    unexpired ones the first time) and forgets expired entries.
+    """
+    global _synced_at
+    started = _now()
+    try:
+        with _app.app_context():
+            query = db.session.query(RevokedToken.jti, RevokedToken.expires_at).filter(
+                RevokedToken.expires_at > started
+            )
+            if _synced_at is not None:
+                query = query.filter(RevokedToken.revoked_at >= _synced_at - SYNC_OVERLAP)
+            rows = query.all()
+
+            members = db.session.query(Member.id, Member.claims_version)
+            if _synced_at is None:
+                members = members.filter(Member.claims_changed_at.isnot(None))
+            else:
+                members = members.filter(Member.claims_changed_at >= _synced_at - SYNC_OVERLAP)
+            versions = members.all()
+
+            deleted = db.session.query(MemberRevocation.member_id, MemberRevocation.claims_version).filter(
+                MemberRevocation.expires_at > started
+            )
+            if _synced_at is not None:
+                deleted = deleted.filter(MemberRevocation.revoked_at >= _synced_at - SYNC_OVERLAP)
+            versions += deleted.all()
+    except Exception:
+        log.exception("revoked token sync failed")
+        stats["failed_syncs"] += 1
+        return False
+
+    cutoff = started.timestamp()
+    with _lock:
+        for jti, expires_at in rows:
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            _revoked[jti] = expires_at.timestamp()
+        for jti in [jti for jti, exp in _revoked.items() if exp <= cutoff]:
+            del _revoked[jti]
+        for member_id, version in versions:
+            key = str(member_id)
+            _claims_versions[key] = max(_claims_versions.get(key, 0), version)
+    _synced_at = started
+    stats["syncs"] += 1
+    stats["last_sync"] = started.isoformat()
+    return True
+
+
+def prune():
+    """Deletes rows of tokens that have expired anyway."""
+    with _app.app_context():
+        now = _now()
+        deleted = sum(
+            db.session.query(model).filter(model.expires_at <= now).delete(synchronize_session=False)
+            for model in (RevokedToken, MemberRevocation)
+        )
+        db.session.commit()
+    stats["pruned_rows"] += deleted
+    return deleted
+
+
+def snapshot():
+    return {"revoked_tokens": len(_revoked), "claims_versions": len(_claims_versions), **stats}
+
+
+def _run():
+    global _last_prune
+    interval = _app.config["REVOCATION_SYNC_INTERVAL"]
+    while True:
+        time.sleep(interval)
+        sync()
+        if time.monotonic() - _last_prune >= _app.config["REVOCATION_PRUNE_INTERVAL"]:
+            _last_prune = time.monotonic()
+            try:
+                prune()
+            except Exception:
+                log.exception("revoked token prune failed")
+
+
+def _ensure_loaded():
+    # full load and sync thread once per process, after gunicorn's fork;
+    # a failed first load fails the request rather than letting tokens through
+    global _loaded_pid, _synced_at, _last_prune
+    if _loaded_pid == os.getpid():
+        return
+    with _lock:
+        if _loaded_pid == os.getpid():
+            return
+        _synced_at = None
+        _last_prune = time.monotonic()
+    if not sync():
+        raise RuntimeError("could not load revoked tokens")
+    with _lock:
+        if _loaded_pid != os.getpid():
+            threading.Thread(target=_run, name="revocation-sync", daemon=True).start()
+            _loaded_pid = os.getpid()
@@ -1,8 +1,20 @@
 # routes.py
-from flask import Blueprint, request, jsonify
+from functools import wraps
+
+from flask import Blueprint, Response, current_app, request, jsonify
 from flask_jwt_extended import (
+    get_jwt,
     jwt_required,
 )
+from streaming import wants_stream
+from versioning import conditional
+from hashing import HashingBusy
+import activity
+import compression
+import dbpool
+import jobs
+import metrics
+import revocation
 
 # -------- AUTH (cookies) --------
 from AUTH.auth import login, logout,register
@@ -14,6 +26,8 @@ from events.events import (
     get_event_details,
     update_event,
     delete_event,
+    add_event_attendees,
+    remove_event_attendees,
 )
 
 # -------- MEMBERS --------
@@ -21,29 +35,37 @@ from members.members import (
     list_members,
     get_member_by_id,
     create_member,
+    create_members_bulk,
     update_member,
     delete_member,
+    member_deletion,
     view_profile,
 )
 
 # -------- CONTENT MANAGEMENT (content -> reports/submissions) --------
 from content.content import (
     list_contents,
+    stream_contents,
     get_content_by_id,
     create_content,
     update_content,
     delete_content,
+    content_deletion,
 )
 
 # -------- REPORT MANAGEMENT --------
 from content.content import (
     list_reports,
+    stream_reports,
     get_report_by_id,
     create_report,
+    create_reports_bulk,
     update_report,
+    update_reports_bulk,
     delete_report,
     submit_report,
 )
+from content.uploads import upload_report_file, create_upload, get_upload, upload_chunk
 
 # -------- TEAMS --------
 from teams.teams import (
@@ -52,10 +74,75 @@ from teams.teams import (
     create_team,
     update_team,
     delete_team,
+    add_team_members,
+    remove_team_members,
 )
 
+# -------- SEARCH --------
+from search.search import search
+from dashboard.dashboard import report_summary
+
 routes = Blueprint("routes", __name__)
 
+
+metrics.instrument(routes)
+routes.after_request(activity.record_request_activity)
+routes.after_request(compression.compress_response)
+
+
+def permission_required(permission):
+    """
+    Authorizes from the token's role and status claims alone, under
+    @jwt_required(); no Member row is loaded. Tokens issued before a role
+    or status change never get here: the change bumps the member's
+    claims version, which revokes them (revocation.py).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            claims = get_jwt()
+            roles = current_app.config["ROLE_PERMISSIONS"][permission]
+            if claims.get("status") != "active" or str(claims.get("role", "")).lower() not in roles:
+                return jsonify({"error": "Forbidden"}), 403
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@routes.errorhandler(HashingBusy)
+def hashing_busy(e):
+    return jsonify({"error": "Server busy, try again shortly"}), 503
+
+# STATUS
+
+@routes.route("/api/status", methods=["GET"])
+@jwt_required()
+def status_route():
+    return jsonify({
+        "activity": {
+            "pending_updates": activity.pending_count(),
+            **activity.stats,
+        },
+        "db_pool": dbpool.stats.snapshot(),
+        "compression_cache": compression.cache.snapshot(),
+        "revocation": revocation.snapshot(),
+        "jobs": jobs.counts(),
+    }), 200
+
+
+@routes.route("/metrics", methods=["GET"])
+def metrics_route():
+    pool = dbpool.stats.snapshot()
+    gauges = {
+        "activity_pending_updates": ("last_active updates waiting for the next flush.", activity.pending_count()),
+        "db_pool_checked_out": ("Connections currently checked out.", pool.get("checked_out")),
+        "db_pool_saturation": ("Checked-out connections over pool capacity.", pool.get("saturation")),
+        "db_pool_checkout_timeouts": ("Checkouts that timed out waiting for a connection.", pool["timeouts"]),
+        "db_pool_checkout_p95_ms": ("p95 pool checkout latency over recent checkouts.", pool["checkout_ms"]["p95"]),
+    }
+    return Response(metrics.render(gauges), mimetype="text/plain; version=0.0.4")
+
+
 # AUTH ROUTES
 @routes.route("/api/auth/register", methods=["POST"])
 def register_route():
@@ -76,18 +163,21 @@ def logout_route():
 
 @routes.route("/api/events", methods=["GET"])
 @jwt_required()
+@conditional("event")
 def list_events_route():
     return list_events()  
 
 
 @routes.route("/api/events/<int:event_id>", methods=["GET"])
 @jwt_required()
+@conditional("event")
 def get_event_details_route(event_id):
-    return get_event_details
+    return get_event_details(event_id)
 
 
 @routes.route("/api/events/create", methods=["POST"])
 @jwt_required()
+@permission_required("manage")
 def create_event_route():
     body, status = create_event()
     return jsonify(body), status
@@ -95,6 +185,7 @@ def create_event_route():
 
 @routes.route("/api/events/update/<int:event_id>", methods=["PUT"])
 @jwt_required()
+@permission_required("manage")
 def update_event_route(event_id):
     body, status = update_event(event_id)
     return jsonify(body), status
@@ -102,22 +193,41 @@ def update_event_route(event_id):
 
 @routes.route("/api/events/delete/<int:event_id>", methods=["DELETE"])
 @jwt_required()
+@permission_required("manage")
 def delete_event_route(event_id):
     body, status = delete_event(event_id)
     return jsonify(body), status
 
+
+@routes.route("/api/events/<int:event_id>/attendees", methods=["POST"])
+@jwt_required()
+@permission_required("manage")
+def add_event_attendees_route(event_id):
+    body, status = add_event_attendees(event_id)
+    return jsonify(body), status
+
+
+@routes.route("/api/events/<int:event_id>/attendees", methods=["DELETE"])
+@jwt_required()
+@permission_required("manage")
+def remove_event_attendees_route(event_id):
+    body, status = remove_event_attendees(event_id)
+    return jsonify(body), status
+
 # =========================
 # MEMBERS ROUTES
 # =========================
 
 @routes.route("/api/members", methods=["GET"])
 @jwt_required()
+@conditional("member", "member_activity")
 def list_members_route():
     return list_members()
 
 
 @routes.route("/api/members/<int:member_id>", methods=["GET"])
 @jwt_required()
+@conditional("member", "member_activity")
 def get_member_route(member_id):
     body, status = get_member_by_id(member_id)
     return jsonify(body), status
@@ -126,13 +236,23 @@ def get_member_route(member_id):
 
 @routes.route("/api/members", methods=["POST"])
 @jwt_required()
+@permission_required("manage")
 def create_member_route():
     body, status = create_member()
     return jsonify(body), status
 
 
+@routes.route("/api/members/bulk", methods=["POST"])
+@jwt_required()
+@permission_required("manage")
+def create_members_bulk_route():
+    body, status = create_members_bulk()
+    return jsonify(body), status
+
+
 @routes.route("/api/members/<int:member_id>", methods=["PUT"])
 @jwt_required()
+@permission_required("manage")
 def update_member_route(member_id):
     body, status = update_member(member_id)
     return jsonify(body), status
@@ -140,13 +260,23 @@ def update_member_route(member_id):
 
 @routes.route("/api/members/<int:member_id>", methods=["DELETE"])
 @jwt_required()
+@permission_required("manage")
 def delete_member_route(member_id):
     body, status = delete_member(member_id)
     return jsonify(body), status
 
 
+@routes.route("/api/members/<int:member_id>/deletion", methods=["GET"])
+@jwt_required()
+@permission_required("manage")
+def member_deletion_route(member_id):
+    body, status = member_deletion(member_id)
+    return jsonify(body), status
+
+
 @routes.route("/api/members/<int:member_id>/profile", methods=["GET"])
 @jwt_required()
+@conditional("member", "member_activity")
 def view_profile_route(member_id):
     body, status = view_profile(member_id)
     return jsonify(body), status
@@ -156,13 +286,17 @@ def view_profile_route(member_id):
 
 @routes.route("/api/list_contents", methods=["GET"])
 @jwt_required()
+@conditional("content", "report", "member")
 def list_contents_route():
-    rows = list_contents()          
-    return jsonify(rows), 200
+    if wants_stream():
+        return stream_contents()
+    body, status = list_contents()
+    return jsonify(body), status
 
 
 @routes.route("/api/contents_by_id/<int:content_id>", methods=["GET"])
 @jwt_required()
+@conditional("content", "report", "member")
 def get_content_route(content_id):
     body, status = get_content_by_id(content_id)
     return jsonify(body), status
@@ -170,6 +304,7 @@ def get_content_route(content_id):
 
 @routes.route("/api/contents/create", methods=["POST"])
 @jwt_required()
+@permission_required("manage")
 def create_content_route():
     body, status = create_content() 
     return jsonify(body), status
@@ -177,6 +312,7 @@ def create_content_route():
 
 @routes.route("/api/contents/update/<int:content_id>", methods=["PUT"])
 @jwt_required()
+@permission_required("manage")
 def update_content_route(content_id):
     body, status = update_content(content_id)
     return jsonify(body), status
@@ -184,21 +320,34 @@ def update_content_route(content_id):
 
 @routes.route("/api/contents/delete/<int:content_id>", methods=["DELETE"])
 @jwt_required()
+@permission_required("manage")
 def delete_content_route(content_id):
     body, status = delete_content(content_id)
     return jsonify(body), status
 
 
+@routes.route("/api/contents/<int:content_id>/deletion", methods=["GET"])
+@jwt_required()
+@permission_required("manage")
+def content_deletion_route(content_id):
+    body, status = content_deletion(content_id)
+    return jsonify(body), status
+
+
 # ---------- REPORTS ----------
 @routes.route("/api/reports", methods=["GET"])
 @jwt_required()
+@conditional("report", "content", "member")
 def list_reports_route():
-    result = list_reports()         
-    return jsonify(result), 200
+    if wants_stream():
+        return stream_reports()
+    body, status = list_reports()
+    return jsonify(body), status
 
 
 @routes.route("/api/reports/byid/<int:report_id>", methods=["GET"])
 @jwt_required()
+@conditional("report", "content", "member")
 def get_report_route(report_id):
     body, status = get_report_by_id(report_id)
     return jsonify(body), status
@@ -211,8 +360,25 @@ def create_report_route():
     return jsonify(body), status
 
 
+@routes.route("/api/reports/bulk/create", methods=["POST"])
+@jwt_required()
+@permission_required("manage")
+def create_reports_bulk_route():
+    body, status = create_reports_bulk()
+    return jsonify(body), status
+
+
+@routes.route("/api/reports/bulk/update", methods=["PUT"])
+@jwt_required()
+@permission_required("manage")
+def update_reports_bulk_route():
+    body, status = update_reports_bulk()
+    return jsonify(body), status
+
+
 @routes.route("/api/reports/update/<int:report_id>", methods=["PUT"])
 @jwt_required()
+@permission_required("manage")
 def update_report_route(report_id):
     body, status = update_report(report_id)
     return jsonify(body), status
@@ -220,6 +386,7 @@ def update_report_route(report_id):
 
 @routes.route("/api/reports/delete/<int:report_id>", methods=["DELETE"])
 @jwt_required()
+@permission_required("manage")
 def delete_report_route(report_id):
     body, status = delete_report(report_id)
     return jsonify(body), status
@@ -232,6 +399,34 @@ def submit_report_route(report_id):
     return jsonify(body), status
 
 
+@routes.route("/api/reports/<int:report_id>/upload", methods=["POST"])
+@jwt_required()
+def upload_report_file_route(report_id):
+    body, status = upload_report_file(report_id)
+    return jsonify(body), status
+
+
+@routes.route("/api/reports/<int:report_id>/uploads", methods=["POST"])
+@jwt_required()
+def create_upload_route(report_id):
+    body, status = create_upload(report_id)
+    return jsonify(body), status
+
+
+@routes.route("/api/reports/<int:report_id>/uploads/<upload_id>", methods=["GET"])
+@jwt_required()
+def get_upload_route(report_id, upload_id):
+    body, status = get_upload(report_id, upload_id)
+    return jsonify(body), status
+
+
+@routes.route("/api/reports/<int:report_id>/uploads/<upload_id>", methods=["PATCH"])
+@jwt_required()
+def upload_chunk_route(report_id, upload_id):
+    body, status = upload_chunk(report_id, upload_id)
+    return jsonify(body), status
+
+
 
 
 
@@ -242,12 +437,14 @@ def submit_report_route(report_id):
 
 @routes.route("/api/teams", methods=["GET"])
 @jwt_required()
+@conditional("team")
 def list_teams_route():
     return list_teams()
 
 
 @routes.route("/api/teams/<int:team_id>", methods=["GET"])
 @jwt_required()
+@conditional("team")
 def get_team_route(team_id):
     body , status = get_team_by_id(team_id)
     return jsonify(body),status
@@ -255,6 +452,7 @@ def get_team_route(team_id):
 
 @routes.route("/api/teams", methods=["POST"])
 @jwt_required()
+@permission_required("manage")
 def create_team_route():
     body, status = create_team()
     return jsonify(body), status
@@ -262,6 +460,7 @@ def create_team_route():
 
 @routes.route("/api/teams/<int:team_id>", methods=["PUT"])
 @jwt_required()
+@permission_required("manage")
 def update_team_route(team_id):
     body, status = update_team(team_id)
     return jsonify(body), status
@@ -269,12 +468,43 @@ def update_team_route(team_id):
 
 @routes.route("/api/teams/<int:team_id>", methods=["DELETE"])
 @jwt_required()
+@permission_required("manage")
 def delete_team_route(team_id):
     body, status = delete_team(team_id)
     return jsonify(body), status
 
 
+@routes.route("/api/teams/<int:team_id>/members", methods=["POST"])
+@jwt_required()
+@permission_required("manage")
+def add_team_members_route(team_id):
+    body, status = add_team_members(team_id)
+    return jsonify(body), status
 
 
+@routes.route("/api/teams/<int:team_id>/members", methods=["DELETE"])
+@jwt_required()
+@permission_required("manage")
+def remove_team_members_route(team_id):
+    body, status = remove_team_members(team_id)
+    return jsonify(body), status
 
 
+# SEARCH ROUTES
+
+@routes.route("/api/search", methods=["GET"])
+@jwt_required()
+@conditional("member", "event", "team", "content")
+def search_route():
+    body, status = search()
+    return jsonify(body), status
+
+
+# DASHBOARD ROUTES
+
+@routes.route("/api/dashboard/summary", methods=["GET"])
+@jwt_required()
+@conditional("report", "content")
+def dashboard_summary_route():
+    body, status = report_summary()
+    return jsonify(body), status
@@ -0,0 +1,107 @@
+import re
+from extension import db
+from models import Content, Event, Member, Team
+from pagination import MAX_LIMIT, decode_cursor, encode_cursor
+from fields import requested_fields
+from flask import request
+
+DEFAULT_LIMIT = 20
+MIN_QUERY_LENGTH = 2
+SEARCH_TYPES = ("member", "event", "team", "content")
+SEARCH_FIELDS = ("type", "id", "title", "detail", "rank")
+
+WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def _prefix_query(q):
+    """'web dev' -> 'web:* & dev:*' so results show up while the user types."""
+    words = WORD.findall(q.lower())
+    return " & ".join(f"{w}:*" for w in words[:8])
+
+
+def _branch(kind, model, title, detail, ts_query, *filters):
+    rank = db.cast(db.func.ts_rank(model.search_vector, ts_query), db.Float)
+    return (
+        db.select(
+            db.literal(kind, db.String).label("type"),
+            model.id.label("id"),
+            title.label("title"),
+            db.cast(detail, db.String).label("detail"),
+            rank.label("rank"),
+        )
+        .where(model.search_vector.op("@@")(ts_query), *filters)
+    )
+
+
+def search():
+    """
+    Ranked full-text search over members, events, teams and content,
+    served from the GIN-indexed search_vector columns. Paged by keyset on
+    (rank desc, type, id) like the other listings.
+    """
+    q = (request.args.get("q") or "").strip()
+    prefix = _prefix_query(q)
+    if len(q) < MIN_QUERY_LENGTH or not prefix:
+        return {"error": f"q must have at least {MIN_QUERY_LENGTH} characters"}, 400
+
+    types = request.args.get("types")
+    types = [t for t in types.split(",") if t] if types else list(SEARCH_TYPES)
+    if any(t not in SEARCH_TYPES for t in types):
+        return {"error": f"types must be a subset of {', '.join(SEARCH_TYPES)}"}, 400
+
+    try:
+        names = requested_fields(SEARCH_FIELDS)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    try:
+        limit = int(request.args.get("limit", DEFAULT_LIMIT))
+    except ValueError:
+        return {"error": "limit must be an integer"}, 400
+    if limit < 1 or limit > MAX_LIMIT:
+        return {"error": f"limit must be between 1 and {MAX_LIMIT}"}, 400
+
+    ts_query = db.func.to_tsquery("simple", prefix)
+    branches = {
+        "member": lambda: _branch(
+            "member", Member, Member.member_name, Member.major, ts_query, Member.deleted_at.is_(None)
+        ),
+        "event": lambda: _branch("event", Event, Event.event_name, Event.location, ts_query),
+        "team": lambda: _branch("team", Team, Team.team_name, Team.description, ts_query),
+        "content": lambda: _branch(
+            "content", Content, Content.title, Content.content_type, ts_query, Content.deleted_at.is_(None)
+        ),
+    }
+    hits = db.union_all(*[branches[t]() for t in types]).subquery()
+
+    query = db.select(hits).order_by(hits.c.rank.desc(), hits.c.type, hits.c.id)
+
+    after = request.args.get("after")
+    if after:
+        try:
+            rank, kind, hit_id = decode_cursor(after, [hits.c.rank, hits.c.type, hits.c.id])
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        query = query.where(db.or_(
+            hits.c.rank < rank,
+            db.and_(hits.c.rank == rank, db.tuple_(hits.c.type, hits.c.id) > db.tuple_(kind, hit_id)),
+        ))
+
+    rows = db.session.execute(query.limit(limit + 1)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([last.rank, last.type, last.id])
+
+    items = []
+    for r in rows:
+        item = {
+            "type": r.type,
+            "id": r.id,
+            "title": r.title,
+            "detail": r.detail,
+            "rank": round(r.rank, 6),
+        }
+        items.append({n: item[n] for n in names})
+    return {"items": items, "next_cursor": next_cursor}, 200
@@ -0,0 +1,151 @@
+# serializers.py
+"""
+Response shapes of Member, Team, Event, Content and Report, shared by the
+domain modules. Each FieldSet maps a response field to the column it
+reads (see fields.py); dates are left as date/datetime objects and
+encoded as ISO 8601 by the JSON provider (jsonprovider.py).
+"""
+from extension import db
+from fields import Field, FieldSet
+from cascade import live
+from models import Content, Event, Member, MemberEvent, MemberTeam, Report, Team
+
+
+def team_members_count():
+    """member_teams rows of the outer Team, counted from ix_member_teams_team_id."""
+    return (
+        db.select(db.func.count())
+        .where(MemberTeam.team_id == Team.id, live(Member, MemberTeam.member_id))
+        .correlate(Team)
+        .scalar_subquery()
+    )
+
+
+def event_attendees_count():
+    """
+    members_events rows of the outer Event, counted per row from
+    ix_members_events_event_id, so a filtered page only touches its own events.
+    """
+    return (
+        db.select(db.func.count())
+        .where(MemberEvent.event_id == Event.id, live(Member, MemberEvent.member_id))
+        .correlate(Event)
+        .scalar_subquery()
+    )
+
+
+MEMBER_FIELDS = FieldSet(
+    Member,
+    {
+        "id": Field(Member.id),
+        "name": Field(Member.member_name),
+        "email": Field(Member.email),
+        "role": Field(Member.role),
+        "level": Field(Member.level),
+        "status": Field(Member.status),
+        "major": Field(Member.major),
+        "birthday": Field(Member.birthday),
+        "profile_picture": Field(Member.profile_picture),
+        "last_active": Field(Member.last_active),
+    },
+)
+
+# the member list has always left out birthday
+MEMBER_LIST_FIELDS = [n for n in MEMBER_FIELDS.fields if n != "birthday"]
+
+
+# members_count is only computed when it is among the requested fields
+TEAM_FIELDS = FieldSet(
+    Team,
+    {
+        "id": Field(Team.id),
+        "team_name": Field(Team.team_name),
+        "description": Field(Team.description),
+        "created_at": Field(Team.created_at),
+        "is_active": Field(Team.is_active),
+        "members_count": Field(team_members_count()),
+    },
+)
+
+
+# attendes is only counted when it is among the requested fields
+EVENT_FIELDS = FieldSet(
+    Event,
+    {
+        "id": Field(Event.id),
+        "name": Field(Event.event_name),
+        "type": Field(Event.event_type),
+        "date": Field(Event.event_date),
+        "location": Field(Event.location),
+        "description": Field(Event.description),
+        "attendes": Field(event_attendees_count()),
+    },
+)
+
+
+CONTENT_FIELDS = FieldSet(
+    Content,
+    {
+        "content_id": Field(Content.id),
+        "content_title": Field(Content.title),
+        "content_type": Field(Content.content_type),
+        "description": Field(Content.description),
+        "created_at": Field(Content.created_at),
+    },
+)
+
+
+# /api/list_contents: one row per report; reports without content are not listed
+CONTENT_LIST_FIELDS = FieldSet(
+    db.join(Content, Report, Report.content_id == Content.id),
+    {
+        "report_id": Field(Report.id),
+        "content_id": Field(Content.id),
+        "content_title": Field(Content.title),
+        "content_type": Field(Content.content_type),
+        "submitted_by": Field(Report.submitted_by),
+        "submitted_by_name": Field(Member.member_name, joins=("member",)),
+        "status": Field(Report.status),
+        "submission_date": Field(Report.submission_date),
+        "file_path": Field(Report.file_path),
+        "action": Field(Report.action),
+    },
+    joins={"member": (Member, Member.id == Report.submitted_by)},
+)
+
+
+REPORT_FIELDS = FieldSet(
+    Report,
+    {
+        "id": Field(Report.id),
+        "report_title": Field(Report.title),
+        "status": Field(Report.status),
+        "submission_date": Field(Report.submission_date),
+        "file_path": Field(Report.file_path),
+        "action": Field(Report.action),
+        "content_id": Field(Report.content_id),
+        "content_title": Field(Content.title, joins=("content",)),
+        "submitted_by": Field(Report.submitted_by),
+        "submitted_by_name": Field(Member.member_name, joins=("member",)),
+    },
+    joins={
+        "content": (Content, Content.id == Report.content_id),
+        "member": (Member, Member.id == Report.submitted_by),
+    },
+)
+
+# the reports nested in GET /api/contents_by_id/<id>
+CONTENT_REPORT_FIELDS = FieldSet(
+    Report,
+    {
+        "report_id": Field(Report.id),
+        "report_title": Field(Report.title),
+        "submitted_by": Field(Report.submitted_by),
+        "submitted_by_name": Field(Member.member_name, joins=("member",)),
+        "status": Field(Report.status),
+        "submission_date": Field(Report.submission_date),
+        "file_path": Field(Report.file_path),
+        "action": Field(Report.action),
+    },
+    joins={"member": (Member, Member.id == Report.submitted_by)},
+)
@@ -0,0 +1,28 @@
+# streaming.py
+from flask import Response, current_app, request, stream_with_context
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+# rows fetched per round trip from the server-side cursor
+STREAM_BATCH_SIZE = 1000
+
+
+def wants_stream():
+    """True for ?stream=1 or an explicit Accept: application/x-ndjson."""
+    if request.args.get("stream") == "1":
+        return True
+    return any(value == NDJSON_MIMETYPE for value, _ in request.accept_mimetypes)
+
+
+def ndjson_response(query, serialize):
+    """
+    Streams one JSON document per line. Rows come from a server-side cursor
+    in STREAM_BATCH_SIZE batches and are encoded as they arrive, so memory
+    stays flat however many rows the query returns.
+    """
+    def generate():
+        dumps = current_app.json.dumps
+        for row in query.yield_per(STREAM_BATCH_SIZE):
+            yield dumps(serialize(row)) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
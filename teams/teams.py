@@ -1,37 +1,41 @@
 from extension import db
-from models import Team
+from versioning import bump_version
+from models import Team, MemberTeam
+from bulk import add_links, member_ids_body, remove_links
+from pagination import paginate, page_body
+from fields import key_of
+from serializers import TEAM_FIELDS
 from flask import request,jsonify
 
 def list_teams():
-    teams = Team.query.order_by(Team.id).all()
-    team =  [
-        {
-            "id": t.id,
-            "team_name": t.team_name,
-            "description": t.description,
-            "created_at": t.created_at.isoformat() if t.created_at else None,
-            "is_active": t.is_active,
-            "members_count": len(t.members),
-        }
-        for t in teams
-    ]
+    try:
+        names = TEAM_FIELDS.requested()
+        rows, next_cursor, paged = paginate(
+            TEAM_FIELDS.query(names, [Team.id]).order_by(Team.id),
+            [Team.id],
+            key_of([Team.id]),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    team = TEAM_FIELDS.rows(rows, names)
+    if paged:
+        return jsonify(page_body(team, next_cursor)), 200
     return jsonify(team),200
 
 
 
 def get_team_by_id(team_id):
-    t = Team.query.get(team_id)
-    if not t:
+    try:
+        names = TEAM_FIELDS.requested()
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    row = TEAM_FIELDS.query(names).filter(Team.id == team_id).first()
+    if not row:
         return {"error": "Team not found"}, 404
 
-    body = {
-        "id": t.id,
-        "team_name": t.team_name,
-        "description": t.description,
-        "created_at": t.created_at.isoformat() if t.created_at else None,
-        "is_active": t.is_active,
-        "members_count": len(t.members),
-    }
+    body = TEAM_FIELDS.row(row, names)
     return body, 200
 
 
@@ -48,6 +52,7 @@ def create_team():
         description=description,
     )
     db.session.add(new_team)
+    bump_version("team")
     db.session.commit()
 
     return {"message": "Team created successfully", "id": new_team.id}, 201
@@ -68,6 +73,7 @@ def update_team(team_id):
     if "is_active" in data:
         t.is_active = bool(data["is_active"])
 
+    bump_version("team")
     db.session.commit()
     return {"message": "Team updated successfully", "id": t.id}, 200
 
@@ -78,6 +84,53 @@ def delete_team(team_id):
         return {"error": "Team not found"}, 404
 
     db.session.delete(t)
+    bump_version("team")
     db.session.commit()
 
     return {"message": "Team deleted successfully", "id": team_id}, 200
+
+
+def _lock_team(team_id):
+    # FOR KEY SHARE: the team cannot be deleted before the links commit
+    return (
+        db.session.query(Team.id)
+        .filter(Team.id == team_id)
+        .with_for_update(key_share=True)
+        .scalar()
+    )
+
+
+def add_team_members(team_id):
+    """Adds many members to the team with one set-based INSERT."""
+    try:
+        member_ids = member_ids_body()
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    if _lock_team(team_id) is None:
+        db.session.rollback()
+        return {"error": "Team not found"}, 404
+
+    added, unchanged, not_found = add_links(MemberTeam, MemberTeam.team_id, team_id, member_ids)
+    if added:
+        bump_version("team")
+    db.session.commit()
+
+    return {"team_id": team_id, "added": added, "unchanged": unchanged, "not_found": not_found}, 200
+
+
+def remove_team_members(team_id):
+    """Removes many members from the team with one DELETE ... WHERE IN."""
+    try:
+        member_ids = member_ids_body()
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    if _lock_team(team_id) is None:
+        db.session.rollback()
+        return {"error": "Team not found"}, 404
+
+    removed, unchanged = remove_links(MemberTeam, MemberTeam.team_id, team_id, member_ids)
+    if removed:
+        bump_version("team")
+    db.session.commit()
+
+    return {"team_id": team_id, "removed": removed, "unchanged": unchanged}, 200
@@ -0,0 +1,73 @@
+"""
+The tests need a Postgres database they may wipe: its public schema is
+dropped and rebuilt from migrations/ once per session.
+
+    TEST_DATABASE_URL=postgresql://postgres:pw@localhost:5432/itc_test python -m pytest -q
+"""
+import importlib
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+@pytest.fixture(scope="session")
+def app():
+    if not DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    os.environ["DATABASE_URL"] = DATABASE_URL
+    from config import Config
+
+    class TestConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = DATABASE_URL
+        SECRET_KEY = "test"
+        JWT_SECRET_KEY = "test-jwt-secret-key-of-sufficient-length"
+        PASSWORD_HASH_WORKERS = 0
+
+    app = importlib.import_module("__init__").create_app(TestConfig)
+
+    from extension import db
+    import migrate
+
+    with app.app_context():
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql("DROP SCHEMA public CASCADE")
+            conn.exec_driver_sql("CREATE SCHEMA public")
+        migrate.upgrade(db.engine, log=lambda msg: None)
+    return app
+
+
+@pytest.fixture
+def db_session(app):
+    """App context with empty data tables."""
+    from extension import db
+    import revocation
+
+    with app.app_context():
+        db.session.execute(db.text(
+            "TRUNCATE member, team, event, content, report, member_teams, members_events,"
+            " member_revocations RESTART IDENTITY CASCADE"
+        ))
+        db.session.commit()
+        # member ids restart too: forget versions revoked for the previous test's members
+        revocation._claims_versions.clear()
+        yield db.session
+        db.session.rollback()
+
+
+@pytest.fixture
+def client(app, db_session):
+    """Test client with a manager's access token."""
+    from flask_jwt_extended import create_access_token
+
+    client = app.test_client()
+    client.set_cookie("access_token", create_access_token(
+        identity="1", additional_claims={"role": "Leader", "status": "active", "cv": 0},
+    ))
+    return client
@@ -0,0 +1,12 @@
+import activity
+
+
+def test_flush_keeps_etags_of_endpoints_without_last_active(app, client):
+    reports = client.get("/api/reports").headers["ETag"]
+    members = client.get("/api/members").headers["ETag"]
+
+    activity.touch(1)
+    assert activity.flush()
+
+    assert client.get("/api/reports", headers={"If-None-Match": reports}).status_code == 304
+    assert client.get("/api/members", headers={"If-None-Match": members}).status_code == 200
@@ -0,0 +1,50 @@
+from extension import db
+from models import Member
+
+
+def _member(email):
+    member = Member(member_name="Existing", email=email, password_hash="x", role="Member", level=0, status="active")
+    db.session.add(member)
+    db.session.commit()
+    return member.id
+
+
+def test_members_bulk_reports_bad_types_per_item(client, db_session):
+    response = client.post("/api/members/bulk", json=[
+        {"member_name": "A", "email": ["a@test.local"], "password": "pw-123456"},
+        {"member_name": "B", "email": "b@test.local", "password": {"x": 1}},
+        {"member_name": "C" * 101, "email": "c@test.local", "password": "pw-123456"},
+        {"member_name": "D", "email": "d@test.local", "password": "pw-123456"},
+    ])
+    assert response.status_code == 207
+    statuses = [r["status"] for r in response.get_json()["results"]]
+    assert statuses == [400, 400, 400, 201]
+
+
+def test_members_bulk_email_taken_after_lookup_is_an_item_error(client, db_session, monkeypatch):
+    # the lookup misses the email, as if it was inserted by a concurrent request
+    _member("race@test.local")
+    query = db.session.query
+
+    def query_without_taken(*entities, **kwargs):
+        q = query(*entities, **kwargs)
+        return q.filter(db.false()) if entities == (Member.email,) else q
+
+    monkeypatch.setattr(db.session, "query", query_without_taken)
+    response = client.post("/api/members/bulk", json=[
+        {"member_name": "R", "email": "race@test.local", "password": "pw-123456"},
+        {"member_name": "N", "email": "new@test.local", "password": "pw-123456"},
+    ])
+    assert response.status_code == 207
+    results = response.get_json()["results"]
+    assert results[0] == {"index": 0, "status": 400, "error": "Email already exists"}
+    assert results[1]["status"] == 201
+
+
+def test_reports_bulk_rejects_non_string_title(client, db_session):
+    member_id = _member("owner@test.local")
+    response = client.post("/api/reports/bulk/create", json=[
+        {"content_id": 1, "submitted_by": member_id, "title": ["x"]},
+    ])
+    assert response.status_code == 207
+    assert response.get_json()["results"][0]["error"] == "title must be a string"
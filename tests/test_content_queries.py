@@ -0,0 +1,79 @@
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from extension import db
+from models import Content, Member, Report
+
+
+def _seed(contents, reports_per_content):
+    now = datetime(2026, 1, 1)
+    members = db.session.scalars(
+        db.insert(Member).returning(Member.id, sort_by_parameter_order=True),
+        [
+            {"member_name": f"Member {i}", "email": f"m{i}@test.local", "password_hash": "x",
+             "role": "Member", "level": 0, "status": "active"}
+            for i in range(5)
+        ],
+    ).all()
+    content_ids = db.session.scalars(
+        db.insert(Content).returning(Content.id, sort_by_parameter_order=True),
+        [
+            {"title": f"Content {i}", "content_type": "task", "created_at": now + timedelta(minutes=i)}
+            for i in range(contents)
+        ],
+    ).all()
+    db.session.execute(db.insert(Report), [
+        {"content_id": c, "submitted_by": members[k % len(members)], "title": f"Report {c}-{k}",
+         "status": "submitted", "submission_date": now, "action": "none"}
+        for c in content_ids
+        for k in range(reports_per_content)
+    ])
+    db.session.commit()
+
+
+@contextmanager
+def _statements():
+    """Counts the statements this thread runs (the activity/revocation threads share the engine)."""
+    thread = threading.get_ident()
+    count = [0]
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == thread:
+            count[0] += 1
+
+    event.listen(db.engine, "before_cursor_execute", before)
+    try:
+        yield count
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before)
+
+
+def _count(client, url):
+    client.get(url)  # warm up: first token check, version rows
+    with _statements() as count:
+        response = client.get(url)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return count[0]
+
+
+@pytest.mark.parametrize("url", [
+    "/api/list_contents",
+    "/api/list_contents?limit=100",
+    "/api/reports",
+    "/api/reports?limit=100",
+    "/api/contents_by_id/1?fields=content_id,content_title,reports",
+])
+def test_statement_count_does_not_grow_with_rows(client, db_session, url):
+    _seed(contents=3, reports_per_content=2)
+    small = _count(client, url)
+
+    db_session.execute(db.text("TRUNCATE content, report, member RESTART IDENTITY CASCADE"))
+    db_session.commit()
+    _seed(contents=30, reports_per_content=20)
+    large = _count(client, url)
+
+    assert small == large
@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta, timezone
+
+from extension import db
+from models import Content, Event, Member, MemberEvent, MemberTeam, Report, Team
+import query_plans
+
+STATUSES = ["pending", "submitted", "late", "approved", "revision_requested"]
+
+
+def _seed():
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    members = db.session.scalars(
+        db.insert(Member).returning(Member.id, sort_by_parameter_order=True),
+        [
+            {"member_name": f"Member {i}", "email": f"m{i}@test.local", "password_hash": "x",
+             "role": "Member", "level": 0, "status": "active"}
+            for i in range(100)
+        ],
+    ).all()
+    teams = db.session.scalars(
+        db.insert(Team).returning(Team.id, sort_by_parameter_order=True),
+        [{"team_name": f"Team {i}", "created_at": now} for i in range(10)],
+    ).all()
+    events = db.session.scalars(
+        db.insert(Event).returning(Event.id, sort_by_parameter_order=True),
+        [
+            {"event_name": f"Event {i}", "event_type": ["workshop", "meeting", "hackathon"][i % 3],
+             "event_date": now + timedelta(hours=i)}
+            for i in range(100)
+        ],
+    ).all()
+    contents = db.session.scalars(
+        db.insert(Content).returning(Content.id, sort_by_parameter_order=True),
+        [
+            {"title": f"Content {i}", "content_type": "task", "created_at": now + timedelta(minutes=i)}
+            for i in range(20)
+        ],
+    ).all()
+    db.session.execute(db.insert(Report), [
+        {"content_id": c, "submitted_by": members[(c * k) % len(members)], "title": f"Report {c}-{k}",
+         "status": STATUSES[k % len(STATUSES)], "submission_date": now - timedelta(hours=k), "action": "none"}
+        for c in contents
+        for k in range(10)
+    ])
+    db.session.execute(db.insert(MemberTeam), [
+        {"member_id": m, "team_id": t} for t in teams for m in members[:10]
+    ])
+    db.session.execute(db.insert(MemberEvent), [
+        {"member_id": m, "event_id": e} for e in events for m in members[:10]
+    ])
+    db.session.commit()
+    return {"members": members, "teams": teams, "events": events, "contents": contents}
+
+
+def test_listing_queries_use_their_indexes(app, client, db_session):
+    ids = _seed()
+    with db.engine.connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT").exec_driver_sql("ANALYZE")
+
+    # the tables are small, so the planner is kept off sequential scans
+    failures = []
+    for url, expected in query_plans.checks(client, ids):
+        status, used = query_plans.indexes_used(client, db.engine, url, seqscan=False)
+        if status != 200 or not expected <= used:
+            failures.append((url, status, sorted(expected - used), sorted(used)))
+    assert failures == []
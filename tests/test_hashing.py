@@ -0,0 +1,44 @@
+import time
+
+import pytest
+from werkzeug.security import check_password_hash, generate_password_hash
+
+import hashing
+
+
+@pytest.mark.parametrize("method", ["scrypt", "pbkdf2", "pbkdf2:sha256:600000"])
+def test_needs_rehash_accepts_the_short_method_names(app, monkeypatch, method):
+    with app.app_context():
+        monkeypatch.setitem(app.config, "PASSWORD_HASH_METHOD", method)
+        salt_length = app.config["PASSWORD_SALT_LENGTH"]
+        assert not hashing.needs_rehash(generate_password_hash("pw", method, salt_length))
+        assert hashing.needs_rehash(generate_password_hash("pw", "pbkdf2:sha256:1000", salt_length))
+
+
+def test_slow_pool_is_busy_not_an_error(app, monkeypatch):
+    with app.app_context():
+        monkeypatch.setitem(app.config, "PASSWORD_HASH_WORKERS", 1)
+        monkeypatch.setitem(app.config, "PASSWORD_HASH_TIMEOUT", 0.2)
+        with pytest.raises(hashing.HashingBusy):
+            hashing._run(time.sleep, 1)
+
+
+def test_bulk_hashing_leaves_slots_for_logins(app, monkeypatch):
+    with app.app_context():
+        monkeypatch.setitem(app.config, "PASSWORD_HASH_WORKERS", 1)
+        monkeypatch.setitem(app.config, "PASSWORD_HASH_METHOD", "pbkdf2:sha256:1000")
+        submit = hashing._submit
+        outstanding = []
+
+        def counting_submit(fn, *args):
+            future = submit(fn, *args)
+            outstanding.append(sum(1 for f in submitted if not f.done()) + 1)
+            submitted.append(future)
+            return future
+
+        submitted = []
+        monkeypatch.setattr(hashing, "_submit", counting_submit)
+        hashes = hashing.hash_passwords([f"pw-{i}" for i in range(40)])
+
+        assert [check_password_hash(h, f"pw-{i}") for i, h in enumerate(hashes)] == [True] * 40
+        assert max(outstanding) <= app.config["PASSWORD_HASH_MAX_PENDING"] // 2
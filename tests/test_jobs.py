@@ -0,0 +1,49 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from extension import db
+from models import Content, Job, Member, Report
+import jobs
+
+
+def test_outcome_of_a_reclaimed_job_is_dropped(app, db_session):
+    db.session.execute(db.text("TRUNCATE jobs"))
+    jobs.enqueue("report_reminder", [{"report_id": 1}])
+    db.session.commit()
+
+    stale = jobs.claim("w1", 10)
+    jobs.reclaim_stale(-1)  # w1 looks lost
+    assert [job.id for job in jobs.claim("w2", 10)] == [job.id for job in stale]
+
+    jobs._record(stale, [(stale[0].id, None, "late failure")], 60, "w1")
+
+    job = db.session.get(Job, stale[0].id)
+    db.session.refresh(job)
+    assert (job.status, job.locked_by, job.last_error) == ("running", "w2", "worker lost")
+
+
+def test_cascade_delete_runs_one_batch_per_job_run(app, client, monkeypatch):
+    db.session.execute(db.text("TRUNCATE jobs"))
+    member = Member(member_name="M", email="m@test.local", password_hash="x", role="Member", level=0, status="active")
+    content = Content(title="C", content_type="task", created_at=datetime(2026, 1, 1))
+    db.session.add_all([member, content])
+    db.session.flush()
+    db.session.add_all([
+        Report(content_id=content.id, submitted_by=member.id, title=f"R{i}", status="pending", action="none")
+        for i in range(5)
+    ])
+    db.session.commit()
+    content_id = content.id
+    monkeypatch.setitem(app.config, "DELETE_BATCH_SIZE", 2)
+
+    assert client.delete(f"/api/contents/delete/{content_id}?mode=background").status_code == 202
+    left = []
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        while jobs.run_batch(app, executor, "w1"):
+            left.append(db.session.query(Report).count())
+            db.session.rollback()
+
+    assert left == [3, 1, 0]
+    job = db.session.query(Job).one()
+    assert (job.status, job.result, job.attempts) == ("done", "deleted", 1)
+    assert db.session.get(Content, content_id) is None
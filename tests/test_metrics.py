@@ -0,0 +1,13 @@
+import pytest
+from sqlalchemy.exc import ProgrammingError
+
+from extension import db
+
+
+def test_failed_statement_leaves_no_start_on_the_connection(app):
+    with app.test_request_context():
+        conn = db.session.connection()
+        with pytest.raises(ProgrammingError):
+            db.session.execute(db.text("SELECT * FROM no_such_table"))
+        assert conn.info.get("query_start") == []
+        db.session.rollback()
@@ -0,0 +1,31 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from extension import db
+import migrate
+
+
+def _valid(conn, name):
+    return conn.exec_driver_sql(
+        "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid"
+        f" WHERE c.relname = '{name}'"
+    ).scalar()
+
+
+def test_invalid_concurrent_index_is_rebuilt(app):
+    with app.app_context():
+        with db.engine.connect() as conn:
+            conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+            conn.exec_driver_sql("DROP TABLE IF EXISTS migrate_probe")
+            conn.exec_driver_sql("CREATE TABLE migrate_probe (n INT)")
+            try:
+                conn.exec_driver_sql("INSERT INTO migrate_probe VALUES (1), (1)")
+                # a failed concurrent build leaves the index behind, INVALID
+                with pytest.raises(IntegrityError):
+                    conn.exec_driver_sql("CREATE UNIQUE INDEX CONCURRENTLY ix_migrate_probe_n ON migrate_probe (n)")
+                assert _valid(conn, "ix_migrate_probe_n") is False
+
+                migrate.create_index_concurrently(conn, "ix_migrate_probe_n ON migrate_probe (n)")
+                assert _valid(conn, "ix_migrate_probe_n") is True
+            finally:
+                conn.exec_driver_sql("DROP TABLE migrate_probe")
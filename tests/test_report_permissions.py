@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from flask_jwt_extended import create_access_token
+
+from extension import db
+from models import Content, Member, Report
+
+
+def _seed():
+    db.session.add_all([
+        Member(member_name=f"M{i}", email=f"m{i}@test.local", password_hash="x", role="Member", level=0, status="active")
+        for i in range(1, 4)
+    ])
+    db.session.add(Content(title="C", content_type="task", created_at=datetime(2026, 1, 1)))
+    db.session.flush()
+    db.session.add(Report(content_id=1, submitted_by=3, title="theirs", status="pending", action="none"))
+    db.session.commit()
+
+
+def _member_client(app, member_id):
+    client = app.test_client()
+    client.set_cookie("access_token", create_access_token(
+        identity=str(member_id), additional_claims={"role": "Member", "status": "active", "cv": 0},
+    ))
+    return client
+
+
+def test_members_create_and_submit_only_their_own_reports(app, client, db_session):
+    _seed()
+    member = _member_client(app, 2)
+
+    assert member.post("/api/reports/create", json={"content_id": 1, "submitted_by": 3, "title": "x"}).status_code == 403
+    own = member.post("/api/reports/create", json={"content_id": 1, "title": "mine"})
+    assert own.status_code == 201
+    assert db.session.get(Report, own.get_json()["id"]).submitted_by == 2
+
+    assert member.post("/api/reports/1/submit", json={"file_path": "/f"}).status_code == 403
+    assert member.post(f"/api/reports/{own.get_json()['id']}/submit", json={"file_path": "/f"}).status_code == 200
+
+    # a manager may act for anyone
+    assert client.post("/api/reports/create", json={"content_id": 1, "submitted_by": 3, "title": "y"}).status_code == 201
+    assert client.post("/api/reports/1/submit", json={"file_path": "/f"}).status_code == 200
@@ -0,0 +1,45 @@
+from flask_jwt_extended import create_access_token, decode_token
+
+from extension import db
+from models import Member
+import revocation
+
+
+def _member_token(app):
+    member = Member(
+        member_name="m", email="m@example.com", password_hash="x", role="Member", level=0, status="active",
+    )
+    db.session.add(member)
+    db.session.commit()
+    token = create_access_token(identity=str(member.id), additional_claims={"cv": member.claims_version})
+    return member.id, decode_token(token)
+
+
+def _new_worker():
+    # what a worker that never saw the delete knows after its first load
+    revocation._claims_versions.clear()
+    revocation._synced_at = None
+    assert revocation.sync()
+
+
+def test_deleting_a_member_revokes_their_tokens_on_every_worker(app, client):
+    member_id, payload = _member_token(app)
+    assert not revocation.has_stale_claims(payload)
+
+    assert client.delete(f"/api/members/{member_id}").status_code == 200
+    assert db.session.get(Member, member_id) is None
+    assert revocation.has_stale_claims(payload)
+
+    _new_worker()
+    assert revocation.has_stale_claims(payload)
+
+
+def test_background_delete_revocation_outlives_the_member_row(app, client):
+    member_id, payload = _member_token(app)
+
+    assert client.delete(f"/api/members/{member_id}?mode=background").status_code == 202
+    db.session.query(Member).filter(Member.id == member_id).delete()
+    db.session.commit()
+
+    _new_worker()
+    assert revocation.has_stale_claims(payload)
@@ -0,0 +1,105 @@
+from datetime import datetime
+
+from sqlalchemy import event
+
+from extension import db
+from models import Content, Event, Member, MemberEvent, MemberTeam, Report, Team
+
+
+def _seed():
+    members = [
+        Member(member_name=f"M{i}", email=f"m{i}@test.local", password_hash="x", role="Member", level=0, status="active")
+        for i in range(1, 4)
+    ]
+    now = datetime(2026, 1, 1)
+    contents = [Content(title=f"C{i}", content_type="task", created_at=now) for i in range(1, 3)]
+    team = Team(team_name="T", created_at=now)
+    event = Event(event_name="E", event_type="meeting", event_date=now)
+    db.session.add_all([*members, *contents, team, event])
+    db.session.flush()
+    reports = [
+        Report(content_id=contents[0].id, submitted_by=members[1].id, title="kept", status="pending", action="none"),
+        Report(content_id=contents[1].id, submitted_by=members[1].id, title="content gone", status="pending", action="none"),
+        Report(content_id=contents[0].id, submitted_by=members[2].id, title="member gone", status="pending", action="none"),
+    ]
+    db.session.add_all(reports)
+    for member in members[1:]:
+        db.session.add(MemberTeam(member_id=member.id, team_id=team.id))
+        db.session.add(MemberEvent(member_id=member.id, event_id=event.id))
+    db.session.commit()
+    return [r.id for r in reports], team.id, event.id
+
+
+def test_background_deletes_hide_dependent_rows(client, db_session):
+    (kept, content_gone, member_gone), team_id, event_id = _seed()
+    assert client.delete("/api/contents/delete/2?mode=background").status_code == 202
+    assert client.delete("/api/members/3?mode=background").status_code == 202
+
+    assert [r["id"] for r in client.get("/api/reports").get_json()] == [kept]
+    assert client.get("/api/reports?format=ndjson", headers={"Accept": "application/x-ndjson"}).data.count(b"\n") == 1
+    assert [r["report_id"] for r in client.get("/api/list_contents").get_json()] == [kept]
+    for report_id in (content_gone, member_gone):
+        assert client.get(f"/api/reports/byid/{report_id}").status_code == 404
+        assert client.put(f"/api/reports/update/{report_id}", json={"title": "x"}).status_code == 404
+        assert client.post(f"/api/reports/{report_id}/submit", json={"file_path": "/f"}).status_code == 404
+        assert client.delete(f"/api/reports/delete/{report_id}").status_code == 404
+    bulk = client.put("/api/reports/bulk/update", json=[{"id": member_gone, "title": "x"}])
+    assert bulk.get_json()["results"][0]["status"] == 404
+
+    assert client.get(f"/api/teams/{team_id}?fields=members_count").get_json()["members_count"] == 1
+    assert client.get(f"/api/events/{event_id}?fields=attendes").get_json()["attendes"] == [2]
+    assert client.get("/api/events?fields=id,attendes").get_json()[0]["attendes"] == 1
+
+
+
+def test_immediate_deletes_leave_dependent_rows_to_the_database(client, db_session):
+    (kept, content_gone, member_gone), team_id, event_id = _seed()
+    statements = []
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before)
+    try:
+        assert client.delete("/api/contents/delete/2").status_code == 200
+        assert client.delete("/api/members/3").status_code == 200
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before)
+
+    # nothing loaded or NULLed through the relationships: ON DELETE CASCADE did it
+    assert not [s for s in statements if "FROM report" in s or "UPDATE report" in s or "member_teams" in s]
+    assert [r.id for r in db.session.query(Report.id)] == [kept]
+    assert db.session.query(MemberTeam).count() == db.session.query(MemberEvent).count() == 1
+
+
+def test_background_member_delete_changes_team_and_event_etags(client, db_session):
+    _, team_id, event_id = _seed()
+    urls = {
+        f"/api/teams/{team_id}?fields=members_count": lambda body: body["members_count"],
+        "/api/teams?fields=id,members_count": lambda body: body[0]["members_count"],
+        f"/api/events/{event_id}?fields=attendes": lambda body: len(body["attendes"]),
+        "/api/events?fields=id,attendes": lambda body: body[0]["attendes"],
+    }
+    etags = {url: client.get(url).headers["ETag"] for url in urls}
+
+    assert client.delete("/api/members/3?mode=background").status_code == 202
+
+    for url, count in urls.items():
+        response = client.get(url, headers={"If-None-Match": etags[url]})
+        assert response.status_code == 200, url
+        assert count(response.get_json()) == 1, url
+
+
+def test_dashboard_leaves_out_reports_of_members_being_deleted(client, db_session):
+    _seed()
+    url = "/api/dashboard/summary"
+    before = client.get(url)
+    assert [(row["content_id"], row["total"]) for row in before.get_json()] == [(1, 2), (2, 1)]
+
+    assert client.delete("/api/members/3?mode=background").status_code == 202
+
+    response = client.get(url, headers={"If-None-Match": before.headers["ETag"]})
+    assert response.status_code == 200
+    rows = response.get_json()
+    assert [(row["content_id"], row["total"]) for row in rows] == [(1, 1), (2, 1)]
+    assert rows[0]["counts"]["pending"] == 1
@@ -0,0 +1,14 @@
+def test_conditional_responses_vary_on_accept(client, db_session):
+    first = client.get("/api/reports")
+    assert first.status_code == 200
+    assert "Accept" in first.vary
+
+    not_modified = client.get("/api/reports", headers={"If-None-Match": first.headers["ETag"]})
+    assert not_modified.status_code == 304
+    assert "Accept" in not_modified.vary
+
+
+def test_json_and_ndjson_have_different_etags(client, db_session):
+    json_etag = client.get("/api/reports").headers["ETag"]
+    ndjson_etag = client.get("/api/reports", headers={"Accept": "application/x-ndjson"}).headers["ETag"]
+    assert json_etag != ndjson_etag
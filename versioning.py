@@ -0,0 +1,83 @@
+# versioning.py
+import hashlib
+from functools import wraps
+
+from flask import make_response, request
+from sqlalchemy.dialects.postgresql import insert
+
+import compression
+from extension import db
+from models import TableVersion
+from streaming import wants_stream
+
+
+def bump_version(*tables):
+    """
+    Marks every cached representation of `tables` stale. Call it before the
+    write's commit so the bump lands in the same transaction as the change.
+    """
+    for name in tables:
+        stmt = (
+            insert(TableVersion)
+            .values(table_name=name, version=1)
+            .on_conflict_do_update(
+                index_elements=[TableVersion.table_name],
+                set_={"version": TableVersion.version + 1},
+            )
+        )
+        db.session.execute(stmt)
+
+
+def current_versions(tables):
+    rows = (
+        db.session.query(TableVersion.table_name, TableVersion.version)
+        .filter(TableVersion.table_name.in_(tables))
+        .all()
+    )
+    versions = dict(rows)
+    return [versions.get(name, 0) for name in tables]
+
+
+def compute_etag(tables):
+    """Strong ETag from the endpoint, its arguments and the table versions."""
+    versions = current_versions(tables)
+    key = "|".join([
+        request.endpoint or "",
+        request.full_path,
+        "ndjson" if wants_stream() else "json",
+        ",".join(f"{name}:{v}" for name, v in zip(tables, versions)),
+    ])
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def conditional(*tables):
+    """
+    Answers If-None-Match with 304 from the version markers alone, without
+    running the view, and serves a body compressed earlier under the same
+    ETag from the compression cache. Successful responses carry the ETag.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = compute_etag(tables)
+            matched = next(
+                (tag for tag in compression.etag_variants(etag) if request.if_none_match.contains_weak(tag)),
+                None,
+            )
+            if matched:
+                response = make_response("", 304)
+                response.set_etag(matched)
+            else:
+                response = compression.cached_response(etag)
+                if response is None:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+                    # compression.compress_response suffixes it if it compresses the body
+                    response.set_etag(etag)
+            # the ETag differs for JSON and NDJSON (wants_stream reads Accept)
+            response.vary.add("Accept")
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,21 @@
+# worker.py
+"""
+Background job worker (jobs.py): sends report reminders outside the
+request path. Run one or more next to the web workers:
+
+    python worker.py            run until SIGTERM / Ctrl-C
+    python worker.py --once     run the due jobs and exit
+"""
+import argparse
+import logging
+
+from __init__ import create_app
+import jobs
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Runs queued background jobs.")
+    parser.add_argument("--once", action="store_true", help="run the due jobs, then exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    jobs.work(create_app(), once=args.once)